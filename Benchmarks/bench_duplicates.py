@@ -0,0 +1,66 @@
+'''
+This script benchmarks the duplicate removal of tall tables, counting the duplicates
+and dropping them with pandas (previous code path, hashing every row twice) against
+hashing the rows once and reusing the duplicate mask for the count and the removal.
+Below HASHED_MIN_ROWS rows the mask comes from one DataFrame.duplicated call instead.
+Usage: python -m Benchmarks.bench_duplicates [--rows N] [--duplicates F] [--repeat R]
+'''
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from numpy.random import default_rng
+from pandas import DataFrame, concat
+
+from Scripts.duplicates import count_duplicates, duplicate_positions, duplicates_cache
+
+def synthetic_data(rows, duplicates, seed=0):
+    '''
+    Builds a DataFrame of float and string columns where a fraction of the rows are copies of others.
+    '''
+    rng = default_rng(seed)
+    data = DataFrame({f'num_{i}': rng.normal(size=rows) for i in range(6)})
+    for i in range(4):
+        data[f'cat_{i}'] = rng.choice([f'value_{k}' for k in range(1000)], rows).astype(object)
+    copies = rng.integers(0, rows, int(rows * duplicates))
+    return concat([data, data.iloc[copies]], ignore_index=True)
+
+def pandas_removal(data):
+    '''
+    The previous code path of remove_duplicates.
+    '''
+    data = data.drop_duplicates()
+    return data.duplicated().sum()
+
+def hashed_removal(data):
+    duplicates_cache.clear()
+    count_duplicates(data, version=0)
+    return len(duplicate_positions(data, version=0))
+
+def benchmark(function, data, repeat):
+    '''
+    Returns the best time of the function over the repeats in seconds, and its result.
+    '''
+    best = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        result = function(data)
+        best = min(best, perf_counter() - start)
+    return best, result
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--duplicates', type=float, default=0.05)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    data = synthetic_data(args.rows, args.duplicates)
+    print(f"{len(data)} rows x {data.shape[1]} columns")
+    legacy, _ = benchmark(pandas_removal, data, args.repeat)
+    hashed, removed = benchmark(hashed_removal, data, args.repeat)
+    print(f"{'pandas (s)':>12}{'hashed (s)':>12}{'speedup':>10}{'duplicates':>12}")
+    print(f"{legacy:>12.3f}{hashed:>12.3f}{legacy / hashed:>9.1f}x{removed:>12}")
+
+if __name__ == '__main__':
+    main()
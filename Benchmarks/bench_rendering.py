@@ -0,0 +1,52 @@
+'''
+This script benchmarks the per-figure latency of the visualizations,
+building a new pyplot figure for every plot (previous code path) against
+reusing one figure per plot type and updating its artists.
+Usage: python -m Benchmarks.bench_rendering [--rows N] [--columns K]
+'''
+
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from numpy.random import default_rng
+from pandas import DataFrame
+
+from Scripts.visualization import generate_visualizations, plan_visualizations
+
+PLOT_TYPES = ['Scatter Plot', 'Line Plot', 'Bar Plot', 'Histogram', 'Boxplot', 'Violin Plot']
+
+def synthetic_data(rows, columns, seed=0):
+    '''
+    Builds a DataFrame of normally distributed float columns.
+    '''
+    rng = default_rng(seed)
+    return DataFrame(rng.normal(size=(rows, columns)),
+                     columns=[f'col_{i}' for i in range(columns)])
+
+def benchmark(data, plot_type, reuse_figures):
+    '''
+    Renders every figure of a plot type in-process and returns the latency per figure in seconds.
+    '''
+    with TemporaryDirectory() as folder_path:
+        figures = len(plan_visualizations(data, [plot_type], [], folder_path, reuse_figures))
+        start = perf_counter()
+        generate_visualizations(data, [plot_type], [], folder_path,
+                                processes=1, reuse_figures=reuse_figures)
+        return (perf_counter() - start) / figures
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--columns', type=int, default=6)
+    args = parser.parse_args()
+
+    data = synthetic_data(args.rows, args.columns)
+    print(f"{'Plot type':<14}{'new figure (ms)':>18}{'reused (ms)':>14}{'speedup':>10}")
+    for plot_type in PLOT_TYPES:
+        legacy = benchmark(data, plot_type, reuse_figures=False)
+        reused = benchmark(data, plot_type, reuse_figures=True)
+        print(f"{plot_type:<14}{legacy * 1000:>18.1f}{reused * 1000:>14.1f}{legacy / reused:>9.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+'''
+This script benchmarks the standardization and normalization of wide tables,
+fitting a scaler and assigning every column back one by one (previous code path)
+against scaling all the numeric columns as 2-D blocks.
+Usage: python -m Benchmarks.bench_scaling [--rows N] [--columns K] [--repeat R]
+'''
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from numpy.random import default_rng
+from pandas import DataFrame
+from sklearn.preprocessing import StandardScaler, MinMaxScaler
+
+from Scripts.dtypes import NUMERIC_DTYPES
+from Scripts.transformation import perform_transformations
+
+def synthetic_data(rows, columns, dtype, seed=0):
+    '''
+    Builds a DataFrame of normally distributed float columns of the given dtype.
+    '''
+    rng = default_rng(seed)
+    return DataFrame(rng.normal(10, 3, size=(rows, columns)).astype(dtype),
+                     columns=[f'col_{i}' for i in range(columns)])
+
+def per_column_scaling(data, transformation):
+    '''
+    The previous per-column loop of perform_transformations.
+    '''
+    for col in data.columns:
+        if data[col].dtype not in NUMERIC_DTYPES:
+            continue
+        scaler = StandardScaler() if transformation == 'Standardization' else MinMaxScaler()
+        data[col] = scaler.fit_transform(data[col].values.reshape(-1, 1))
+    return data
+
+def block_scaling(data, transformation):
+    return perform_transformations(data, [transformation], [])[1]
+
+def benchmark(function, data, transformation, repeat):
+    '''
+    Returns the best time of the function over the repeats in seconds, and its result.
+    '''
+    best = float('inf')
+    for _ in range(repeat):
+        copy = data.copy()
+        start = perf_counter()
+        result = function(copy, transformation)
+        best = min(best, perf_counter() - start)
+    return best, result
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--columns', type=int, default=600)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{args.rows} rows x {args.columns} columns")
+    print(f"{'Transformation':<17}{'dtype':<9}{'per column (s)':>16}{'2-D block (s)':>15}{'speedup':>10}{'output dtype':>14}")
+    for dtype in ['float64', 'float32']:
+        data = synthetic_data(args.rows, args.columns, dtype)
+        for transformation in ['Standardization', 'Normalization']:
+            legacy, _ = benchmark(per_column_scaling, data, transformation, args.repeat)
+            block, result = benchmark(block_scaling, data, transformation, args.repeat)
+            output_dtypes = ','.join(sorted({str(d) for d in result.dtypes}))
+            print(f"{transformation:<17}{dtype:<9}{legacy:>16.3f}{block:>15.3f}"
+                  f"{legacy / block:>9.1f}x{output_dtypes:>14}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+'''
+This script measures the startup of the application: the time taken to import
+main.py, broken down per import, the heavy modules loaded at startup, and the
+cold import time of the modules left to the background warm-up.
+Every measure runs in a new interpreter with python -X importtime.
+Usage: python -m Benchmarks.bench_startup [--depth D] [--top N]
+'''
+
+from argparse import ArgumentParser
+from os import environ
+
+from Scripts.startup import import_breakdown, WARM_UP_MODULES
+
+HEAVY_MODULES = ['pandas', 'pyarrow', 'sklearn', 'matplotlib', 'scipy', 'joblib']
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--depth', type=int, default=1, help="Nesting level of the imports reported.")
+    parser.add_argument('--top', type=int, default=15, help="Number of imports reported.")
+    args = parser.parse_args()
+
+    # Kivy doesn't parse the arguments nor log to the console when main is imported
+    env = dict(environ, KIVY_NO_ARGS='1', KIVY_NO_CONSOLELOG='1')
+    total, imports, names = import_breakdown('main', args.depth, env)
+    print(f"import main: {total:.3f} s")
+    print(f"{'module':<40}{'cumulative (s)':>16}{'share':>8}")
+    for name, seconds in sorted(imports, key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<40}{seconds:>16.3f}{seconds / total:>8.0%}")
+
+    loaded = [module for module in HEAVY_MODULES if module in names]
+    print(f"heavy modules loaded at startup: {', '.join(loaded) or 'none'}")
+
+    print(f"{'warmed up in the background':<40}{'cold import (s)':>16}")
+    for module in WARM_UP_MODULES:
+        seconds, _, _ = import_breakdown(module, env=env)
+        print(f"{module:<40}{seconds:>16.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+'''
+This script is the benchmark suite of the data operations: loading, statistics,
+transformations, duplicate removal, missing values handling and plotting.
+The synthetic dataset is generated from the columns of the files in Samples/:
+numeric columns are resampled from the values of a sample column (with a small
+jitter for floats), categorical ones from its value frequencies, in the requested
+number of rows and columns and mix of dtypes, with missing values and duplicate rows.
+Every operation is timed headlessly (best of the repeats), then run once more under
+tracemalloc for its peak memory. The results are written as JSON and can be compared
+with a previous run, reporting the operations slower or larger than a threshold.
+Usage: python -m Benchmarks.bench_suite [--rows N] [--columns K] [--numeric F] [--missing F]
+       [--duplicates F] [--operations OP ...] [--output FILE] [--compare FILE] [--threshold R]
+'''
+
+from argparse import ArgumentParser
+from datetime import datetime
+from json import dump, load
+from os import path, listdir
+from platform import python_version
+from subprocess import run
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import sys
+import tracemalloc
+
+from numpy import __version__ as numpy_version
+from numpy.random import default_rng
+from pandas import DataFrame, Series, concat, read_csv, __version__ as pandas_version
+
+from Scripts import operations
+from Scripts.ingest import read_file
+from Scripts.statistics import describe
+from Scripts.transformation import perform_transformations
+
+SAMPLES_FOLDER = path.join(path.dirname(path.dirname(path.abspath(__file__))), 'Samples')
+PLOTTED_COLUMNS = 4
+
+def sample_columns(folder=SAMPLES_FOLDER):
+    '''
+    Reads the columns of the sample files.
+    Returns the numeric and the categorical columns, as lists of pandas Series.
+    '''
+    numeric, categorical = [], []
+    for name in sorted(listdir(folder)):
+        if not name.lower().endswith(('.csv', '.txt')):
+            continue
+        data = read_csv(path.join(folder, name))
+        for column in data.columns:
+            values = data[column].dropna()
+            if values.dtype.kind in 'iuf':
+                numeric.append(values)
+            elif values.nunique() > 1:
+                categorical.append(values.astype(object))
+    return numeric, categorical
+
+def synthetic_data(rows, columns, numeric_share=0.7, missing=0.05, duplicates=0.02, seed=0):
+    '''
+    Builds a DataFrame whose columns are resampled from the columns of the sample files.
+    Args:
+        rows (int): The number of rows.
+        columns (int): The number of columns.
+        numeric_share (float): The share of numeric columns.
+        missing (float): The share of missing values of every column.
+        duplicates (float): The share of rows that are copies of other rows.
+        seed (int): The seed of the generator.
+    Returns:
+        data (pandas.DataFrame): The dataset.
+    '''
+    rng = default_rng(seed)
+    numeric, categorical = sample_columns()
+    numeric_count = round(columns * numeric_share) if categorical else columns
+    data = {}
+    for index in range(columns):
+        if index < numeric_count:
+            source = numeric[index % len(numeric)]
+            values = rng.choice(source.to_numpy(), rows)
+            if source.dtype.kind == 'f':
+                values = values + rng.normal(0, source.std() * 0.01 or 1e-3, rows)
+        else:
+            source = categorical[(index - numeric_count) % len(categorical)]
+            frequencies = source.value_counts(normalize=True)
+            # object dtype, as read_file loads the text columns
+            values = Series(rng.choice(frequencies.index.to_numpy(), rows, p=frequencies.to_numpy()),
+                            dtype=object)
+        data[f"{source.name}_{index}"] = values
+    data = DataFrame(data)
+    if missing:
+        for column in data.columns:
+            data.loc[rng.random(rows) < missing, column] = None
+    copies = int(rows * duplicates)
+    if copies:
+        data = concat([data.iloc[:rows - copies], data.iloc[rng.integers(0, rows - copies, copies)]],
+                      ignore_index=True)
+    return data
+
+def numeric_columns(data):
+    return list(data.select_dtypes(include='number').columns)
+
+def benchmark_load(data, folder):
+    file_path = path.join(folder, 'data.csv')
+    data.to_csv(file_path, index=False)
+    return (file_path,), read_file
+
+def benchmark_plot(data, folder):
+    from Scripts.visualization import generate_visualizations
+    columns = numeric_columns(data)[:PLOTTED_COLUMNS]
+    return (data, ['Histogram', 'Boxplot', 'Correlation Heatmap'], columns, folder), \
+        lambda *args: generate_visualizations(*args, processes=1)
+
+# Every operation returns the arguments and the function timed, the setup isn't timed
+OPERATIONS = {
+    'load': benchmark_load,
+    'describe': lambda data, folder: ((data,), describe),
+    'standardize': lambda data, folder: ((data.copy(), ['Standardization'], []), perform_transformations),
+    'one_hot': lambda data, folder: ((data.copy(), ['One-Hot Encoding'], []), perform_transformations),
+    'dedupe': lambda data, folder: ((data,), lambda df: operations.remove_duplicates(df).redo(df)),
+    'fill_mean': lambda data, folder: ((data, 'mean'), lambda df, method: operations.handle_missing_values(df, method).redo(df)),
+    'fill_mode': lambda data, folder: ((data, 'mode'), lambda df, method: operations.handle_missing_values(df, method).redo(df)),
+    'drop_na': lambda data, folder: ((data, 'remove'), lambda df, method: operations.handle_missing_values(df, method).redo(df)),
+    'fill_knn': lambda data, folder: ((data, 'knn', numeric_columns(data)[:8]),
+                                      lambda df, method, columns: operations.handle_missing_values(df, method, columns).redo(df)),
+    'plot': benchmark_plot,
+}
+
+def measure(setup, data, folder, repeat):
+    '''
+    Times an operation and measures its peak memory.
+    Returns:
+        result (dict): The best and mean seconds of the repeats, and the peak traced bytes.
+    '''
+    times = []
+    for _ in range(repeat):
+        args, function = setup(data, folder)
+        start = perf_counter()
+        function(*args)
+        times.append(perf_counter() - start)
+    # tracemalloc slows the allocations down, the memory is measured in a separate run
+    args, function = setup(data, folder)
+    tracemalloc.start()
+    try:
+        function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': min(times), 'mean_seconds': sum(times) / len(times), 'peak_bytes': peak}
+
+def git_commit():
+    result = run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                 cwd=path.dirname(SAMPLES_FOLDER))
+    return result.stdout.strip() if result.returncode == 0 else None
+
+def compare(results, baseline, threshold):
+    '''
+    Prints the ratios of the results to a baseline run.
+    Returns:
+        regressions (list): The operations slower or larger than threshold times the baseline.
+    '''
+    if results['config'] != baseline['config']:
+        print(f"warning: the baseline was run with {baseline['config']}")
+    print(f"{'operation':<14}{'time ratio':>12}{'memory ratio':>14}")
+    regressions = []
+    for name, result in results['operations'].items():
+        if name not in baseline['operations']:
+            continue
+        reference = baseline['operations'][name]
+        time_ratio = result['seconds'] / reference['seconds']
+        memory_ratio = result['peak_bytes'] / max(reference['peak_bytes'], 1)
+        flag = ''
+        if time_ratio > threshold or memory_ratio > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<14}{time_ratio:>11.2f}x{memory_ratio:>13.2f}x{flag}")
+    return regressions
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--columns', type=int, default=20)
+    parser.add_argument('--numeric', type=float, default=0.7, help="Share of numeric columns.")
+    parser.add_argument('--missing', type=float, default=0.05, help="Share of missing values per column.")
+    parser.add_argument('--duplicates', type=float, default=0.02, help="Share of duplicate rows.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--operations', nargs='+', choices=list(OPERATIONS), default=list(OPERATIONS))
+    parser.add_argument('--output', help="JSON file of the results.")
+    parser.add_argument('--compare', help="JSON file of a previous run to compare the results with.")
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help="Ratio to the previous run above which an operation is a regression.")
+    args = parser.parse_args()
+
+    config = {'rows': args.rows, 'columns': args.columns, 'numeric': args.numeric,
+              'missing': args.missing, 'duplicates': args.duplicates, 'seed': args.seed}
+    data = synthetic_data(args.rows, args.columns, args.numeric, args.missing, args.duplicates, args.seed)
+    print(f"{len(data)} rows x {data.shape[1]} columns ({len(numeric_columns(data))} numeric)")
+    print(f"{'operation':<14}{'best (s)':>10}{'mean (s)':>10}{'peak (MB)':>11}")
+    results = {'config': config,
+               'environment': {'python': python_version(), 'pandas': pandas_version,
+                               'numpy': numpy_version, 'commit': git_commit(),
+                               'date': datetime.now().isoformat(timespec='seconds')},
+               'operations': {}}
+    with TemporaryDirectory() as folder:
+        for name in args.operations:
+            result = measure(OPERATIONS[name], data, folder, args.repeat)
+            results['operations'][name] = result
+            print(f"{name:<14}{result['seconds']:>10.3f}{result['mean_seconds']:>10.3f}"
+                  f"{result['peak_bytes'] / 1024 ** 2:>11.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            dump(results, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, load(file), args.threshold)
+        if regressions:
+            print(f"regressions: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+'''
+This module contains a bounded pool of worker threads running jobs.
+The long background jobs (warm-up, out-of-core transforms, exports) run in a
+separate lane with its own workers, so they never take the workers of the
+interactive jobs (statistics, counts, operations on the loaded data).
+A job carries the result or the exception of its function, a progress value
+and a cancellation flag checked cooperatively by the function. Progress and
+completion callbacks go through a dispatch function, which the UI uses to
+run them on its main thread.
+'''
+
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+from threading import Event, Lock
+from time import time
+
+MAX_WORKERS = 4
+BACKGROUND_WORKERS = 2
+MAX_HISTORY = 20
+
+class JobCancelled(Exception):
+    '''
+    Raised inside a job function to stop it once its job was cancelled.
+    '''
+
+class Job:
+    '''
+    A unit of work submitted to a JobExecutor.
+    '''
+    def __init__(self, name, background=False):
+        self.name = name
+        self.background = background
+        self.future = None
+        self.progress = 0.0
+        self.message = ""
+        self.started = None
+        self.finished = None
+        self.cancel_event = Event()
+        self.on_progress = None
+        self.dispatch = None
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    @property
+    def status(self):
+        if self.future is None or not (self.future.running() or self.future.done()):
+            return "cancelling" if self.cancelled else "pending"
+        if self.future.running():
+            return "cancelling" if self.cancelled else "running"
+        if self.future.cancelled() or isinstance(self.error, JobCancelled):
+            return "cancelled"
+        return "failed" if self.error is not None else "done"
+
+    @property
+    def error(self):
+        '''
+        The exception raised by the job function, None if it succeeded or is not done.
+        '''
+        if self.future is None or not self.future.done():
+            return None
+        try:
+            return self.future.exception()
+        except CancelledError as e:
+            return e
+
+    def cancel(self):
+        '''
+        Asks the job to stop. A pending job is not started, a running one
+        stops at its next call to check() or report().
+        '''
+        self.cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def check(self):
+        '''
+        Raises JobCancelled if the job was cancelled.
+        '''
+        if self.cancelled:
+            raise JobCancelled(self.name)
+
+    def report(self, progress, message=""):
+        '''
+        Updates the progress of the job, from 0 to 1, and notifies the progress callback.
+        Raises JobCancelled if the job was cancelled.
+        '''
+        self.progress = min(max(progress, 0.0), 1.0)
+        self.message = message
+        if self.on_progress is not None:
+            self.dispatch(self.on_progress, self)
+        self.check()
+
+    def result(self, timeout=None):
+        return self.future.result(timeout)
+
+    def is_alive(self):
+        return not self.future.done()
+
+    def join(self, timeout=None):
+        try:
+            self.future.exception(timeout)
+        except CancelledError:
+            pass
+
+def direct_dispatch(callback, *args):
+    return callback(*args)
+
+class JobExecutor:
+    '''
+    Runs jobs on bounded pools of worker threads, one for the interactive jobs
+    and one for the background jobs, and keeps the most recent ones.
+    '''
+    def __init__(self, max_workers=MAX_WORKERS, dispatch=direct_dispatch, background_workers=BACKGROUND_WORKERS):
+        '''
+        Args:
+            max_workers (int): The maximum number of interactive jobs running at once.
+            dispatch (callable): Called as dispatch(callback, *args) to run the callbacks,
+                e.g. to schedule them on the main thread of a UI.
+            background_workers (int): The maximum number of background jobs running at once.
+        '''
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self.background_pool = ThreadPoolExecutor(max_workers=background_workers,
+                                                  thread_name_prefix="background-job")
+        self.dispatch = dispatch
+        self.jobs = []
+        self.lock = Lock()
+
+    def submit(self, name, function, *args, on_progress=None, on_done=None, background=False, **kwargs):
+        '''
+        Submits a function to the pool, it's called as function(job, *args, **kwargs).
+        Args:
+            name (str): The name of the job, shown to the user.
+            function (callable): The function to run.
+            on_progress (callable): Called as on_progress(job) when the job reports progress.
+            on_done (callable): Called as on_done(job) once the job is done, failed or cancelled.
+            background (bool): Whether the job runs in the background lane, for long jobs
+                that shouldn't delay the interactive ones.
+        Returns:
+            job (Job): The submitted job.
+        '''
+        job = Job(name, background)
+        job.on_progress = on_progress
+        job.dispatch = self.dispatch
+
+        def run():
+            job.started = time()
+            job.check()
+            return function(job, *args, **kwargs)
+
+        def done(future):
+            job.finished = time()
+            if on_done is not None:
+                self.dispatch(on_done, job)
+
+        with self.lock:
+            job.future = (self.background_pool if background else self.pool).submit(run)
+            self.jobs.append(job)
+            finished = [j for j in self.jobs if j.future.done()]
+            for old_job in finished[:max(0, len(self.jobs) - MAX_HISTORY)]:
+                self.jobs.remove(old_job)
+        job.future.add_done_callback(done)
+        return job
+
+    def active_jobs(self):
+        with self.lock:
+            return [job for job in self.jobs if not job.future.done()]
+
+    def cancel_all(self):
+        for job in self.active_jobs():
+            job.cancel()
+
+    def shutdown(self):
+        self.cancel_all()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.background_pool.shutdown(wait=False, cancel_futures=True)
+
+default_executor = JobExecutor()
@@ -1,16 +1,25 @@
 ''' 
-This module contains a decorator that creates a new thread
- with a process using the input function
+This module contains the decorators that run the input function
+ as a job of the shared, bounded job executor
 '''
 
-from threading import Thread
+from Scripts.Threading.executor import default_executor
 
 def thread(function):
     ''' 
-    Creates a new thread with a process using the input function
+    Runs the input function as a job of the default executor and returns the job
     '''
     def wrap(*args, **kwargs):
-        t = Thread(target=function, args=args, kwargs=kwargs, daemon=True)
-        t.start()
-        return t
-    return wrap
\ No newline at end of file
+        return default_executor.submit(function.__name__,
+                                       lambda job: function(*args, **kwargs))
+    return wrap
+
+def background_thread(function):
+    ''' 
+    Runs the input function as a job of the background lane of the default executor and returns the job
+    '''
+    def wrap(*args, **kwargs):
+        return default_executor.submit(function.__name__,
+                                       lambda job: function(*args, **kwargs),
+                                       background=True)
+    return wrap
@@ -0,0 +1,184 @@
+'''
+This script contains the headless processing of data files: a file is loaded, a
+declared sequence of steps is applied to it with the operations of the application,
+and the processed data (as CSV, compressed CSV, Parquet or Feather), the fitted
+transformation pipeline and the visualizations are written to an output folder.
+Several files are processed in parallel by a pool of processes. It imports no GUI
+module, and matplotlib only for the visualizations.
+
+A step is a dict with an 'op' key:
+- {'op': 'drop', 'columns': [...]}
+- {'op': 'dedupe', 'columns': [...]}                  (all the columns if empty)
+- {'op': 'impute', 'method': ..., 'columns': [...], 'key': ...}
+    method in operations.MISSING_VALUE_METHODS, key for the group methods
+- {'op': 'transform', 'types': [...], 'columns': [...], 'max_categories': ..., 'sparse': ...}
+- {'op': 'visualize', 'types': [...], 'columns': [...], 'output_mode': ..., 'max_points': ...}
+'''
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from json import load
+from os import path, makedirs, listdir
+from time import perf_counter
+
+from Scripts import operations
+from Scripts.dtypes import optimize_dtypes
+from Scripts.export import export, remove_path
+from Scripts.ingest import read_file, CHUNK_SIZE
+from Scripts.transformation import (TransformationPipeline, SCALINGS, ENCODINGS, MAX_CATEGORIES,
+                                    SUPPORTED_EXTENSIONS)
+
+STEPS = ['drop', 'dedupe', 'impute', 'transform', 'visualize']
+
+def load_steps(file_path):
+    """
+    Read the steps from a JSON file holding a list of steps.
+    """
+    with open(file_path) as file:
+        steps = load(file)
+    validate_steps(steps)
+    return steps
+
+def validate_steps(steps):
+    """
+    Check the steps before any file is processed. Raises ValueError on the first invalid step.
+    """
+    for number, step in enumerate(steps, start=1):
+        op = step.get('op')
+        if op not in STEPS:
+            raise ValueError(f"Step {number}: unknown op {op!r}, expected one of {STEPS}")
+        if op == 'drop' and not step.get('columns'):
+            raise ValueError(f"Step {number}: no columns to drop")
+        if op == 'impute':
+            if step.get('method') not in operations.MISSING_VALUE_METHODS:
+                raise ValueError(f"Step {number}: unknown method {step.get('method')!r}, "
+                                 f"expected one of {operations.MISSING_VALUE_METHODS}")
+            if step['method'].startswith('group') and not step.get('key'):
+                raise ValueError(f"Step {number}: the group imputation needs a key column")
+        if op == 'transform':
+            unknown = set(step.get('types', [])) - set(SCALINGS + ENCODINGS)
+            if unknown or not step.get('types'):
+                raise ValueError(f"Step {number}: unknown transformations {sorted(unknown)}, "
+                                 f"expected some of {SCALINGS + ENCODINGS}")
+        if op == 'visualize':
+            from Scripts.visualization import RENDERERS, OUTPUT_MODES
+            unknown = set(step.get('types', [])) - set(RENDERERS)
+            if unknown or not step.get('types'):
+                raise ValueError(f"Step {number}: unknown visualizations {sorted(unknown)}, "
+                                 f"expected some of {list(RENDERERS)}")
+            if step.get('output_mode', 'separate') not in OUTPUT_MODES:
+                raise ValueError(f"Step {number}: unknown output mode {step['output_mode']!r}")
+
+def data_files(paths):
+    """
+    Expand the folders of a list of paths into their supported files, sorted by name.
+    """
+    files = []
+    for file_path in paths:
+        if path.isdir(file_path):
+            files.extend(path.join(file_path, name) for name in sorted(listdir(file_path))
+                         if name.lower().endswith(SUPPORTED_EXTENSIONS))
+        else:
+            files.append(file_path)
+    return files
+
+def apply_step(df, step, output_folder, processes=1):
+    """
+    Apply one step to the data.
+    Returns:
+    - (pandas.DataFrame, list): The data after the step and the paths it wrote.
+    """
+    op = step['op']
+    columns = list(step.get('columns', []))
+    outputs = []
+    if op == 'drop':
+        delta = operations.drop_columns(df, columns)
+    elif op == 'dedupe':
+        delta = operations.remove_duplicates(df, columns)
+    elif op == 'impute':
+        delta = operations.handle_missing_values(df, step['method'], columns, key=step.get('key'))
+    elif op == 'transform':
+        pipeline = TransformationPipeline(step['types'], columns,
+                                          step.get('max_categories', MAX_CATEGORIES),
+                                          step.get('sparse', False))
+        delta = operations.transform(df, pipeline)
+        pipeline_path = path.join(output_folder, 'pipeline.joblib')
+        pipeline.save(pipeline_path)
+        outputs.append(pipeline_path)
+    else:
+        # matplotlib is only loaded by the runs plotting something
+        from Scripts.visualization import generate_visualizations
+        before = set(listdir(output_folder))
+        generate_visualizations(df, step['types'], columns, output_folder, processes=processes,
+                                output_mode=step.get('output_mode', 'separate'),
+                                max_points=step.get('max_points'))
+        created = sorted(set(listdir(output_folder)) - before)
+        outputs.extend(path.join(output_folder, name) for name in created)
+        delta = None
+    if delta is not None and delta is not True:
+        df = delta.redo(df)
+    return df, outputs
+
+def process_file(file_path, steps, output_dir, optimize=False, chunksize=CHUNK_SIZE, processes=1,
+                 output_format='csv', partition_column=None):
+    """
+    Load a file, apply the steps and save the processed data.
+    The outputs are written to a folder of output_dir named after the file.
+    Parameters:
+    - file_path (str): The CSV/TXT/Excel file.
+    - steps (list): The steps, see the module docstring.
+    - output_dir (str): The folder of the output folders.
+    - optimize (bool): Whether to downcast the dtypes of the loaded data.
+    - chunksize (int): The number of rows parsed per batch.
+    - processes (int): The number of processes rendering the visualizations.
+    - output_format (str): The format of the processed data, one of export.EXPORT_FORMATS.
+    - partition_column (str): The column the Parquet output is partitioned by,
+        None for a single file.
+    Returns:
+    - dict: The summary of the run: file, rows and columns before and after, outputs,
+        seconds, error.
+    """
+    start = perf_counter()
+    summary = {'file': file_path, 'outputs': [], 'error': None}
+    try:
+        df = read_file(file_path, chunksize)
+        output_folder = path.join(output_dir, path.splitext(path.basename(file_path))[0])
+        makedirs(output_folder, exist_ok=True)
+        if optimize:
+            optimize_dtypes(df)
+        summary['shape_before'] = df.shape
+        for step in steps:
+            df, outputs = apply_step(df, step, output_folder, processes)
+            summary['outputs'].extend(outputs)
+        output_path = path.join(output_folder, f'processed.{output_format}')
+        # The output of a previous run is replaced, a partitioned one is a folder
+        remove_path(output_path)
+        export(df, output_path, output_format, partition_column)
+        summary['outputs'].append(output_path)
+        summary['shape_after'] = df.shape
+    except Exception as e:
+        summary['error'] = f"{type(e).__name__}: {e}"
+    summary['seconds'] = perf_counter() - start
+    return summary
+
+def process_files(files, steps, output_dir, jobs=1, optimize=False, chunksize=CHUNK_SIZE,
+                  output_format='csv', partition_column=None):
+    """
+    Process files, in parallel over jobs processes when there are several files.
+    With several jobs, every file renders its visualizations in its own process only.
+    Yields:
+    - dict: The summary of every file (see process_file), in order of completion.
+    """
+    validate_steps(steps)
+    makedirs(output_dir, exist_ok=True)
+    jobs = min(jobs, len(files))
+    if jobs <= 1:
+        for file_path in files:
+            yield process_file(file_path, steps, output_dir, optimize, chunksize, None,
+                               output_format, partition_column)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(process_file, file_path, steps, output_dir, optimize, chunksize, 1,
+                               output_format, partition_column)
+                   for file_path in files]
+        for future in as_completed(futures):
+            yield future.result()
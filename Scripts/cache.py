@@ -0,0 +1,125 @@
+'''
+This script contains the functions to cache parsed data files on disk.
+Parsed DataFrames are stored in the uncompressed Feather (Arrow IPC) format,
+keyed by the path, modification time and size of the source file. An entry is
+read back through a memory map, without parsing nor an intermediate read buffer,
+then converted to a DataFrame: the conversion copies the data, the DataFrame
+doesn't reference the entry, which can be evicted while the data is in use.
+The cache is capped in size, the least recently used entries are evicted first.
+Caching is disabled if pyarrow is not installed.
+'''
+
+from os import path, makedirs, listdir, remove, replace, stat, utime
+from hashlib import sha1
+
+try:
+    from pyarrow import feather
+except ImportError:
+    feather = None
+
+CACHE_DIR = path.join(path.expanduser('~'), '.mlstarterkit', 'cache')
+CACHE_SIZE_LIMIT = 2 * 1024**3
+CACHE_EXTENSION = '.feather'
+
+def cache_path(file_path, cache_dir=CACHE_DIR):
+    """
+    Return the path of the cache entry for the given source file.
+
+    Parameters:
+    - file_path (str): The path of the source file.
+    - cache_dir (str): The directory holding the cache entries.
+
+    Returns:
+    str
+    """
+    file_stat = stat(file_path)
+    key = f"{path.abspath(file_path)}|{file_stat.st_mtime_ns}|{file_stat.st_size}"
+    return path.join(cache_dir, sha1(key.encode('utf-8')).hexdigest() + CACHE_EXTENSION)
+
+def load_cached(file_path, cache_dir=CACHE_DIR):
+    """
+    Load the cached DataFrame of the given source file, as a copy of the entry in memory.
+
+    Parameters:
+    - file_path (str): The path of the source file.
+    - cache_dir (str): The directory holding the cache entries.
+
+    Returns:
+    pandas.DataFrame, or None if the file isn't cached (or caching is unavailable).
+    """
+    if feather is None:
+        return None
+    entry = cache_path(file_path, cache_dir)
+    if not path.exists(entry):
+        return None
+    try:
+        # The memory map only saves reading the file into a buffer, to_pandas copies the columns
+        df = feather.read_table(entry, memory_map=True).to_pandas()
+    except Exception as e:
+        print(e)
+        return None
+    # Marks the entry as recently used
+    utime(entry)
+    return df
+
+def store_cached(file_path, data, cache_dir=CACHE_DIR, size_limit=CACHE_SIZE_LIMIT):
+    """
+    Store the parsed DataFrame of the given source file in the cache,
+    then evict the least recently used entries above the size limit.
+
+    Parameters:
+    - file_path (str): The path of the source file.
+    - data (pandas.DataFrame): The parsed data.
+    - cache_dir (str): The directory holding the cache entries.
+    - size_limit (int): The maximum size of the cache in bytes.
+
+    Returns:
+    bool
+        True if the data was cached, False otherwise.
+    """
+    if feather is None:
+        return False
+    # Feather only stores string column names and a default index
+    if not all(isinstance(col, str) for col in data.columns):
+        return False
+    makedirs(cache_dir, exist_ok=True)
+    entry = cache_path(file_path, cache_dir)
+    temp_entry = entry + '.tmp'
+    try:
+        feather.write_feather(data.reset_index(drop=True), temp_entry,
+                              compression='uncompressed')
+        replace(temp_entry, entry)
+    except Exception as e:
+        print(e)
+        if path.exists(temp_entry):
+            remove(temp_entry)
+        return False
+    evict(cache_dir, size_limit)
+    return True
+
+def evict(cache_dir=CACHE_DIR, size_limit=CACHE_SIZE_LIMIT):
+    """
+    Remove the least recently used cache entries until the cache fits in the size limit.
+
+    Parameters:
+    - cache_dir (str): The directory holding the cache entries.
+    - size_limit (int): The maximum size of the cache in bytes.
+
+    Returns:
+    None
+    """
+    entries = []
+    for name in listdir(cache_dir):
+        if name.endswith(CACHE_EXTENSION):
+            entry_stat = stat(path.join(cache_dir, name))
+            entries.append((entry_stat.st_mtime, entry_stat.st_size, name))
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, name in sorted(entries):
+        if total_size <= size_limit:
+            break
+        try:
+            remove(path.join(cache_dir, name))
+            total_size -= size
+        except OSError as e:
+            print(e)
+    return
@@ -0,0 +1,77 @@
+'''
+This script contains the class recording what an operation changed in the data.
+The UI uses it to refresh only the panels and columns touched by the operation
+instead of rebuilding everything.
+'''
+
+class ChangeSet:
+    '''
+    The columns and rows touched by an operation on a DataFrame.
+    - columns: the columns whose values (or dtype) were modified in place.
+    - added: the columns that were added.
+    - dropped: the columns that were removed.
+    - rows: whether rows were removed or added, which affects every column.
+    '''
+    def __init__(self, columns=(), added=(), dropped=(), rows=False):
+        self.columns = set(columns)
+        self.added = set(added)
+        self.dropped = set(dropped)
+        self.rows = rows
+
+    @classmethod
+    def between(cls, before_columns, after_columns, touched=()):
+        '''
+        Builds the ChangeSet of an operation from the columns before and after it.
+        Args:
+            before_columns (list): The columns of the DataFrame before the operation.
+            after_columns (list): The columns of the DataFrame after the operation.
+            touched (list): The columns the operation may have modified.
+        Returns:
+            changes (ChangeSet): The changes made by the operation.
+        '''
+        before_columns, after_columns = set(before_columns), set(after_columns)
+        return cls(columns=set(touched) & before_columns & after_columns,
+                   added=after_columns - before_columns,
+                   dropped=before_columns - after_columns)
+
+    def merge(self, other):
+        '''
+        Adds the changes of another operation to this one.
+        Args:
+            other (ChangeSet): The changes to be added.
+        Returns:
+            self (ChangeSet): The merged changes.
+        '''
+        self.columns |= other.columns
+        self.added = (self.added | other.added) - other.dropped
+        self.dropped = (self.dropped | other.dropped) - other.added
+        self.columns -= self.dropped
+        self.rows = self.rows or other.rows
+        return self
+
+    @property
+    def structural(self):
+        '''
+        Whether the list of columns changed.
+        '''
+        return bool(self.added or self.dropped)
+
+    @property
+    def empty(self):
+        '''
+        Whether the operation changed nothing.
+        '''
+        return not (self.columns or self.structural or self.rows)
+
+    def affected(self, columns):
+        '''
+        Returns the columns whose content has to be recomputed, in the given order.
+        Args:
+            columns (list): The current columns of the DataFrame.
+        Returns:
+            affected (list): The affected columns.
+        '''
+        if self.rows:
+            return list(columns)
+        touched = self.columns | self.added
+        return [column for column in columns if column in touched]
@@ -0,0 +1,116 @@
+'''
+This script contains the correlation service of the numeric columns.
+The correlation matrix is computed once and cached against the version of the
+DataFrame, so the heatmap and any other view reading it don't recompute it.
+Pearson correlations of very tall tables are computed in a streaming pass over
+chunks of rows, accumulating the pairwise sums instead of holding the whole table.
+'''
+
+from numpy import float64, isfinite, nan, sqrt, where, errstate, fill_diagonal
+from pandas import DataFrame
+from Scripts.versioned_cache import VersionedCache
+
+METHODS = ['pearson', 'spearman']
+CHUNK_SIZE = 100000
+
+# Cached correlation matrices, by version and (columns, method)
+correlation_cache = VersionedCache()
+
+def pearson_chunks(chunks, columns):
+    """
+    Compute the Pearson correlation matrix of columns from chunks of rows, in one pass.
+    Like DataFrame.corr, each pair of columns uses the rows where both values are present.
+    Parameters:
+    - chunks: iterable of pandas DataFrame
+        The chunks of rows, e.g. read with pandas.read_csv(..., chunksize=n).
+    - columns: list of str
+        The numeric columns to be correlated.
+    Returns:
+    - pandas DataFrame
+        The correlation matrix.
+    """
+    columns = list(columns)
+    shift = None
+    count = total = squares = products = None
+    for chunk in chunks:
+        values = chunk[columns].to_numpy(dtype=float64, na_value=nan)
+        present = isfinite(values)
+        if shift is None:
+            # The values are shifted by the mean of the first chunk to limit the cancellation
+            with errstate(invalid='ignore'):
+                shift = where(present, values, 0).sum(axis=0) / present.sum(axis=0).clip(1)
+        values = where(present, values - shift, 0)
+        mask = present.astype(float64)
+        # Sums over the rows where both columns of a pair are present
+        chunk_count = mask.T @ mask
+        chunk_total = values.T @ mask
+        chunk_squares = (values * values).T @ mask
+        chunk_products = values.T @ values
+        if count is None:
+            count, total, squares, products = chunk_count, chunk_total, chunk_squares, chunk_products
+        else:
+            count += chunk_count
+            total += chunk_total
+            squares += chunk_squares
+            products += chunk_products
+
+    if count is None:
+        return DataFrame(nan, index=columns, columns=columns)
+    with errstate(invalid='ignore', divide='ignore'):
+        # total[i, j] is the sum of column i over the rows where column j is present
+        covariance = products - total * total.T / count
+        variance_i = squares - total * total / count
+        # Variances within the rounding error of the sums are constant columns
+        variance_i[variance_i <= 1e-12 * squares] = 0
+        variance_j = variance_i.T
+        correlation = covariance / sqrt(variance_i * variance_j)
+    correlation[(count < 2) | (variance_i * variance_j <= 0)] = nan
+    correlation = correlation.clip(-1, 1)
+    # Columns with a non-zero variance are perfectly correlated with themselves
+    fill_diagonal(correlation, where(variance_i.diagonal() > 0, 1.0, nan))
+    return DataFrame(correlation, index=columns, columns=columns)
+
+def compute_correlation(data, columns, method='pearson', chunksize=CHUNK_SIZE):
+    """
+    Compute the correlation matrix of columns, streaming the Pearson correlation over
+    chunks of rows when the data has more than chunksize rows.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown correlation method: {method}")
+    if method == 'pearson' and chunksize and len(data) > chunksize:
+        chunks = (data.iloc[start:start + chunksize] for start in range(0, len(data), chunksize))
+        return pearson_chunks(chunks, columns)
+    return data[columns].corr(method=method)
+
+def correlation_matrix(data, columns=None, method='pearson', version=None, chunksize=CHUNK_SIZE):
+    """
+    Return the correlation matrix of the numeric columns, cached against the version of the data.
+    Parameters:
+    - data: pandas DataFrame
+        The data.
+    - columns: list of str
+        The numeric columns to be correlated, all the numeric columns if None.
+    - method: str
+        One of METHODS.
+    - version: int
+        The version of the data, incremented by the caller whenever the data changes.
+        The matrix isn't cached if None.
+    - chunksize: int
+        Number of rows per chunk of the streaming Pearson correlation, None to compute it at once.
+    Returns:
+    - pandas DataFrame
+        The correlation matrix, shared with the other callers when cached: it must not be modified.
+    """
+    if columns is None:
+        columns = data.select_dtypes(include='number').columns
+    columns = list(columns)
+    if version is None:
+        return compute_correlation(data, columns, method, chunksize)
+
+    key = (tuple(columns), method)
+    matrix = correlation_cache.get(version, key)
+    if matrix is not None:
+        return matrix
+    # Computed outside the lock of the cache, the other threads keep reading it meanwhile
+    matrix = compute_correlation(data, columns, method, chunksize)
+    return correlation_cache.put(version, key, matrix)
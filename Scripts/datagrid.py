@@ -0,0 +1,350 @@
+'''
+This script contains the virtualized widgets used to display a DataFrame.
+DataGrid keeps a fixed pool of cells and only rewrites their text when the
+visible window of rows/columns moves, so its widget count doesn't depend on
+the size of the data. ColumnInfoView lists the columns through a RecycleView,
+which only instantiates the rows that are visible.
+'''
+
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.checkbox import CheckBox
+from kivy.uix.slider import Slider
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from Scripts.dtypes import null_counts
+
+CELL_HEIGHT = 30
+
+def shorten(text, length=7):
+    '''
+    Shortens a text to the given length, adding "..." if it was cut.
+    Args:
+        text (str): The text to shorten.
+        length (int): The maximum number of characters kept.
+    Returns:
+        text (str): The shortened text.
+    '''
+    text = str(text)
+    return text if len(text) < length else text[:length]+"..."
+
+class DataGrid(BoxLayout):
+    '''
+    A grid showing a window of a DataFrame with a fixed number of cells.
+    The visible rows and columns are moved with the sliders or the mouse wheel.
+    '''
+    def __init__(self, df, colors, palette, visible_rows=10, visible_cols=6, **kwargs):
+        '''
+        Builds the cell pool and the sliders.
+        Args:
+            df (pandas.DataFrame): The data to display.
+            colors (dict): The named colors of the application.
+            palette (list): The colors cycled through for the column headers.
+            visible_rows (int): The number of data rows displayed at once.
+            visible_cols (int): The number of data columns displayed at once.
+        Returns:
+            None
+        '''
+        super().__init__(orientation='vertical', spacing=5, size_hint_y=None, **kwargs)
+        self.df = df
+        self.colors = colors
+        self.palette = palette
+        self.visible_rows = visible_rows
+        self.visible_cols = visible_cols
+        self.row_offset = 0
+        self.col_offset = 0
+        self.updating = False
+
+        grid_box_layout = BoxLayout(orientation='horizontal', spacing=5,
+                                    size_hint_y=None,
+                                    height=(visible_rows+1)*(CELL_HEIGHT+5))
+        self.grid_layout = GridLayout(cols=visible_cols+1, spacing=5, padding=(25, 0))
+        self.header_cells = []
+        self.index_cells = []
+        self.cells = []
+        for row in range(visible_rows+1):
+            for col in range(visible_cols+1):
+                cell = Button(text="",
+                              color=colors["COLOR"],
+                              height=CELL_HEIGHT,
+                              font_family="Msyhl",
+                              font_size=14,
+                              background_normal="",
+                              background_down="",
+                              background_color=colors["GRAY"],
+                              size_hint_y=None)
+                if row == 0 and col > 0:
+                    self.header_cells.append(cell)
+                elif col == 0:
+                    cell.background_color = colors["COLOR"]
+                    cell.color = "ffffff"
+                    self.index_cells.append(cell)
+                else:
+                    self.cells.append(cell)
+                self.grid_layout.add_widget(cell)
+        grid_box_layout.add_widget(self.grid_layout)
+
+        self.row_slider = Slider(orientation='vertical', min=0, max=1, step=1,
+                                 value_track=True, value_track_color=colors["GREEN"],
+                                 size_hint=(None, 1), width=20)
+        self.row_slider.bind(value=self.on_row_slider)
+        grid_box_layout.add_widget(self.row_slider)
+        self.add_widget(grid_box_layout)
+
+        self.col_slider = Slider(orientation='horizontal', min=0, max=1, step=1,
+                                 value_track=True, value_track_color=colors["GREEN"],
+                                 size_hint=(1, None), height=20)
+        self.col_slider.bind(value=self.on_col_slider)
+        self.add_widget(self.col_slider)
+        self.height = grid_box_layout.height + self.col_slider.height + self.spacing
+
+        self.set_data(df)
+
+    def set_data(self, df):
+        '''
+        Replaces the displayed data, keeping the current window when possible.
+        Args:
+            df (pandas.DataFrame): The data to display.
+        Returns:
+            None
+        '''
+        self.df = df
+        max_row = max(0, len(df) - self.visible_rows)
+        max_col = max(0, len(df.columns) - self.visible_cols)
+        self.row_offset = min(self.row_offset, max_row)
+        self.col_offset = min(self.col_offset, max_col)
+        self.update_sliders(max_row, max_col)
+        self.refresh()
+        return
+
+    def update_sliders(self, max_row=None, max_col=None):
+        '''
+        Moves the sliders to the current window without triggering a scroll.
+        Args:
+            max_row (int): The new maximum row offset, unchanged if None.
+            max_col (int): The new maximum column offset, unchanged if None.
+        Returns:
+            None
+        '''
+        self.updating = True
+        if max_row is not None:
+            self.row_slider.max = max(max_row, 1)
+            self.row_slider.disabled = max_row == 0
+        if max_col is not None:
+            self.col_slider.max = max(max_col, 1)
+            self.col_slider.disabled = max_col == 0
+        self.row_slider.value = self.row_slider.max - self.row_offset
+        self.col_slider.value = self.col_offset
+        self.updating = False
+        return
+
+    def on_row_slider(self, instance, value):
+        if not self.updating:
+            self.scroll_to(int(self.row_slider.max - value), self.col_offset)
+
+    def on_col_slider(self, instance, value):
+        if not self.updating:
+            self.scroll_to(self.row_offset, int(value))
+
+    def scroll_to(self, row_offset, col_offset):
+        '''
+        Moves the visible window to the given first row and column.
+        Args:
+            row_offset (int): The position of the first visible row.
+            col_offset (int): The position of the first visible column.
+        Returns:
+            None
+        '''
+        row_offset = min(max(0, row_offset), max(0, len(self.df) - self.visible_rows))
+        col_offset = min(max(0, col_offset), max(0, len(self.df.columns) - self.visible_cols))
+        if (row_offset, col_offset) == (self.row_offset, self.col_offset):
+            return
+        self.row_offset, self.col_offset = row_offset, col_offset
+        self.refresh()
+        return
+
+    def refresh(self):
+        '''
+        Rewrites the text of the cells with the visible window of the data.
+        Returns:
+            None
+        '''
+        window = self.df.iloc[self.row_offset:self.row_offset+self.visible_rows,
+                              self.col_offset:self.col_offset+self.visible_cols]
+        rows = window.values.tolist()
+        columns = list(window.columns)
+        index = list(window.index)
+
+        for col, cell in enumerate(self.header_cells):
+            if col < len(columns):
+                cell.text = shorten(columns[col])
+                cell.background_color = self.palette[(self.col_offset+col) % len(self.palette)]
+            else:
+                cell.text = ""
+                cell.background_color = self.colors["GRAY"]
+        for row, cell in enumerate(self.index_cells[1:]):
+            cell.text = shorten(index[row]) if row < len(index) else ""
+        for position, cell in enumerate(self.cells):
+            row, col = divmod(position, self.visible_cols)
+            cell.text = shorten(rows[row][col]) if row < len(rows) and col < len(columns) else ""
+        return
+
+    def on_touch_down(self, touch):
+        if self.collide_point(*touch.pos) and touch.is_mouse_scrolling:
+            step = {'scrolldown': -1, 'scrollup': 1,
+                    'scrollleft': (0, -1), 'scrollright': (0, 1)}.get(touch.button, 0)
+            if isinstance(step, tuple):
+                self.scroll_to(self.row_offset, self.col_offset + step[1])
+            else:
+                self.scroll_to(self.row_offset + step, self.col_offset)
+            self.update_sliders()
+            return True
+        return super().on_touch_down(touch)
+
+class ColumnInfoRow(RecycleDataViewBehavior, GridLayout):
+    '''
+    A recycled row of the ColumnInfoView: name, non-null count, dtype and selection checkbox.
+    '''
+    def __init__(self, **kwargs):
+        super().__init__(cols=4, spacing=10, padding=(25, 0), **kwargs)
+        self.view = None
+        self.column = None
+        self.name_button = Button(height=CELL_HEIGHT,
+                                  font_family="Msyhl",
+                                  font_size=14,
+                                  background_normal="",
+                                  background_down="",
+                                  size_hint_y=None)
+        self.count_label = Label(height=CELL_HEIGHT,
+                                 font_family="Msyhl",
+                                 font_size=14,
+                                 size_hint_y=None)
+        self.dtype_label = Label(height=CELL_HEIGHT,
+                                 font_family="Msyhl",
+                                 font_size=14,
+                                 size_hint_y=None)
+        self.checkbox = CheckBox(size_hint=(0.2, None), height=CELL_HEIGHT)
+        self.checkbox.bind(active=self.on_checkbox_active)
+        for widget in [self.name_button, self.count_label, self.dtype_label, self.checkbox]:
+            self.add_widget(widget)
+
+    def refresh_view_attrs(self, rv, index, data):
+        self.view = rv
+        self.column = data['column']
+        self.name_button.text = f"{index}. {data['column']}"
+        self.name_button.background_color = data['background_color']
+        for widget in [self.name_button, self.count_label, self.dtype_label]:
+            widget.color = data['color']
+        self.count_label.text = data['count']
+        self.dtype_label.text = data['dtype']
+        self.checkbox.color = data['checkbox_color']
+        self.checkbox.active = data['column'] in rv.selected
+        return
+
+    def on_checkbox_active(self, instance, value):
+        if self.view is None:
+            return
+        if value:
+            self.view.selected.add(self.column)
+        else:
+            self.view.selected.discard(self.column)
+
+class ColumnInfoView(RecycleView):
+    '''
+    A scrollable list of the columns of a DataFrame, each with a selection checkbox.
+    The selected column names are kept in `selected`.
+    '''
+    def __init__(self, df, colors, palette, visible_rows=8, missing=None, **kwargs):
+        '''
+        Builds the recycled list of columns.
+        Args:
+            df (pandas.DataFrame): The data whose columns are listed.
+            colors (dict): The named colors of the application.
+            palette (list): The colors cycled through for the column names.
+            visible_rows (int): The maximum number of rows displayed at once.
+            missing (MissingValueIndex): Optional index the null counts are read from
+                instead of scanning the data, pointed at the data before every update.
+        Returns:
+            None
+        '''
+        super().__init__(size_hint_y=None,
+                         bar_color=colors["GREEN"],
+                         bar_inactive_color=colors["GRAY"],
+                         bar_width=10,
+                         **kwargs)
+        self.colors = colors
+        self.palette = palette
+        self.visible_rows = visible_rows
+        self.missing = missing
+        self.selected = set()
+        self.viewclass = ColumnInfoRow
+        layout = RecycleBoxLayout(orientation='vertical',
+                                  spacing=10,
+                                  default_size=(None, CELL_HEIGHT),
+                                  default_size_hint=(1, None),
+                                  size_hint_y=None)
+        layout.bind(minimum_height=layout.setter('height'))
+        self.add_widget(layout)
+        self.set_data(df)
+
+    def set_data(self, df):
+        '''
+        Replaces the listed columns, keeping the selection of the remaining ones.
+        Args:
+            df (pandas.DataFrame): The data whose columns are listed.
+        Returns:
+            None
+        '''
+        self.selected.intersection_update(df.columns)
+        counts = len(df) - self.null_counts(df)
+        self.data = [{'column': column,
+                      'count': str(counts[column]),
+                      'dtype': str(df[column].dtype),
+                      'color': self.colors["COLOR"],
+                      'checkbox_color': self.colors["GREEN"],
+                      'background_color': self.palette[index % len(self.palette)]}
+                     for index, column in enumerate(df.columns)]
+        self.height = min(len(self.data), self.visible_rows) * (CELL_HEIGHT + 10)
+        return
+
+    def update_columns(self, df, columns):
+        '''
+        Refreshes the non-null count and dtype of the given columns only.
+        Args:
+            df (pandas.DataFrame): The data whose columns are listed.
+            columns (list): The columns that changed.
+        Returns:
+            None
+        '''
+        columns = list(columns)
+        if not columns:
+            return
+        counts = len(df) - self.null_counts(df, columns)
+        positions = {entry['column']: index for index, entry in enumerate(self.data)}
+        for column in columns:
+            entry = self.data[positions[column]]
+            entry['count'] = str(counts[column])
+            entry['dtype'] = str(df[column].dtype)
+        self.refresh_from_data()
+        return
+
+    def null_counts(self, df, columns=None):
+        '''
+        Returns the number of missing values of the columns, all columns if None.
+        '''
+        if self.missing is not None:
+            return self.missing.null_counts(columns)
+        return null_counts(df if columns is None else df[columns])
+
+    def selected_columns(self, columns):
+        '''
+        Returns the selected column names in the order of the given columns.
+        Args:
+            columns (list): The columns of the DataFrame.
+        Returns:
+            selected (list): The selected column names.
+        '''
+        return [column for column in columns if column in self.selected]
@@ -0,0 +1,77 @@
+'''
+This script contains the functions reducing large columns to a bounded amount of
+data to draw, so the rendering time of a plot doesn't grow with the number of rows.
+- lttb: Largest-Triangle-Three-Buckets decimation of a line, keeping its visual shape.
+- density: 2-D histogram of a point cloud, drawn as an image instead of one marker per point.
+'''
+
+from numpy import abs as np_abs, histogram2d, isfinite, linspace, empty
+
+LTTB_POINTS = 2000
+DENSITY_BINS = 200
+
+def finite_pairs(x, y):
+    """
+    Return the points of two arrays where both coordinates are finite.
+    """
+    mask = isfinite(x) & isfinite(y)
+    return x[mask], y[mask]
+
+def lttb(x, y, points=LTTB_POINTS):
+    """
+    Decimate a line with the Largest-Triangle-Three-Buckets algorithm.
+    The points are split in buckets, and in each bucket the point forming the largest
+    triangle with the previously kept point and the mean of the next bucket is kept.
+    Parameters:
+    - x: numpy array
+        The x coordinates of the line, in drawing order.
+    - y: numpy array
+        The y coordinates of the line.
+    - points: int
+        The number of points kept, including the first and the last one.
+    Returns:
+    - (numpy array, numpy array)
+        The x and y coordinates of the kept points, in drawing order.
+    """
+    x, y = finite_pairs(x, y)
+    count = len(x)
+    if points < 3 or count <= points:
+        return x, y
+
+    # Bucket edges of the inner points, the first and last points are always kept
+    edges = linspace(1, count - 1, points - 1).astype('int64')
+    kept = empty(points, dtype='int64')
+    kept[0], kept[-1] = 0, count - 1
+    previous = 0
+    for bucket in range(points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else count
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+        # Twice the area of the triangles (previous point, candidate, next bucket mean)
+        areas = np_abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + areas.argmax()
+        kept[bucket + 1] = previous
+    return x[kept], y[kept]
+
+def density(x, y, bins=DENSITY_BINS):
+    """
+    Count the points of two arrays in a grid of bins.
+    Parameters:
+    - x: numpy array
+        The x coordinates of the points.
+    - y: numpy array
+        The y coordinates of the points.
+    - bins: int
+        The number of bins along each axis.
+    Returns:
+    - (numpy array, tuple)
+        The counts, indexed as [y bin, x bin] to be drawn as an image,
+        and the (left, right, bottom, top) extent of the grid.
+    """
+    x, y = finite_pairs(x, y)
+    if len(x) == 0:
+        return histogram2d([], [], bins=bins, range=[[0, 1], [0, 1]])[0], (0, 1, 0, 1)
+    counts, x_edges, y_edges = histogram2d(x, y, bins=bins)
+    return counts.T, (x_edges[0], x_edges[-1], y_edges[0], y_edges[-1])
@@ -0,0 +1,119 @@
+'''
+This script contains the dtype groups used across the starter kit and the
+function to optimize the memory footprint of a DataFrame after loading.
+Numeric columns are downcast to the narrowest integer/float type holding
+their values, float64 columns to float32 only if every value is exactly
+representable in float32, and low-cardinality string columns are converted to categories.
+'''
+
+from numpy import array_equal, errstate
+from pandas import to_numeric, SparseDtype, CategoricalDtype
+from pandas.api.types import is_string_dtype
+
+NUMERIC_DTYPES = ['int8', 'int16', 'int32', 'int64',
+                  'uint8', 'uint16', 'uint32', 'uint64',
+                  'float32', 'float64']
+# The integer dtypes narrower than int64, whose squares may overflow them
+NARROW_INTEGER_DTYPES = ['int8', 'int16', 'int32', 'uint8', 'uint16', 'uint32']
+
+SAMPLE_SIZE = 10000
+CATEGORY_RATIO = 0.5
+
+def memory_size(data):
+    """
+    Return the memory used by the given data in bytes, including the contents of object columns.
+
+    Parameters:
+    - data (pandas.DataFrame): The data to be measured.
+
+    Returns:
+    int
+    """
+    return int(data.memory_usage(deep=True).sum())
+
+def is_categorical(dtype):
+    """
+    Return whether a column dtype holds labels: object and string columns (the text
+    columns of pandas 2 and 3) and category columns.
+
+    Parameters:
+    - dtype: The dtype of the column.
+
+    Returns:
+    bool
+    """
+    return is_string_dtype(dtype) or isinstance(dtype, CategoricalDtype)
+
+def null_counts(data):
+    """
+    Return the number of missing values of every column.
+    Sparse columns (e.g. sparse one-hot encoded columns) are counted one by one,
+    pandas can't reduce a frame mixing sparse and dense columns at once.
+
+    Parameters:
+    - data (pandas.DataFrame): The data to be measured.
+
+    Returns:
+    pandas.Series
+    """
+    sparse = [column for column, dtype in data.dtypes.items() if isinstance(dtype, SparseDtype)]
+    if not sparse:
+        return data.isnull().sum()
+    counts = data.drop(columns=sparse).isnull().sum()
+    for column in sparse:
+        counts[column] = data[column].isnull().sum()
+    return counts.reindex(data.columns)
+
+def fits_float32(values):
+    """
+    Return whether every value of a float64 column is unchanged by a cast to float32, NaN included.
+
+    Parameters:
+    - values (pandas.Series): The column to be checked.
+
+    Returns:
+    bool
+    """
+    values = values.to_numpy()
+    # The values above the float32 range become inf and fail the comparison
+    with errstate(over='ignore'):
+        narrowed = values.astype('float32')
+    return array_equal(narrowed.astype('float64'), values, equal_nan=True)
+
+def optimize_dtypes(data, sample_size=SAMPLE_SIZE, category_ratio=CATEGORY_RATIO):
+    """
+    Downcast the columns of the given data to smaller dtypes, in place.
+
+    Parameters:
+    - data (pandas.DataFrame): The data to be optimized.
+    - sample_size (int): The number of rows sampled to estimate the cardinality of string columns.
+    - category_ratio (float): String columns whose ratio of distinct values in the sample
+        is below this value are converted to the 'category' dtype.
+
+    Returns:
+    pandas.DataFrame
+    """
+    if data.empty:
+        return data
+    sample = data.sample(min(sample_size, len(data)), random_state=0)
+
+    for col in data.columns:
+        dtype = data[col].dtype
+        if dtype in ['int8', 'int16', 'int32', 'int64']:
+            data[col] = to_numeric(data[col], downcast='integer')
+        elif dtype in ['uint8', 'uint16', 'uint32', 'uint64']:
+            data[col] = to_numeric(data[col], downcast='unsigned')
+        elif dtype == 'float64':
+            # A lossy cast would change the statistics and exported values, the column is kept in float64
+            if fits_float32(data[col]):
+                data[col] = data[col].astype('float32')
+        elif is_string_dtype(dtype):
+            values = sample[col].dropna()
+            if len(values) == 0:
+                continue
+            # Mixed columns (e.g. numbers and strings) are left untouched
+            if not values.map(type).eq(str).all():
+                continue
+            if values.nunique() / len(values) < category_ratio:
+                data[col] = data[col].astype('category')
+    return data
@@ -0,0 +1,249 @@
+'''
+This script contains the duplicate detection of the rows of a table.
+The columns compared are hashed once into one 64-bit hash per row, and the
+duplicates are found on this compact array instead of the columns themselves.
+The duplicate mask is cached against the version of the DataFrame, so counting
+the duplicates and then removing them hashes the data only once. Hashing pays
+off on tall tables only, smaller ones are compared with DataFrame.duplicated.
+Files larger than the memory are processed chunk by chunk, keeping only the
+sorted hashes of the rows already seen.
+'''
+
+from os import remove
+from numpy import (concatenate, empty, zeros, ones, flatnonzero, maximum, searchsorted, sort,
+                   isfinite, floor, abs as absolute, nan, uint64, int64, float64)
+from pandas import factorize
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+from pandas.util import hash_array, hash_pandas_object
+from Scripts.ingest import read_chunks, CHUNK_SIZE
+from Scripts.versioned_cache import VersionedCache
+
+# Cached duplicate masks, by version and columns
+duplicates_cache = VersionedCache()
+# Below this number of rows, DataFrame.duplicated is faster than hashing the rows
+# (crossover at ~350k rows with Benchmarks/bench_duplicates, mostly string columns)
+HASHED_MIN_ROWS = 300000
+# Odd multiplier combining the hashes of the columns of a row (64-bit FNV prime)
+COMBINE_MULTIPLIER = uint64(0x100000001B3)
+# Floats at or above this magnitude don't fit in an int64
+INT64_LIMIT = 2.0 ** 63
+
+def number_hashes(values):
+    """
+    Hash the values of a numeric column, so that equal numbers have the same hash
+    whichever dtype the column was parsed with (as in two chunks of the same file).
+    Integers, and floats holding an integer, are hashed as int64, so integers above
+    2**53 aren't rounded as they would be by a float64 cast. Other floats and the
+    missing values are hashed as float64.
+    Parameters:
+    - values: pandas Series
+        A numeric, non-boolean column.
+    Returns:
+    - numpy array
+        The uint64 hash of every value.
+    """
+    floats = values.to_numpy(dtype=float64, na_value=nan)
+    hashes = hash_array(floats)
+    if values.dtype.kind in 'iu':
+        integral = values.notna().to_numpy()
+        integers = values[integral].to_numpy().astype(int64)
+    else:
+        integral = isfinite(floats) & (floor(floats) == floats) & (absolute(floats) < INT64_LIMIT)
+        integers = floats[integral].astype(int64)
+    hashes[integral] = hash_array(integers)
+    return hashes
+
+def row_hashes(data, columns=None):
+    """
+    Hash the values of the rows of a DataFrame into one 64-bit integer per row.
+    Numbers are hashed with number_hashes, so 1 and 1.0 have the same hash whichever
+    dtype the column was parsed with (as in two chunks of the same file).
+    Parameters:
+    - data: pandas DataFrame
+        The data.
+    - columns: list of str
+        The columns compared, all the columns if None.
+    Returns:
+    - numpy array
+        The uint64 hash of every row.
+    """
+    subset = data if columns is None else data[list(columns)]
+    # Without columns every row is equal to the first, as with DataFrame.duplicated
+    hashes = zeros(len(subset), dtype=uint64)
+    for position in range(subset.shape[1]):
+        values = subset.iloc[:, position]
+        if is_numeric_dtype(values.dtype) and not is_bool_dtype(values.dtype):
+            column_hashes = number_hashes(values)
+        else:
+            column_hashes = hash_pandas_object(values, index=False).to_numpy()
+        hashes = hashes * COMBINE_MULTIPLIER ^ column_hashes
+    return hashes
+
+def first_occurrences(hashes):
+    """
+    Find the first row of every distinct hash.
+    Returns:
+    - (numpy array, numpy array)
+        The code of the hash of every row, numbered in order of first occurrence,
+        and the position of the first row of every code.
+    """
+    codes, _ = factorize(hashes)
+    # A row is the first of its code when its code is larger than all the previous ones
+    previous = concatenate([[-1], maximum.accumulate(codes)[:-1]])
+    return codes, flatnonzero(codes > previous)
+
+def find_duplicates(data, columns=None, verify=True):
+    """
+    Compute the duplicate mask of the rows of a DataFrame, as DataFrame.duplicated(subset=columns).
+    Parameters:
+    - data: pandas DataFrame
+        The data.
+    - columns: list of str
+        The columns compared, all the columns if None.
+    - verify: bool
+        Compare the values of every duplicate with the first row of its hash,
+        so that rows with colliding hashes aren't removed.
+    Returns:
+    - numpy array
+        True for the rows equal to a previous row.
+    """
+    codes, first = first_occurrences(row_hashes(data, columns))
+    mask = ones(len(codes), dtype=bool)
+    mask[first] = False
+    duplicates = flatnonzero(mask)
+    if verify and len(duplicates):
+        subset = data if columns is None else data[list(columns)]
+        rows = subset.iloc[duplicates].reset_index(drop=True)
+        originals = subset.iloc[first[codes[duplicates]]].reset_index(drop=True)
+        equal = ((rows == originals) | (rows.isna() & originals.isna())).all(axis=1).to_numpy()
+        mask[duplicates[~equal]] = False
+    return mask
+
+def duplicate_mask(data, columns):
+    """
+    Return the duplicate mask of the rows, from DataFrame.duplicated below HASHED_MIN_ROWS
+    rows and from the row hashes (find_duplicates) above.
+    """
+    if columns and len(data) < HASHED_MIN_ROWS:
+        return data.duplicated(subset=columns).to_numpy()
+    return find_duplicates(data, columns)
+
+def duplicated_rows(data, columns=None, version=None):
+    """
+    Return the duplicate mask of the rows, cached against the version of the data.
+    Parameters:
+    - data: pandas DataFrame
+        The data.
+    - columns: list of str
+        The columns compared, all the columns if None.
+    - version: int
+        The version of the data, incremented by the caller whenever the data changes.
+        The mask isn't cached if None.
+    Returns:
+    - numpy array
+        True for the rows equal to a previous row. Read-only when cached, as it is shared
+        with the other callers.
+    """
+    columns = list(data.columns if columns is None else columns)
+    if version is None:
+        return duplicate_mask(data, columns)
+
+    key = tuple(columns)
+    mask = duplicates_cache.get(version, key)
+    if mask is not None:
+        return mask
+    # Computed outside the lock of the cache, the other threads keep reading it meanwhile
+    mask = duplicate_mask(data, columns)
+    # Shared by the callers getting it from the cache
+    mask.flags.writeable = False
+    return duplicates_cache.put(version, key, mask)
+
+def count_duplicates(data, columns=None, version=None):
+    """
+    Count the duplicate rows without removing them.
+    """
+    return int(duplicated_rows(data, columns, version).sum())
+
+def duplicate_positions(data, columns=None, version=None):
+    """
+    Return the sorted positions of the duplicate rows.
+    """
+    return flatnonzero(duplicated_rows(data, columns, version))
+
+def duplicated_chunks(chunks, columns=None):
+    """
+    Find the duplicate rows of a table read in chunks, a row being a duplicate
+    when it is equal to a previous row of the same chunk or of a previous chunk.
+    Only the sorted hashes of the distinct rows seen are kept, the rows of
+    previous chunks aren't compared and rows with colliding hashes count as duplicates.
+    Parameters:
+    - chunks: iterable of pandas DataFrame
+        The chunks of rows, e.g. read with read_chunks.
+    - columns: list of str
+        The columns compared, all the columns if None.
+    Yields:
+    - (pandas DataFrame, numpy array)
+        Every chunk and its duplicate mask.
+    """
+    seen = empty(0, dtype=uint64)
+    for chunk in chunks:
+        hashes = row_hashes(chunk, columns)
+        codes, first = first_occurrences(hashes)
+        mask = ones(len(codes), dtype=bool)
+        mask[first] = False
+        new = hashes[first]
+        if len(seen):
+            places = searchsorted(seen, new).clip(max=len(seen) - 1)
+            known = seen[places] == new
+            mask[first[known]] = True
+            new = new[~known]
+        # Merging two sorted runs is linear with a stable sort
+        seen = sort(concatenate([seen, sort(new)]), kind='stable')
+        yield chunk, mask
+
+def count_file_duplicates(file_path, columns=None, chunksize=CHUNK_SIZE, progress=None, cancel=None):
+    """
+    Count the duplicate rows of a file larger than the memory, without removing them.
+    Parameters:
+    - file_path (str): The CSV/TXT file.
+    - columns (list): The columns compared, all the columns if None or empty.
+    - chunksize (int): The number of rows per chunk.
+    - progress (callable): Optional callback called as progress(done, total) with the bytes read.
+    - cancel (threading.Event): Optional event, the count stops once it is set.
+    Returns:
+    - int: The number of duplicate rows, None if the count was cancelled.
+    """
+    report = (lambda bytes_read, total_bytes, rows_read: progress(bytes_read, total_bytes)) if progress else None
+    count = 0
+    for _, mask in duplicated_chunks(read_chunks(file_path, chunksize, report, cancel), columns or None):
+        count += int(mask.sum())
+    if cancel is not None and cancel.is_set():
+        return None
+    return count
+
+def drop_file_duplicates(file_path, output_path, columns=None, chunksize=CHUNK_SIZE, progress=None, cancel=None):
+    """
+    Remove the duplicate rows of a file larger than the memory, chunk by chunk,
+    writing the first occurrence of every row to a CSV file.
+    Parameters:
+    - file_path (str): The CSV/TXT file.
+    - output_path (str): The CSV file written without the duplicates.
+    - columns (list): The columns compared, all the columns if None or empty.
+    - chunksize (int): The number of rows per chunk.
+    - progress (callable): Optional callback called as progress(done, total) with the bytes read.
+    - cancel (threading.Event): Optional event, the removal stops once it is set.
+    Returns:
+    - int: The number of removed rows, None (and no file) if the removal was cancelled.
+    """
+    report = (lambda bytes_read, total_bytes, rows_read: progress(bytes_read, total_bytes)) if progress else None
+    count = 0
+    header = True
+    with open(output_path, 'w', newline='') as file:
+        for chunk, mask in duplicated_chunks(read_chunks(file_path, chunksize, report, cancel), columns or None):
+            count += int(mask.sum())
+            chunk[~mask].to_csv(file, index=False, header=header)
+            header = False
+    if cancel is not None and cancel.is_set():
+        remove(output_path)
+        return None
+    return count
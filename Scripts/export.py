@@ -0,0 +1,202 @@
+'''
+This script contains the functions to export a DataFrame to a file: CSV, plain
+or compressed (gzip/zstd), Parquet, optionally partitioned by a column into a
+folder of files, and Feather. CSV files are written in row chunks and Parquet
+files in row groups, so the caller can follow the progress and cancel the
+export between two chunks. The compressed CSV chunks are compressed one by one at
+the fastest level and appended as gzip members/zstd frames, which the gzip and zstd
+readers decompress as one stream. Every export is written to a temporary path first and
+moved in place once complete, a failed or cancelled export leaves no partial file.
+The compressed and columnar formats use pyarrow, only plain CSV is available without it.
+'''
+
+from os import path, remove, replace
+from shutil import rmtree
+
+from pandas import SparseDtype
+
+try:
+    from pyarrow import Codec, Table
+    from pyarrow import feather, parquet
+except ImportError:
+    Codec = Table = feather = parquet = None
+
+# Formats by extension, with their names shown in the interface
+EXPORT_FORMATS = {
+    'csv': 'CSV',
+    'csv.gz': 'CSV (gzip)',
+    'csv.zst': 'CSV (zstd)',
+    'parquet': 'Parquet',
+    'feather': 'Feather',
+}
+CSV_COMPRESSIONS = {'csv': None, 'csv.gz': 'gzip', 'csv.zst': 'zstd'}
+# About 6 times faster than the default gzip level, for files about 10% larger
+COMPRESSION_LEVEL = 1
+CHUNK_ROWS = 100000
+TEMPORARY_SUFFIX = '.part'
+
+def available_formats():
+    """
+    Return the export formats available, the ones of EXPORT_FORMATS needing pyarrow are left out without it.
+    """
+    return [file_format for file_format in EXPORT_FORMATS if file_format == 'csv' or parquet is not None]
+
+def file_format_of(file_path):
+    """
+    Return the export format of a file path from its extension, e.g. 'csv.gz'.
+    Raises ValueError if the extension isn't an export format.
+    """
+    name = path.basename(file_path).lower()
+    # The longest extension first, '.csv.gz' before '.csv'
+    for file_format in sorted(EXPORT_FORMATS, key=len, reverse=True):
+        if name.endswith('.' + file_format):
+            return file_format
+    raise ValueError(f"Unknown export format of {file_path}, expected one of {list(EXPORT_FORMATS)}")
+
+def remove_path(file_path):
+    if path.isdir(file_path):
+        rmtree(file_path)
+    elif path.exists(file_path):
+        remove(file_path)
+
+def arrow_table(data):
+    """
+    Convert a DataFrame to an Arrow table, without its index.
+    Sparse columns are densified and the column names converted to strings,
+    as Arrow supports neither sparse columns nor non-string names.
+    """
+    if not all(isinstance(column, str) for column in data.columns):
+        data = data.set_axis([str(column) for column in data.columns], axis=1)
+    sparse = [column for column, dtype in data.dtypes.items() if isinstance(dtype, SparseDtype)]
+    if sparse:
+        data = data.assign(**{column: data[column].sparse.to_dense() for column in sparse})
+    return Table.from_pandas(data, preserve_index=False)
+
+def write_csv(data, file_path, compression=None, chunksize=CHUNK_ROWS, progress=None, cancel=None):
+    """
+    Write a DataFrame to a CSV file in row chunks.
+
+    Parameters:
+    - data (pandas.DataFrame): The data to be written.
+    - file_path (str): The path of the file.
+    - compression (str): None, 'gzip' or 'zstd'.
+    - chunksize (int): The number of rows written per chunk.
+    - progress (callable): Optional callback called after every chunk as progress(rows_written, total_rows).
+    - cancel (threading.Event): Optional event, the export stops at the next chunk once it is set.
+
+    Returns:
+    bool
+        True if the file was written, False if the export was cancelled.
+    """
+    if compression is not None and parquet is None:
+        raise ValueError("Compressed CSV files need pyarrow")
+    codec = Codec(compression, COMPRESSION_LEVEL) if compression is not None else None
+    total_rows = len(data)
+    with open(file_path, 'wb') as file:
+        for start in range(0, max(total_rows, 1), chunksize):
+            if cancel is not None and cancel.is_set():
+                return False
+            chunk = data.iloc[start:start + chunksize]
+            text = chunk.to_csv(index=False, header=start == 0).encode('utf-8')
+            file.write(text if codec is None else codec.compress(text, asbytes=True))
+            if progress:
+                progress(start + len(chunk), total_rows)
+    return True
+
+def write_parquet(data, file_path, partition_column=None, chunksize=CHUNK_ROWS, progress=None, cancel=None):
+    """
+    Write a DataFrame to a Parquet file in row groups, or to a folder of Parquet
+    files partitioned by the values of a column (one subfolder per value, Hive style),
+    written chunk by chunk with one file per partition and chunk.
+
+    Parameters:
+    - data (pandas.DataFrame): The data to be written.
+    - file_path (str): The path of the file, or of the folder if partitioned.
+    - partition_column (str): The column the files are partitioned by, None for a single file.
+    - chunksize (int): The number of rows per row group, or per chunk if partitioned.
+    - progress (callable): Optional callback called after every row group or chunk as
+        progress(rows_written, total_rows).
+    - cancel (threading.Event): Optional event, the export stops at the next row group or chunk
+        once it is set.
+
+    Returns:
+    bool
+        True if the file was written, False if the export was cancelled.
+    """
+    table = arrow_table(data)
+    total_rows = table.num_rows
+    if partition_column is not None:
+        # One file per partition and chunk of rows, so the export can stop between two chunks
+        for index, start in enumerate(range(0, max(total_rows, 1), chunksize)):
+            if cancel is not None and cancel.is_set():
+                return False
+            parquet.write_to_dataset(table.slice(start, chunksize), file_path,
+                                     partition_cols=[str(partition_column)],
+                                     basename_template=f'part-{index:06d}-{{i}}.parquet')
+            if progress:
+                progress(min(start + chunksize, total_rows), total_rows)
+        return True
+    with parquet.ParquetWriter(file_path, table.schema) as writer:
+        for start in range(0, max(total_rows, 1), chunksize):
+            if cancel is not None and cancel.is_set():
+                return False
+            writer.write_table(table.slice(start, chunksize))
+            if progress:
+                progress(min(start + chunksize, total_rows), total_rows)
+    return True
+
+def write_feather(data, file_path, progress=None, cancel=None):
+    """
+    Write a DataFrame to a Feather (Arrow IPC) file compressed with LZ4, in one go.
+    """
+    if cancel is not None and cancel.is_set():
+        return False
+    feather.write_feather(arrow_table(data), file_path)
+    if progress:
+        progress(len(data), len(data))
+    return True
+
+def export(data, file_path, file_format=None, partition_column=None, chunksize=CHUNK_ROWS,
+           progress=None, cancel=None):
+    """
+    Export a DataFrame to a file in one of EXPORT_FORMATS.
+
+    Parameters:
+    - data (pandas.DataFrame): The data to be exported.
+    - file_path (str): The path of the file, or of the folder for partitioned Parquet files.
+    - file_format (str): The format, from the extension of the path if None.
+    - partition_column (str): The column the Parquet files are partitioned by, None for a single file.
+    - chunksize (int): The number of rows per CSV chunk or Parquet row group.
+    - progress (callable): Optional callback called as progress(rows_written, total_rows).
+    - cancel (threading.Event): Optional event, the export stops at the next chunk once it is set.
+
+    Returns:
+    bool
+        True if the file was written, False if the export was cancelled.
+    """
+    file_format = file_format or file_format_of(file_path)
+    if file_format not in available_formats():
+        raise ValueError(f"Unavailable export format {file_format!r}, expected one of {available_formats()}")
+    if partition_column is not None:
+        if file_format != 'parquet':
+            raise ValueError("Only Parquet files can be partitioned")
+        if str(partition_column) not in map(str, data.columns):
+            raise ValueError(f"Unknown partition column {partition_column!r}")
+        # A folder can't atomically replace another one
+        if path.exists(file_path):
+            raise FileExistsError(f"{file_path} already exists")
+    temporary_path = file_path + TEMPORARY_SUFFIX
+    remove_path(temporary_path)
+    try:
+        if file_format == 'parquet':
+            completed = write_parquet(data, temporary_path, partition_column, chunksize, progress, cancel)
+        elif file_format == 'feather':
+            completed = write_feather(data, temporary_path, progress, cancel)
+        else:
+            completed = write_csv(data, temporary_path, CSV_COMPRESSIONS[file_format], chunksize,
+                                  progress, cancel)
+        if completed:
+            replace(temporary_path, file_path)
+        return completed
+    finally:
+        remove_path(temporary_path)
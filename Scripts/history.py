@@ -0,0 +1,224 @@
+'''
+This script contains the undo/redo history of the operations on a DataFrame.
+An operation is recorded as a reversible delta holding only what it changed:
+- ColumnsDelta: the previous and new versions of the columns it replaced, added or dropped.
+- RemovedRows: the removed rows and their positions.
+- FilledValues: the positions of the filled missing values and the fill values.
+The memory of the history grows with the size of the changes, not of the data,
+and the oldest deltas are dropped above a memory limit.
+'''
+
+from numpy import arange, empty, ones, nan, int64
+from pandas import concat
+from Scripts.changes import ChangeSet
+
+MAX_HISTORY_BYTES = 512 * 1024 ** 2
+MAX_HISTORY_STEPS = 50
+
+class Delta:
+    """
+    A reversible change of a DataFrame.
+    redo(df) applies the change to the DataFrame before it and undo(df) reverts it,
+    both return a new DataFrame. size is the memory held by the delta, in bytes.
+    """
+    name = ""
+    size = 0
+
+    def redo(self, df):
+        raise NotImplementedError
+
+    def undo(self, df):
+        raise NotImplementedError
+
+    def changes(self, undo=False):
+        """
+        Return the ChangeSet of the delta, or of its reversal.
+        """
+        raise NotImplementedError
+
+class ColumnsDelta(Delta):
+    """
+    Columns replaced, added or dropped by an operation.
+    """
+    def __init__(self, name, before, after, columns_before, columns_after):
+        """
+        Parameters:
+        - name (str): The name of the operation.
+        - before (dict): The previous version of the replaced and dropped columns, by name.
+        - after (dict): The new version of the replaced and added columns, by name.
+        - columns_before (list): The columns of the DataFrame before the operation.
+        - columns_after (list): The columns of the DataFrame after the operation.
+        """
+        self.name = name
+        self.before = before
+        self.after = after
+        self.columns_before = list(columns_before)
+        self.columns_after = list(columns_after)
+        # The new columns are held by the DataFrame, the previous ones only by the history
+        self.size = sum(int(column.memory_usage(deep=True)) for column in before.values())
+
+    @classmethod
+    def between(cls, name, df_before, df_after, modified=()):
+        """
+        Build the delta of an operation from the DataFrame before and after it.
+        Parameters:
+        - name (str): The name of the operation.
+        - df_before (pandas.DataFrame): The DataFrame before the operation.
+        - df_after (pandas.DataFrame): The DataFrame after the operation.
+        - modified (list): The columns whose values were replaced by the operation.
+        Returns:
+        - ColumnsDelta
+        """
+        columns_before, columns_after = list(df_before.columns), list(df_after.columns)
+        dropped = set(columns_before) - set(columns_after)
+        added = set(columns_after) - set(columns_before)
+        modified = set(modified) & set(columns_before) & set(columns_after)
+        before = {column: df_before[column] for column in columns_before if column in modified | dropped}
+        after = {column: df_after[column] for column in columns_after if column in modified | added}
+        return cls(name, before, after, columns_before, columns_after)
+
+    def replace(self, df, old, new, columns):
+        df = df.drop(columns=[column for column in old if column not in new])
+        for column, values in new.items():
+            df[column] = values
+        if list(df.columns) != columns:
+            df = df[columns]
+        return df
+
+    def redo(self, df):
+        return self.replace(df.copy(deep=False), self.before, self.after, self.columns_after)
+
+    def undo(self, df):
+        return self.replace(df.copy(deep=False), self.after, self.before, self.columns_before)
+
+    def changes(self, undo=False):
+        changes = ChangeSet.between(self.columns_before, self.columns_after, self.before.keys() & self.after.keys())
+        if undo:
+            changes.added, changes.dropped = changes.dropped, changes.added
+        return changes
+
+class RemovedRows(Delta):
+    """
+    Rows removed by an operation.
+    """
+    def __init__(self, name, df, positions):
+        """
+        Parameters:
+        - name (str): The name of the operation.
+        - df (pandas.DataFrame): The DataFrame before the operation.
+        - positions (numpy array): The sorted positions of the removed rows.
+        """
+        self.name = name
+        self.positions = positions.astype(int64)
+        self.rows = df.iloc[self.positions]
+        self.total = len(df)
+        self.size = int(self.rows.memory_usage(deep=True).sum()) + self.positions.nbytes
+
+    def redo(self, df):
+        keep = ones(len(df), dtype=bool)
+        keep[self.positions] = False
+        return df[keep]
+
+    def undo(self, df):
+        # The kept rows fill the positions between the removed ones, in order
+        keep = ones(self.total, dtype=bool)
+        keep[self.positions] = False
+        take = empty(self.total, dtype=int64)
+        take[keep] = arange(len(df))
+        take[self.positions] = arange(len(df), self.total)
+        return concat([df, self.rows]).iloc[take]
+
+    def changes(self, undo=False):
+        return ChangeSet(rows=len(self.positions) > 0)
+
+class FilledValues(Delta):
+    """
+    Missing values filled by an operation. As the previous values were missing,
+    only their positions are kept.
+    """
+    def __init__(self, name, positions, values):
+        """
+        Parameters:
+        - name (str): The name of the operation.
+        - positions (dict): The positions of the filled values, by column.
+        - values (dict): The fill value, or the array of the fill values of the positions, by column.
+        """
+        self.name = name
+        self.positions = {column: rows.astype(int64) for column, rows in positions.items() if len(rows)}
+        self.values = {column: values[column] for column in self.positions}
+        self.size = sum(rows.nbytes for rows in self.positions.values()) + \
+            sum(getattr(value, 'nbytes', 0) for value in self.values.values())
+
+    def fill(self, df, values):
+        df = df.copy(deep=False)
+        for column, rows in self.positions.items():
+            filled = df[column].copy()
+            filled.iloc[rows] = values[column]
+            df[column] = filled
+        return df
+
+    def redo(self, df):
+        return self.fill(df, self.values)
+
+    def undo(self, df):
+        return self.fill(df, {column: nan for column in self.positions})
+
+    def changes(self, undo=False):
+        return ChangeSet(columns=self.positions)
+
+class History:
+    """
+    The undo and redo stacks of the deltas applied to a DataFrame.
+    """
+    def __init__(self, max_bytes=MAX_HISTORY_BYTES, max_steps=MAX_HISTORY_STEPS):
+        self.max_bytes = max_bytes
+        self.max_steps = max_steps
+        self.undo_stack = []
+        self.redo_stack = []
+
+    @property
+    def size(self):
+        return sum(delta.size for delta in self.undo_stack + self.redo_stack)
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def push(self, delta):
+        """
+        Record a delta that was just applied. The redo stack is cleared and the oldest
+        deltas are dropped above the maximum number of steps or memory size.
+        """
+        self.undo_stack.append(delta)
+        self.redo_stack.clear()
+        while len(self.undo_stack) > self.max_steps or \
+                (len(self.undo_stack) > 1 and self.size > self.max_bytes):
+            self.undo_stack.pop(0)
+
+    def undo(self, df):
+        """
+        Revert the last delta. Returns the reverted DataFrame and the delta, (df, None) if there is none.
+        """
+        if not self.undo_stack:
+            return df, None
+        delta = self.undo_stack.pop()
+        df = delta.undo(df)
+        self.redo_stack.append(delta)
+        return df, delta
+
+    def redo(self, df):
+        """
+        Apply the last reverted delta again. Returns the DataFrame and the delta, (df, None) if there is none.
+        """
+        if not self.redo_stack:
+            return df, None
+        delta = self.redo_stack.pop()
+        df = delta.redo(df)
+        self.undo_stack.append(delta)
+        return df, delta
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
@@ -0,0 +1,205 @@
+'''
+This script contains the model-based imputation of the missing values of numeric columns.
+- group: fills a value with the mean or median of its column within the group of its row,
+    the groups being the values of a key column.
+- knn: fills the values of a row with the mean of its nearest complete rows. The rows are
+    grouped by their pattern of missing columns, and the neighbors of every pattern are
+    searched in batches on the columns it has, so the memory doesn't grow with the rows.
+    Patterns with few rows are searched by brute force, building a tree wouldn't pay off.
+- iterative: fills every column with a regression on the other columns, in rounds,
+    starting from the column means (as sklearn's IterativeImputer).
+Every function returns the positions and the fill values of the missing values, by column,
+and reports its progress as progress(done, total) between batches.
+sklearn is imported by the functions using it, as it takes seconds to import.
+'''
+
+from numpy import (flatnonzero, isnan, nan, nanmean, nanstd, unique, where,
+                   abs as np_abs, float64)
+from numpy.random import default_rng
+from pandas.api.types import is_float_dtype, is_integer_dtype
+
+IMPUTATION_METHODS = ['group mean', 'group median', 'knn', 'iterative']
+KNN_NEIGHBORS = 5
+BATCH_SIZE = 10000
+BRUTE_FORCE_ROWS = 500
+ITERATIVE_ROUNDS = 10
+TRAINING_ROWS = 100000
+TOLERANCE = 1e-3
+
+def as_column_dtype(values, dtype):
+    """
+    Cast fill values to the dtype of their column, rounding them for integer columns.
+    """
+    # Nullable (extension) dtypes are cast to their numpy dtype
+    numpy_dtype = getattr(dtype, 'numpy_dtype', dtype)
+    if is_integer_dtype(dtype):
+        return values.round().astype(numpy_dtype)
+    if is_float_dtype(dtype):
+        return values.astype(numpy_dtype)
+    return values
+
+def numeric_values(data, columns):
+    return data[columns].to_numpy(dtype=float64, na_value=nan)
+
+def fills_of(data, columns, values, missing):
+    """
+    Return the positions and the fill values of the missing values of a 2-D array, by column.
+    """
+    positions, fills = {}, {}
+    for index, column in enumerate(columns):
+        rows = flatnonzero(missing[:, index])
+        if len(rows):
+            positions[column] = rows
+            fills[column] = as_column_dtype(values[rows, index], data[column].dtype)
+    return positions, fills
+
+def group_fill_values(data, columns, key, statistic='mean', progress=None, cancel=None):
+    """
+    Compute the fill values of numeric columns from the mean or median of their group.
+    Values whose group has no value are filled with the statistic of the whole column.
+    Parameters:
+    - data (pandas.DataFrame): The data.
+    - columns (list): The numeric columns to be filled.
+    - key (str): The column whose values define the groups.
+    - statistic (str): 'mean' or 'median'.
+    - progress (callable): Optional callback called as progress(done, total) after every column.
+    - cancel (threading.Event): Optional event, the imputation stops once it is set.
+    Returns:
+    - (dict, dict): The positions and the fill values of the missing values, by column,
+        None if the imputation was cancelled.
+    """
+    if statistic not in ['mean', 'median']:
+        raise ValueError(f"Unknown group statistic: {statistic}")
+    columns = [column for column in columns if column != key]
+    groups = data.groupby(data[key], sort=False, dropna=False, observed=True)
+    positions, fills = {}, {}
+    for done, column in enumerate(columns, start=1):
+        if cancel is not None and cancel.is_set():
+            return None
+        rows = flatnonzero(data[column].isna().to_numpy())
+        if len(rows):
+            values = groups[column].transform(statistic)
+            values = values.fillna(getattr(data[column], statistic)()).to_numpy(dtype=float64, na_value=nan)
+            positions[column] = rows
+            fills[column] = as_column_dtype(values[rows], data[column].dtype)
+        if progress:
+            progress(done, len(columns))
+    return positions, fills
+
+def knn_fill_values(data, columns, neighbors=KNN_NEIGHBORS, batch_size=BATCH_SIZE, progress=None, cancel=None):
+    """
+    Compute the fill values of numeric columns from the nearest neighbors of their rows.
+    The distances are computed on the standardized columns a row has, among the rows
+    without missing values in the columns, and a value is filled with the mean of its neighbors.
+    Parameters:
+    - data (pandas.DataFrame): The data.
+    - columns (list): The numeric columns, used both as features and to be filled.
+    - neighbors (int): The number of neighbors averaged.
+    - batch_size (int): The number of rows whose neighbors are searched at once.
+    - progress (callable): Optional callback called as progress(done, total) after every batch.
+    - cancel (threading.Event): Optional event, the imputation stops once it is set.
+    Returns:
+    - (dict, dict): The positions and the fill values of the missing values, by column,
+        None if the imputation was cancelled.
+    """
+    from sklearn.neighbors import NearestNeighbors
+
+    values = numeric_values(data, columns)
+    missing = isnan(values)
+    incomplete = flatnonzero(missing.any(axis=1))
+    donors = flatnonzero(~missing.any(axis=1))
+    if len(incomplete) and not len(donors):
+        raise ValueError("KNN imputation needs rows without missing values in the selected columns")
+    filled = values.copy()
+    if not len(incomplete):
+        return fills_of(data, columns, filled, missing)
+
+    means = nanmean(values, axis=0)
+    scale = nanstd(values, axis=0)
+    scaled = (values - means) / where(scale > 0, scale, 1)
+    patterns, inverse = unique(missing[incomplete], axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    done = 0
+    for pattern_index, pattern in enumerate(patterns):
+        rows = incomplete[inverse == pattern_index]
+        observed = flatnonzero(~pattern)
+        absent = flatnonzero(pattern)
+        if not len(observed):
+            # Nothing to compare the row with
+            filled[rows[:, None], absent] = means[absent]
+            done += len(rows)
+            if progress:
+                progress(done, len(incomplete))
+            continue
+        search = NearestNeighbors(n_neighbors=min(neighbors, len(donors)),
+                                  algorithm='brute' if len(rows) < BRUTE_FORCE_ROWS else 'auto')
+        search.fit(scaled[donors][:, observed])
+        for start in range(0, len(rows), batch_size):
+            if cancel is not None and cancel.is_set():
+                return None
+            batch = rows[start:start + batch_size]
+            _, nearest = search.kneighbors(scaled[batch][:, observed])
+            # values of the neighbors, indexed as [row, neighbor, column]
+            filled[batch[:, None], absent] = values[donors[nearest][:, :, None], absent].mean(axis=1)
+            done += len(batch)
+            if progress:
+                progress(done, len(incomplete))
+    return fills_of(data, columns, filled, missing)
+
+def iterative_fill_values(data, columns, rounds=ITERATIVE_ROUNDS, training_rows=TRAINING_ROWS,
+                          tolerance=TOLERANCE, batch_size=BATCH_SIZE, progress=None, cancel=None, seed=0):
+    """
+    Compute the fill values of numeric columns with rounds of regressions on the other columns.
+    The missing values start as the column means, then in every round each column with
+    missing values is regressed (BayesianRidge) on the current values of the other columns,
+    and its missing values are replaced by the predictions. The rounds stop once the
+    largest change of a filled value is below tolerance times the largest value.
+    Parameters:
+    - data (pandas.DataFrame): The data.
+    - columns (list): The numeric columns, used both as features and to be filled.
+    - rounds (int): The maximum number of rounds.
+    - training_rows (int): The maximum number of rows every regression is fitted on, sampled.
+    - tolerance (float): The stopping tolerance.
+    - batch_size (int): The number of rows predicted at once.
+    - progress (callable): Optional callback called as progress(done, total) after every regression.
+    - cancel (threading.Event): Optional event, the imputation stops once it is set.
+    - seed (int): The seed of the sampling of the training rows.
+    Returns:
+    - (dict, dict): The positions and the fill values of the missing values, by column,
+        None if the imputation was cancelled.
+    """
+    from sklearn.linear_model import BayesianRidge
+
+    values = numeric_values(data, columns)
+    missing = isnan(values)
+    # Columns without any value can't be regressed nor used as features
+    empty_columns = missing.all(axis=0)
+    filled = where(missing, nanmean(where(empty_columns, 0, values), axis=0), values)
+    targets = flatnonzero(missing.any(axis=0) & ~empty_columns)
+    features = flatnonzero(~empty_columns)
+    if len(features) < 2 or not len(targets):
+        return fills_of(data, columns, filled, missing & ~empty_columns)
+
+    rng = default_rng(seed)
+    largest = np_abs(values[~missing]).max()
+    total = rounds * len(targets)
+    for round_index in range(rounds):
+        previous = filled[missing & ~empty_columns]
+        for target_index, target in enumerate(targets):
+            if cancel is not None and cancel.is_set():
+                return None
+            others = features[features != target]
+            observed = flatnonzero(~missing[:, target])
+            if len(observed) > training_rows:
+                observed = rng.choice(observed, training_rows, replace=False)
+            model = BayesianRidge().fit(filled[observed][:, others], filled[observed, target])
+            rows = flatnonzero(missing[:, target])
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                filled[batch, target] = model.predict(filled[batch][:, others])
+            if progress:
+                progress(round_index * len(targets) + target_index + 1, total)
+        change = np_abs(filled[missing & ~empty_columns] - previous).max()
+        if change < tolerance * largest:
+            break
+    return fills_of(data, columns, filled, missing & ~empty_columns)
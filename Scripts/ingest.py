@@ -0,0 +1,106 @@
+'''
+This script contains the function to read a data file into a DataFrame.
+CSV/TXT files are parsed in row batches so that the caller can follow the
+progress (bytes and rows read) and cancel the load between two batches.
+Excel files are read in one go, as they can't be parsed incrementally.
+The batches are split into columns as they are read, and every column is
+concatenated on its own at the end, so loading a file takes about the memory
+of the data plus one column, instead of twice the data with one concatenation.
+The batches can also be iterated directly, to process files larger than the memory.
+
+Every batch is parsed with its own dtypes, the dtypes of a column are unified
+as pandas.concat does: integer and float batches give a float64 column (as a
+missing value in a single read would), while a column parsed as numbers or
+booleans in some batches and as text or with missing booleans in others gives
+an object column, keeping the values as parsed. A DtypeWarning lists the
+columns read as object columns this way.
+'''
+
+from os import path
+from warnings import warn
+from pandas import DataFrame, read_csv, read_excel, concat
+from pandas.errors import DtypeWarning
+
+CHUNK_SIZE = 100000
+
+def read_chunks(file_path, chunksize=CHUNK_SIZE, progress=None, cancel=None):
+    """
+    Read a CSV/TXT or Excel file as an iterator of DataFrames of at most chunksize rows.
+    Excel files are read as one chunk.
+
+    Parameters:
+    - file_path (str): The path of the file to be read.
+    - chunksize (int): The number of rows parsed per batch for CSV/TXT files.
+    - progress (callable): Optional callback called after every batch as
+        progress(bytes_read, total_bytes, rows_read).
+    - cancel (threading.Event): Optional event, the iteration stops at the next batch once it is set.
+
+    Yields:
+    pandas.DataFrame
+    """
+    total_bytes = path.getsize(file_path)
+    _, file_extension = path.splitext(file_path)
+    if file_extension.lower() not in ['.csv', '.txt']:
+        df = read_excel(file_path)
+        if progress:
+            progress(total_bytes, total_bytes, len(df))
+        yield df
+        return
+
+    rows_read = 0
+    with open(file_path, 'rb') as file:
+        for chunk in read_csv(file, chunksize=chunksize):
+            if cancel is not None and cancel.is_set():
+                return
+            rows_read += len(chunk)
+            if progress:
+                # The parser reads ahead in blocks, tell() is accurate to a block.
+                progress(min(file.tell(), total_bytes), total_bytes, rows_read)
+            yield chunk
+
+def read_file(file_path, chunksize=CHUNK_SIZE, progress=None, cancel=None):
+    """
+    Read a CSV/TXT or Excel file into a DataFrame.
+
+    Parameters:
+    - file_path (str): The path of the file to be read.
+    - chunksize (int): The number of rows parsed per batch for CSV/TXT files.
+    - progress (callable): Optional callback called after every batch as
+        progress(bytes_read, total_bytes, rows_read).
+    - cancel (threading.Event): Optional event, the load stops at the next batch once it is set.
+
+    Returns:
+    pandas.DataFrame, or None if the load was cancelled.
+    """
+    first = None
+    pieces = {}
+    for chunk in read_chunks(file_path, chunksize, progress, cancel):
+        if first is None:
+            first = chunk
+            continue
+        if not pieces:
+            pieces = {column: [first[column].copy()] for column in first.columns}
+        # The columns are copied out of the batch, so that the batch is freed now
+        # and every column can be freed once concatenated
+        for column in chunk.columns:
+            pieces[column].append(chunk[column].copy())
+        del chunk
+    if cancel is not None and cancel.is_set():
+        return None
+    if first is None:
+        return read_csv(file_path)
+    if not pieces:
+        return first
+    del first
+
+    columns, mixed = {}, []
+    for column in list(pieces):
+        dtypes = {str(piece.dtype) for piece in pieces[column]}
+        columns[column] = concat(pieces.pop(column), ignore_index=True)
+        if len(dtypes) > 1 and columns[column].dtype == object:
+            mixed.append(column)
+    if mixed:
+        warn(f"Columns {mixed} have different dtypes in different batches of {file_path}, "
+             f"they were read as object columns", DtypeWarning)
+    # Without copy the columns aren't consolidated into a copy of the data
+    return DataFrame(columns, copy=False)
@@ -0,0 +1,102 @@
+'''
+This script contains the missing-value index of a DataFrame.
+The null mask of every column is computed once, stored as a bitmap (1 bit per
+row) with its count, and the fill values (mean, median, mode) are computed on
+the first fill. Everything is kept until an operation changes the column, so
+the missing-value counts, the fills and the N/A removal don't rescan the frame.
+'''
+
+from numpy import bitwise_or, empty, flatnonzero, nan, packbits, unpackbits, int64
+from pandas import Series
+
+FILL_METHODS = ['mean', 'median', 'mode']
+
+class MissingValueIndex:
+    """
+    The null bitmaps and fill values of the columns of a DataFrame,
+    computed on first use and invalidated per column.
+    """
+    def __init__(self, df):
+        self.df = df
+        self.entries = {}
+
+    def set_data(self, df, changes=None):
+        """
+        Point the index at the DataFrame after an operation.
+        The columns modified, added or dropped are invalidated, and every column
+        when the rows changed or the changes aren't known.
+        Parameters:
+        - df (pandas.DataFrame): The DataFrame after the operation.
+        - changes (ChangeSet): The changes made by the operation.
+        """
+        if changes is None or changes.rows:
+            self.entries.clear()
+        else:
+            for column in changes.columns | changes.added | changes.dropped:
+                self.entries.pop(column, None)
+        self.df = df
+
+    def entry(self, column):
+        if column not in self.entries:
+            mask = self.df[column].isna().to_numpy()
+            self.entries[column] = {'bitmap': packbits(mask), 'count': int(mask.sum())}
+        return self.entries[column]
+
+    def mask(self, column):
+        """
+        Return the null mask of a column as a boolean array.
+        """
+        return unpackbits(self.entry(column)['bitmap'], count=len(self.df)).view(bool)
+
+    def positions(self, column):
+        """
+        Return the sorted positions of the missing values of a column.
+        """
+        if self.null_count(column) == 0:
+            return empty(0, dtype=int64)
+        return flatnonzero(self.mask(column))
+
+    def null_count(self, column):
+        return self.entry(column)['count']
+
+    def null_counts(self, columns=None):
+        """
+        Return the number of missing values of the columns (all the columns if None) as a pandas Series.
+        """
+        columns = list(self.df.columns if columns is None else columns)
+        return Series([self.null_count(column) for column in columns], index=columns, dtype='int64')
+
+    def total(self):
+        """
+        Return the number of missing values of the DataFrame.
+        """
+        return sum(self.null_count(column) for column in self.df.columns)
+
+    def rows_with_missing(self, columns=None):
+        """
+        Return the sorted positions of the rows with a missing value in any of the columns.
+        The bitmaps of the columns with missing values are OR-ed without unpacking them.
+        """
+        columns = [column for column in (self.df.columns if columns is None else columns)
+                   if self.null_count(column)]
+        if not columns:
+            return empty(0, dtype=int64)
+        bitmap = bitwise_or.reduce([self.entry(column)['bitmap'] for column in columns])
+        return flatnonzero(unpackbits(bitmap, count=len(self.df)))
+
+    def fill_value(self, column, method):
+        """
+        Return the value filling the missing values of a column with a method of FILL_METHODS,
+        NaN if the column has no value.
+        """
+        if method not in FILL_METHODS:
+            raise ValueError(f"Unknown fill method: {method}")
+        entry = self.entry(column)
+        if method not in entry:
+            values = self.df[column]
+            if method == 'mode':
+                modes = values.mode()
+                entry[method] = modes.iloc[0] if len(modes) else nan
+            else:
+                entry[method] = getattr(values, method)()
+        return entry[method]
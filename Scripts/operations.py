@@ -0,0 +1,104 @@
+'''
+This script contains the data cleaning and transformation operations, shared by
+the application and the command line. An operation leaves the DataFrame unchanged
+and returns the Delta of its changes (see Scripts.history), applied with delta.redo(df).
+It imports no GUI module.
+'''
+
+from Scripts.dtypes import NUMERIC_DTYPES
+from Scripts.duplicates import duplicate_positions
+from Scripts.history import ColumnsDelta, RemovedRows, FilledValues
+from Scripts.imputation import (IMPUTATION_METHODS, group_fill_values, knn_fill_values,
+                                iterative_fill_values)
+from Scripts.missing import MissingValueIndex
+
+MISSING_VALUE_METHODS = ['mean', 'median', 'mode', 'remove'] + IMPUTATION_METHODS
+
+def drop_columns(df, columns):
+    """
+    Drop columns.
+    Returns:
+    - ColumnsDelta
+    """
+    return ColumnsDelta.between("Drop columns", df, df.drop(columns, axis=1))
+
+def remove_duplicates(df, columns=None, version=None):
+    """
+    Remove the rows equal to a previous row in the columns (all the columns if None or empty).
+    The duplicates are found with the cached row hashes of the version of the data, if given.
+    Returns:
+    - RemovedRows
+    """
+    positions = duplicate_positions(df, columns or None, version)
+    return RemovedRows("Remove duplicates", df, positions)
+
+def handle_missing_values(df, method, columns=None, index=None, key=None, progress=None, cancel=None):
+    """
+    Fill or remove the missing values of columns.
+    Parameters:
+    - df (pandas.DataFrame): The data.
+    - method (str): One of MISSING_VALUE_METHODS. 'remove' drops the rows with a missing value,
+        the others fill the missing values (mean, median and the imputation methods only fill numeric columns).
+    - columns (list): The columns, all the columns if None or empty.
+    - index (MissingValueIndex): The missing-value index of df, built if None.
+    - key (str): The column whose values define the groups of the group methods.
+    - progress (callable): Optional callback called as progress(done, total).
+    - cancel (threading.Event): Optional event, the imputation methods stop once it is set.
+    Returns:
+    - Delta, True if there was nothing to fill, None if the operation was cancelled.
+    """
+    if method not in MISSING_VALUE_METHODS:
+        raise ValueError(f"Unknown missing values method: {method}")
+    columns = list(columns or df.columns)
+    if index is None:
+        index = MissingValueIndex(df)
+    name = f"Fill missing ({method})"
+    if method == 'remove':
+        return RemovedRows("Drop N/A", df, index.rows_with_missing(columns))
+    if method in IMPUTATION_METHODS:
+        fills = impute(df, method, columns, index, key, progress, cancel)
+        if fills is None or fills is True:
+            return fills
+        positions, values = fills
+        return FilledValues(name, positions, values)
+
+    if method == 'mode':
+        filled_columns = columns
+    else:
+        filled_columns = df[columns].select_dtypes(include=NUMERIC_DTYPES).columns
+    # Only the columns with missing values need a fill value
+    filled_columns = [column for column in filled_columns if index.null_count(column)]
+    values = {column: index.fill_value(column, method) for column in filled_columns}
+    if progress:
+        progress(1, 2)
+    positions = {column: index.positions(column) for column in filled_columns}
+    return FilledValues(name, positions, values)
+
+def impute(df, method, columns, index, key=None, progress=None, cancel=None):
+    """
+    Compute the fills of the numeric columns with one of IMPUTATION_METHODS.
+    Returns the positions and fill values by column, True if there is nothing to fill,
+    None if the imputation was cancelled.
+    """
+    numeric_columns = list(df[columns].select_dtypes(include=NUMERIC_DTYPES).columns)
+    if not any(index.null_count(column) for column in numeric_columns):
+        return True
+    if method in ['group mean', 'group median']:
+        if key is None:
+            raise ValueError("The group imputation needs a column to group by")
+        filled_columns = [column for column in numeric_columns if index.null_count(column)]
+        return group_fill_values(df, filled_columns, key, method.split()[1], progress, cancel)
+    if method == 'knn':
+        # Every selected numeric column is a feature of the neighbor search
+        return knn_fill_values(df, numeric_columns, progress=progress, cancel=cancel)
+    return iterative_fill_values(df, numeric_columns, progress=progress, cancel=cancel)
+
+def transform(df, pipeline):
+    """
+    Fit a TransformationPipeline on the data and transform it.
+    Returns:
+    - ColumnsDelta
+    """
+    # A shallow copy: only the transformed columns are copied
+    new_df = pipeline.fit_transform(df.copy(deep=False))
+    return ColumnsDelta.between("Transform", df, new_df, pipeline.modified_columns())
@@ -0,0 +1,172 @@
+'''
+This script contains the instrumentation of the operations of the application.
+Every measured operation is recorded with its wall time, the CPU time of the
+thread running it, the rows and columns it processed and the change of the
+resident memory of the process. The records are kept in memory (the most
+recent ones only) and can be exported as a JSON Lines log. When profiling is
+turned on, every measured operation also writes a cProfile dump, which can be
+read with pstats or snakeviz. The resident memory is read with psutil if it is
+installed, from /proc on Linux otherwise; without either it isn't recorded.
+'''
+
+import cProfile
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from json import dumps
+from mmap import PAGESIZE
+from os import path, makedirs
+from threading import Lock, current_thread
+from time import perf_counter, thread_time
+
+try:
+    from psutil import Process
+except ImportError:
+    Process = None
+
+MAX_RECORDS = 500
+PROFILE_DIR = path.join(path.expanduser('~'), '.mlstarterkit', 'profiles')
+
+def resident_memory():
+    """
+    Return the resident memory of the process in bytes, None if it can't be read.
+    """
+    if Process is not None:
+        return Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * PAGESIZE
+    except (OSError, ValueError):
+        return None
+
+class Profiler:
+    '''
+    Records the measures of the operations, from any thread.
+    '''
+    def __init__(self, max_records=MAX_RECORDS, profile_dir=PROFILE_DIR):
+        self.records = deque(maxlen=max_records)
+        self.lock = Lock()
+        self.profiling = False
+        self.profile_dir = profile_dir
+
+    def add(self, name, wall_seconds, cpu_seconds=None, data=None, **details):
+        """
+        Record a measure.
+        Parameters:
+        - name (str): The name of the operation.
+        - wall_seconds (float): The elapsed time.
+        - cpu_seconds (float): The CPU time.
+        - data (pandas.DataFrame): The data processed, its rows and columns are recorded.
+        - details: Other fields of the record.
+        Returns:
+        - dict: The record.
+        """
+        record = {'name': name,
+                  'time': datetime.now().isoformat(timespec='milliseconds'),
+                  'thread': current_thread().name,
+                  'wall_seconds': wall_seconds,
+                  'cpu_seconds': cpu_seconds}
+        if data is not None:
+            record['rows'], record['columns'] = data.shape
+        record.update(details)
+        with self.lock:
+            self.records.append(record)
+        return record
+
+    @contextmanager
+    def measure(self, name, data=None, **details):
+        """
+        Measure the block of a with statement and record it, even if it raises.
+        The yielded dict is added to the record, e.g. for the shape of the result.
+        Parameters:
+        - name (str): The name of the operation.
+        - data (pandas.DataFrame): The data processed, its rows and columns are recorded.
+        - details: Other fields of the record.
+        """
+        extra = {}
+        profile = self.start_profile()
+        memory = resident_memory()
+        wall, cpu = perf_counter(), thread_time()
+        try:
+            yield extra
+        except BaseException as e:
+            extra['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            wall, cpu = perf_counter() - wall, thread_time() - cpu
+            if memory is not None:
+                extra['memory_delta'] = resident_memory() - memory
+            if profile is not None:
+                extra['profile'] = self.save_profile(profile, name)
+            self.add(name, wall, cpu, data, **details, **extra)
+
+    def start_profile(self):
+        """
+        Return an enabled cProfile.Profile if profiling is on, None otherwise.
+        Only one profiler can run at a time, the operations overlapping a profiled one aren't profiled.
+        """
+        if not self.profiling:
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return None
+        return profile
+
+    def save_profile(self, profile, name):
+        """
+        Stop a profile and write it to the profile folder.
+        Returns:
+        - str: The path of the dump.
+        """
+        profile.disable()
+        makedirs(self.profile_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S-%f")
+        file_name = "".join(c if c.isalnum() else "_" for c in name)
+        file_path = path.join(self.profile_dir, f"{file_name}_{timestamp}.prof")
+        profile.dump_stats(file_path)
+        return file_path
+
+    def snapshot(self):
+        """
+        Return a copy of the records, oldest first.
+        """
+        with self.lock:
+            return list(self.records)
+
+    def clear(self):
+        with self.lock:
+            self.records.clear()
+
+    def export(self, file_path):
+        """
+        Write the records to a JSON Lines file, one record per line.
+        Returns:
+        - int: The number of records written.
+        """
+        records = self.snapshot()
+        with open(file_path, 'w') as file:
+            for record in records:
+                file.write(dumps(record, default=str) + "\n")
+        return len(records)
+
+default_profiler = Profiler()
+
+def measured(name, data=None, profiler=default_profiler):
+    """
+    Decorator measuring every call of a function.
+    Parameters:
+    - name (str): The name of the records.
+    - data (callable): Optional function called with the arguments of the call, returning
+        the DataFrame processed, e.g. lambda self: self.df for a method of the application.
+    - profiler (Profiler): The profiler recording the calls.
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrap(*args, **kwargs):
+            with profiler.measure(name, data(*args, **kwargs) if data else None):
+                return function(*args, **kwargs)
+        return wrap
+    return decorator
@@ -0,0 +1,101 @@
+'''
+This script contains the engine running rendering tasks in a pool of processes.
+The data is sent once to every worker (not once per task), each task is a
+module-level function called with the data and its own arguments. Progress is
+reported after every finished task and the remaining tasks can be cancelled.
+The wall and CPU time of every task are measured where it runs.
+'''
+
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from multiprocessing import get_start_method
+from os import cpu_count
+from time import perf_counter, thread_time
+
+worker_data = None
+
+def init_worker(data):
+    '''
+    Stores the shared data in the worker process.
+    '''
+    global worker_data
+    worker_data = data
+
+def timed_task(function, data, args):
+    '''
+    Runs one task and returns its wall and CPU seconds.
+    '''
+    wall, cpu = perf_counter(), thread_time()
+    function(data, *args)
+    return perf_counter() - wall, thread_time() - cpu
+
+def run_task(function, args):
+    '''
+    Runs one task in a worker process.
+    '''
+    return timed_task(function, worker_data, args)
+
+@contextmanager
+def hidden_main_module():
+    '''
+    Spawned workers re-import the __main__ module of the parent, unless it has
+    no __file__. The UI's main module opens a window when it's imported, so it
+    is hidden while the workers start.
+    '''
+    main_module = sys.modules.get('__main__')
+    main_file = getattr(main_module, '__file__', None)
+    if main_file is None or get_start_method() == 'fork':
+        yield
+        return
+    del main_module.__file__
+    try:
+        yield
+    finally:
+        main_module.__file__ = main_file
+
+def render(data, tasks, processes=None, progress=None, cancel=None, timings=None):
+    '''
+    Runs the rendering tasks, in parallel when there are several of them.
+    Args:
+        data: The data passed as first argument to every task.
+        tasks (list): The tasks, as (function, args) tuples.
+        processes (int): The number of worker processes, the number of CPUs if None.
+        progress (callable): Optional callback called as progress(done, total) after every task.
+        cancel (threading.Event): Optional event, the remaining tasks are dropped once it is set.
+        timings (list): Optional list, filled with the (wall, CPU) seconds of every task
+            in task order, None for the tasks that didn't run.
+    Returns:
+        completed (bool): False if the rendering was cancelled, True otherwise.
+    '''
+    total = len(tasks)
+    if timings is None:
+        timings = []
+    timings[:] = [None] * total
+    processes = min(processes or cpu_count() or 1, total)
+    if processes <= 1:
+        for done, (function, args) in enumerate(tasks, start=1):
+            if cancel is not None and cancel.is_set():
+                return False
+            timings[done - 1] = timed_task(function, data, args)
+            if progress:
+                progress(done, total)
+        return True
+
+    pool = ProcessPoolExecutor(max_workers=processes,
+                               initializer=init_worker,
+                               initargs=(data,))
+    try:
+        with hidden_main_module():
+            futures = {pool.submit(run_task, function, args): index
+                       for index, (function, args) in enumerate(tasks)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            # Raises the exception of the task, if any
+            timings[futures[future]] = future.result()
+            if progress:
+                progress(done, total)
+            if cancel is not None and cancel.is_set():
+                return False
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    return True
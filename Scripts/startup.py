@@ -0,0 +1,77 @@
+'''
+This script contains the startup helpers of the application.
+The data modules (pandas, pyarrow and the scripts using them) and the scientific
+modules used only by some operations (sklearn, matplotlib, joblib) aren't imported
+when the application starts. They are imported in a background thread once the
+window is shown, the ones needed to load a file first, so the first load or
+operation doesn't wait for them.
+The time of every import is measured, in the application and with python -X importtime.
+'''
+
+import sys
+from importlib import import_module
+from subprocess import run
+from time import perf_counter
+
+WARM_UP_MODULES = ['pandas', 'pyarrow', 'Scripts.ingest', 'Scripts.cache', 'Scripts.history',
+                   'Scripts.datagrid', 'Scripts.statistics', 'Scripts.missing', 'Scripts.duplicates',
+                   'Scripts.operations', 'Scripts.transformation', 'Scripts.export',
+                   'joblib', 'sklearn.neighbors', 'sklearn.linear_model', 'Scripts.visualization']
+
+# Seconds taken by the modules imported with timed_import, by module
+import_times = {}
+
+def timed_import(name):
+    """
+    Import a module and record the time it took, 0 if it was already imported.
+    """
+    start = perf_counter()
+    module = import_module(name)
+    import_times.setdefault(name, perf_counter() - start)
+    return module
+
+def warm_up(modules=WARM_UP_MODULES, cancel=None):
+    """
+    Import modules ahead of their first use.
+    Parameters:
+    - modules (list): The names of the modules.
+    - cancel (threading.Event): Optional event, the remaining modules are skipped once it is set.
+    Returns:
+    - dict: The seconds taken by every imported module.
+    """
+    times = {}
+    for name in modules:
+        if cancel is not None and cancel.is_set():
+            break
+        timed_import(name)
+        times[name] = import_times[name]
+    return times
+
+def import_breakdown(module='main', depth=1, env=None):
+    """
+    Measure the imports of a module in a new interpreter with python -X importtime.
+    Parameters:
+    - module (str): The module imported.
+    - depth (int): The depth of the nested imports reported, 1 for the direct imports of the module.
+    - env (dict): The environment of the interpreter.
+    Returns:
+    - (float, list, set): The total seconds, the (module, cumulative seconds) of the reported imports
+        in the order they completed, and the names of all the imported modules.
+    """
+    result = run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                 capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    total, imports, names = 0.0, [], set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # The names are indented by one space, and two more per nesting level
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        names.add(name.strip())
+        if name.strip() == module:
+            total = int(cumulative) / 1e6
+        elif level == depth:
+            imports.append((name.strip(), int(cumulative) / 1e6))
+    return total, imports, names
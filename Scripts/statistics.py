@@ -0,0 +1,77 @@
+'''
+This script contains the function to compute the summary statistics of the
+numeric columns of the data. All the columns are processed together as one
+2-D array: the moments (mean, std, skew) come from a single pass over the
+values, and the order statistics (min, quartiles, max, distinct count) from
+a single column-wise sort.
+'''
+
+from numpy import (isnan, where, sqrt, sort, floor, ceil, arange,
+                   nan, errstate, column_stack, count_nonzero)
+from pandas import DataFrame
+from Scripts.dtypes import NUMERIC_DTYPES
+
+STATISTICS = ['Count', 'Mean', 'Std', 'Min', '25%', '50%', '75%', 'Max',
+              'Skew', 'Null %', 'Distinct']
+
+def describe(data, columns=None):
+    """
+    Compute the summary statistics of the numeric columns of the given data.
+
+    Parameters:
+    - data (pandas.DataFrame): The data to be described.
+    - columns (list): The columns to be described. If None, all numeric columns are described.
+
+    Returns:
+    pandas.DataFrame
+        One row per numeric column, with the STATISTICS as columns.
+    """
+    if columns is None:
+        columns = data.columns
+    columns = data[list(columns)].select_dtypes(include=NUMERIC_DTYPES).columns
+    if len(columns) == 0 or len(data) == 0:
+        return DataFrame(nan, index=columns, columns=STATISTICS)
+
+    values = data[columns].to_numpy(dtype='float64')
+    n_rows = values.shape[0]
+    missing = isnan(values)
+    count = n_rows - missing.sum(axis=0)
+
+    with errstate(invalid='ignore', divide='ignore'):
+        # Moments
+        mean = where(missing, 0, values).sum(axis=0) / count
+        centered = where(missing, 0, values - mean)
+        squares = centered * centered
+        m2 = squares.sum(axis=0)
+        m3 = (squares * centered).sum(axis=0)
+        std = where(count > 1, sqrt(m2 / (count - 1)), nan)
+        # Adjusted Fisher-Pearson coefficient, as pandas.Series.skew
+        skew = (sqrt(count * (count - 1)) / (count - 2)) * (m3 / count) / (m2 / count) ** 1.5
+        skew = where(m2 == 0, 0, skew)
+        skew = where(count < 3, nan, skew)
+
+        # Order statistics, NaNs are sorted last
+        ordered = sort(values, axis=0)
+        positions = arange(len(columns))
+        last = where(count > 0, count - 1, 0)
+        minimum = where(count > 0, ordered[0], nan)
+        maximum = where(count > 0, ordered[last, positions], nan)
+        quantiles = []
+        for q in [0.25, 0.5, 0.75]:
+            # Linear interpolation, as pandas.Series.quantile
+            rank = q * last
+            low, high = floor(rank).astype(int), ceil(rank).astype(int)
+            low_values = ordered[low, positions]
+            quantile = low_values + (rank - low) * (ordered[high, positions] - low_values)
+            quantiles.append(where(count > 0, quantile, nan))
+
+        changes = ordered[1:] != ordered[:-1]
+        # Only the transitions between two non-null values are counted
+        valid = arange(n_rows - 1)[:, None] < (count - 1)
+        distinct = where(count > 0, count_nonzero(changes & valid, axis=0) + 1, 0) \
+            if n_rows > 1 else where(count > 0, 1, 0)
+        null_percentage = 100 * (n_rows - count) / n_rows
+
+    statistics = column_stack([count, mean, std, minimum, *quantiles, maximum,
+                               skew, null_percentage, distinct])
+    return DataFrame(statistics, index=columns, columns=STATISTICS)
@@ -0,0 +1,91 @@
+'''
+This script contains the statistics of the columns of a table, accumulated
+chunk by chunk so that tables larger than the memory can be fitted in one
+pass. The moments of every chunk are computed on its 2-D array of numeric
+values and merged into the running ones (Chan/Pébay update formulas), the
+value counts of the categorical columns are summed.
+'''
+
+from numpy import (isnan, where, sqrt, zeros, full, inf, nan, errstate,
+                   fmin, fmax, float64)
+
+class RunningStatistics:
+    """
+    The statistics of numeric and categorical columns, updated with chunks of rows.
+    - numeric columns: count, mean, population std, skew (as pandas.Series.skew), min, max.
+    - categorical columns: the count of every value.
+    """
+    def __init__(self, numeric_columns=(), categorical_columns=()):
+        self.numeric_columns = list(numeric_columns)
+        self.categorical_columns = list(categorical_columns)
+        size = len(self.numeric_columns)
+        self.count = zeros(size)
+        self.mean = zeros(size)
+        self.m2 = zeros(size)
+        self.m3 = zeros(size)
+        self.minimum = full(size, inf)
+        self.maximum = full(size, -inf)
+        self.value_counts = {column: None for column in self.categorical_columns}
+
+    def update(self, chunk):
+        """
+        Add a chunk of rows (pandas DataFrame) to the statistics and return them.
+        """
+        if self.numeric_columns:
+            self.update_moments(chunk[self.numeric_columns].to_numpy(dtype=float64, na_value=nan))
+        for column in self.categorical_columns:
+            counts = chunk[column].value_counts()
+            previous = self.value_counts[column]
+            self.value_counts[column] = counts if previous is None else previous.add(counts, fill_value=0)
+        return self
+
+    def update_moments(self, values):
+        """
+        Merge the moments of a 2-D array of values into the running ones.
+        """
+        missing = isnan(values)
+        with errstate(invalid='ignore', divide='ignore'):
+            count = (~missing).sum(axis=0).astype(float64)
+            mean = where(count > 0, where(missing, 0, values).sum(axis=0) / count, 0)
+            centered = where(missing, 0, values - mean)
+            squares = centered * centered
+            m2 = squares.sum(axis=0)
+            m3 = (squares * centered).sum(axis=0)
+
+            total = self.count + count
+            delta = mean - self.mean
+            ratio = where(total > 0, count / total, 0)
+            self.m3 = (self.m3 + m3
+                       + where(total > 0, delta ** 3 * self.count * count * (self.count - count) / total ** 2, 0)
+                       + where(total > 0, 3 * delta * (self.count * m2 - count * self.m2) / total, 0))
+            self.m2 = self.m2 + m2 + where(total > 0, delta ** 2 * self.count * ratio, 0)
+            self.mean = self.mean + delta * ratio
+            self.count = total
+        self.minimum = fmin(self.minimum, where(missing, inf, values).min(axis=0, initial=inf))
+        self.maximum = fmax(self.maximum, where(missing, -inf, values).max(axis=0, initial=-inf))
+
+    def numeric(self, statistic):
+        """
+        Return a statistic of the numeric columns as a dict by column.
+        The statistic is one of 'count', 'mean', 'std', 'skew', 'min' and 'max',
+        it is NaN for the columns without values.
+        """
+        count = self.count
+        with errstate(invalid='ignore', divide='ignore'):
+            if statistic == 'count':
+                values = count
+            elif statistic == 'mean':
+                values = where(count > 0, self.mean, nan)
+            elif statistic == 'std':
+                # Population standard deviation, as the scalers
+                values = where(count > 0, sqrt(self.m2 / count), nan)
+            elif statistic == 'skew':
+                # Adjusted Fisher-Pearson coefficient, as pandas.Series.skew
+                values = (sqrt(count * (count - 1)) / (count - 2)) * (self.m3 / count) / (self.m2 / count) ** 1.5
+                values = where(self.m2 == 0, 0, values)
+                values = where(count < 3, nan, values)
+            elif statistic == 'min':
+                values = where(count > 0, self.minimum, nan)
+            else:
+                values = where(count > 0, self.maximum, nan)
+        return dict(zip(self.numeric_columns, values.tolist()))
@@ -2,13 +2,435 @@
 This script contains the function to perform transformations on the data.
 The function takes in the data, the types of transformations to be performed,
 and the columns on which the transformations are to be performed.
+The transformations are fitted by a TransformationPipeline, which keeps the fitted
+parameters (scalings, categories, offsets) to apply the same transformations to new
+data, can be saved to disk and applied to every file of a directory.
+Files larger than the memory are transformed out of core: the fit statistics are
+accumulated chunk by chunk, then every chunk is transformed and written to the output.
+The numeric columns are scaled together as 2-D NumPy blocks, one per dtype, so
+float32 columns stay float32 and the DataFrame is written once per block.
 '''
 
-from sklearn.preprocessing import StandardScaler, MinMaxScaler, LabelEncoder
-from numpy import log1p, power
-from pandas import get_dummies, concat
+from os import path, listdir, makedirs, remove
+from numpy import log1p, power, array, isfinite, float32, float64
+from pandas import Categorical, get_dummies, concat
+from Scripts.dtypes import NUMERIC_DTYPES, NARROW_INTEGER_DTYPES, is_categorical
+from Scripts.ingest import read_chunks, CHUNK_SIZE
+from Scripts.streaming import RunningStatistics
 
-def perform_transformations(data, transformation_types, columns_subset):
+SCALINGS = ['Standardization', 'Normalization']
+ENCODINGS = ['One-Hot Encoding', 'Label Encoding', 'Log Transformation', 'Polynomial Transformation']
+SUPPORTED_EXTENSIONS = ('.csv', '.txt', '.xlsx', '.xls')
+
+# Columns read and written by the transformations, to group their fits in passes over a file
+READS = {'Standardization': {'numeric'}, 'Normalization': {'numeric'},
+         'One-Hot Encoding': {'categorical'}, 'Label Encoding': {'categorical'},
+         'Log Transformation': {'numeric'}, 'Polynomial Transformation': {'numeric'}}
+WRITES = {'Standardization': {'numeric'}, 'Normalization': {'numeric'},
+          'One-Hot Encoding': set(), 'Label Encoding': {'categorical', 'numeric'},
+          'Log Transformation': {'numeric'}, 'Polynomial Transformation': {'numeric'}}
+
+# One-hot encoded categories per column, the rarer ones are grouped in the "other" column
+MAX_CATEGORIES = 50
+OTHER_CATEGORY = 'other'
+# Bytes per cell of a dense bool column, per True value of a sparse one (value and int32 index)
+DENSE_CELL_BYTES = 1
+SPARSE_VALUE_BYTES = 5
+
+def one_hot_estimate(data, columns_subset=(), max_categories=MAX_CATEGORIES):
+    """
+    Estimate the columns and memory added by the one-hot encoding, before running it.
+    Parameters:
+    - data (pandas.DataFrame): The data to be encoded.
+    - columns_subset (list): The columns to be encoded, all the columns if empty.
+    - max_categories (int): The maximum number of categories per column, None for no limit.
+    Returns:
+    - (int, int, int): The number of added columns, and their size in bytes as dense and sparse columns.
+    """
+    columns = list(columns_subset) or list(data.columns)
+    dtypes = data.dtypes
+    added_columns = dense_bytes = sparse_bytes = 0
+    for col in columns:
+        if not is_categorical(dtypes[col]):
+            continue
+        distinct = data[col].nunique()
+        if max_categories and distinct > max_categories:
+            distinct = max_categories + 1
+        added_columns += distinct
+        dense_bytes += distinct * len(data) * DENSE_CELL_BYTES
+        # One True value per row with a value
+        sparse_bytes += data[col].count() * SPARSE_VALUE_BYTES
+    return added_columns, dense_bytes, sparse_bytes
+
+def other_category(categories):
+    """
+    Return the name of the category grouping the rare categories, OTHER_CATEGORY
+    prefixed with underscores until it differs from every kept category.
+    """
+    other = OTHER_CATEGORY
+    while other in categories:
+        other = '_' + other
+    return other
+
+def scaling_parameters(statistics, transformation):
+    """
+    Return the offset and scale of every numeric column of the statistics, as arrays.
+    - Standardization: the mean and the standard deviation (like StandardScaler).
+    - Normalization: the minimum and the range (like MinMaxScaler).
+    Constant and empty columns get a scale of 1.
+    """
+    if transformation == 'Standardization':
+        offset, scale = statistics.numeric('mean'), statistics.numeric('std')
+    else:
+        offset, maximum = statistics.numeric('min'), statistics.numeric('max')
+        scale = {col: maximum[col] - offset[col] for col in offset}
+    offset = array(list(offset.values()), dtype=float64)
+    scale = array(list(scale.values()), dtype=float64)
+    offset[~isfinite(offset)] = 0
+    scale[~isfinite(scale) | (scale == 0)] = 1
+    return offset, scale
+
+def scale_columns(data, columns, offset, scale):
+    """
+    Scale columns of a DataFrame as (x - offset) / scale, in one 2-D block per dtype:
+    float32 columns are scaled in float32, the other numeric columns in float64.
+    Float columns are written back in place, the others are replaced by float64 columns.
+    """
+    dtypes = data.dtypes
+    position = {col: i for i, col in enumerate(columns)}
+    float32_columns = [col for col in columns if dtypes[col] == float32]
+    float64_columns = [col for col in columns if dtypes[col] != float32]
+    for block_columns, dtype in [(float32_columns, float32), (float64_columns, float64)]:
+        if not block_columns:
+            continue
+        indices = [position[col] for col in block_columns]
+        block = data[block_columns].to_numpy(dtype=dtype, copy=True)
+        block -= offset[indices].astype(dtype)
+        block /= scale[indices].astype(dtype)
+        same_dtype = [dtypes[col] == dtype for col in block_columns]
+        if all(same_dtype):
+            data.iloc[:, data.columns.get_indexer(block_columns)] = block
+        else:
+            data[block_columns] = block
+    return data
+
+class TransformationPipeline:
+    """
+    The selected transformations, fitted once on a DataFrame and applied to new data.
+    The fitted parameters of every transformation are kept in steps, as
+    (transformation type, parameters) tuples in the order they are applied.
+    """
+    def __init__(self, transformation_types, columns_subset=(), max_categories=MAX_CATEGORIES, sparse=False):
+        """
+        Parameters:
+        - transformation_types (list): The transformation types, see perform_transformations.
+        - columns_subset (list): The columns to be transformed, all the columns if empty.
+        - max_categories (int): The most frequent categories one-hot encoded per column, the others
+            are grouped in an "other" column. None to encode every category.
+        - sparse (bool): Whether the one-hot encoded columns are sparse.
+        """
+        self.transformation_types = list(transformation_types)
+        self.columns_subset = list(columns_subset)
+        self.max_categories = max_categories
+        self.sparse = sparse
+        self.columns = None
+        self.steps = None
+
+    @property
+    def fitted(self):
+        return self.steps is not None
+
+    def ordered_types(self):
+        """
+        Return the transformation types in the order they are applied:
+        standardization (or else normalization) first, then the others in the given order.
+        """
+        scalings = [t for t in SCALINGS if t in self.transformation_types][:1]
+        return scalings + [t for t in self.transformation_types if t in ENCODINGS]
+
+    def step_statistics(self, transformation, data):
+        """
+        Return the empty statistics needed to fit one transformation, for the columns
+        it applies to in the data (or a chunk of it) as transformed by the previous steps.
+        """
+        dtypes = data.dtypes
+        if transformation in ['One-Hot Encoding', 'Label Encoding']:
+            return RunningStatistics(categorical_columns=[col for col in self.columns
+                                                          if is_categorical(dtypes[col])])
+        return RunningStatistics(numeric_columns=[col for col in self.columns
+                                                  if dtypes[col] in NUMERIC_DTYPES])
+
+    def step_parameters(self, transformation, statistics):
+        """
+        Fit one transformation from the statistics of the columns it applies to.
+        """
+        if transformation in SCALINGS:
+            return (statistics.numeric_columns, *scaling_parameters(statistics, transformation))
+        if transformation == 'One-Hot Encoding':
+            parameters = {}
+            for col, counts in statistics.value_counts.items():
+                counts = counts.sort_values(ascending=False, kind='stable')
+                other = None
+                if self.max_categories and len(counts) > self.max_categories:
+                    counts = counts.iloc[:self.max_categories]
+                    other = other_category(set(counts.index))
+                # Sorted categories, like get_dummies
+                parameters[col] = (sorted(counts.index), other)
+            return parameters
+        if transformation == 'Label Encoding':
+            # Sorted categories, like LabelEncoder
+            return {col: sorted(counts.index) for col, counts in statistics.value_counts.items()}
+        skew = statistics.numeric('skew')
+        if transformation == 'Log Transformation':
+            # Works only on right-skewed/positive skew data, the minimum handles negative values
+            minimum = statistics.numeric('min')
+            return {col: minimum[col] for col in statistics.numeric_columns if skew[col] > 0.3}
+        # Works only on left-skewed/negative skew data
+        return [col for col in statistics.numeric_columns if skew[col] < -0.3]
+
+    def fit_passes(self):
+        """
+        Group the transformations fitted in the same pass over the chunks of a file.
+        A transformation starts a new pass when it reads columns written by a previous
+        transformation of the current pass, its statistics depend on their result.
+        """
+        passes = []
+        written = set()
+        for transformation in self.ordered_types():
+            if not passes or READS[transformation] & written:
+                passes.append([])
+                written = set()
+            passes[-1].append(transformation)
+            written |= WRITES[transformation]
+        return passes
+
+    def apply_step(self, transformation, parameters, data):
+        """
+        Apply one fitted transformation to the data.
+        """
+        if transformation in SCALINGS:
+            data = scale_columns(data, *parameters)
+        elif transformation == 'One-Hot Encoding':
+            # The fitted categories give the same dummy columns on any data
+            one_hot_encoded = []
+            for col, (categories, other) in parameters.items():
+                values = data[col]
+                if other is not None:
+                    values = values.where(values.isin(categories) | values.isna(), other)
+                    categories = categories + [other]
+                one_hot_encoded.append(get_dummies(Categorical(values, categories=categories),
+                                                   prefix=col, sparse=self.sparse).set_axis(data.index))
+            data = concat([data] + one_hot_encoded, axis=1)
+        elif transformation == 'Label Encoding':
+            # Unseen and missing labels are encoded as -1
+            for col, categories in parameters.items():
+                data[col] = Categorical(data[col], categories=categories).codes.astype('int64')
+        elif transformation == 'Log Transformation':
+            for col, minimum in parameters.items():
+                # In float to avoid overflowing downcast integers, values below the fitted minimum are clipped
+                data[col] = log1p((data[col].astype('float64') - minimum).clip(lower=0))
+        else:
+            for col in parameters:
+                values = data[col]
+                if values.dtype in NARROW_INTEGER_DTYPES:
+                    values = values.astype('int64')
+                data[col] = power(values, 2)
+        return data
+
+    def modified_columns(self):
+        """
+        Return the existing columns whose values are replaced by the fitted transformations.
+        The one-hot encoded columns are added, not replaced.
+        """
+        modified = set()
+        for transformation, parameters in self.steps:
+            if transformation in SCALINGS:
+                modified.update(parameters[0])
+            elif transformation != 'One-Hot Encoding':
+                modified.update(parameters)
+        return [col for col in self.columns if col in modified]
+
+    def fit_transform(self, data):
+        """
+        Fit the transformations on the data and return the transformed data.
+        The given DataFrame may be modified in place.
+        """
+        self.columns = list(self.columns_subset) or list(data.columns)
+        self.steps = []
+        for transformation in self.ordered_types():
+            statistics = self.step_statistics(transformation, data).update(data)
+            parameters = self.step_parameters(transformation, statistics)
+            data = self.apply_step(transformation, parameters, data)
+            self.steps.append((transformation, parameters))
+        return data
+
+    def fit_chunks(self, chunks, cancel=None):
+        """
+        Fit the transformations on a table read in chunks, without holding it in memory.
+        Every pass (see fit_passes) iterates over the chunks once, transforming them with
+        the transformations fitted by the previous passes.
+        Parameters:
+        - chunks (callable): Returns a new iterator over the chunks of the table, for every pass.
+        - cancel (threading.Event): Optional event, the fit stops once it is set.
+        Returns:
+        - TransformationPipeline: The pipeline, None if the fit was cancelled.
+        """
+        self.columns = None
+        steps = []
+        for transformations in self.fit_passes():
+            statistics = None
+            for chunk in chunks():
+                if self.columns is None:
+                    self.columns = list(self.columns_subset) or list(chunk.columns)
+                for transformation, parameters in steps:
+                    chunk = self.apply_step(transformation, parameters, chunk)
+                if statistics is None:
+                    statistics = [self.step_statistics(t, chunk) for t in transformations]
+                for step_statistics in statistics:
+                    step_statistics.update(chunk)
+            if cancel is not None and cancel.is_set():
+                return None
+            if statistics is None:
+                raise ValueError("The table has no rows")
+            for transformation, step_statistics in zip(transformations, statistics):
+                steps.append((transformation, self.step_parameters(transformation, step_statistics)))
+        if self.columns is None:
+            # No transformation to fit, the columns are read from the first chunk
+            self.columns = list(self.columns_subset) or list(next(iter(chunks())).columns)
+        self.steps = steps
+        return self
+
+    def fit(self, data):
+        """
+        Fit the transformations on a copy of the data and return the pipeline.
+        """
+        self.fit_transform(data.copy())
+        return self
+
+    def transform(self, data):
+        """
+        Apply the fitted transformations to new data and return the transformed data.
+        The given DataFrame may be modified in place.
+        Raises ValueError if the pipeline isn't fitted or a transformed column is missing.
+        """
+        if not self.fitted:
+            raise ValueError("The pipeline must be fitted before transforming data")
+        missing = [col for col in self.columns if col not in data.columns]
+        if missing:
+            raise ValueError(f"Missing columns: {missing}")
+        for transformation, parameters in self.steps:
+            data = self.apply_step(transformation, parameters, data)
+        return data
+
+    def save(self, file_path):
+        """
+        Save the pipeline to a file.
+        """
+        from joblib import dump
+        dump(self, file_path)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Load a pipeline saved with save().
+        """
+        from joblib import load
+        pipeline = load(file_path)
+        if not isinstance(pipeline, cls):
+            raise ValueError(f"{file_path} doesn't contain a transformation pipeline")
+        return pipeline
+
+    def transform_chunks(self, chunks, output_path, cancel=None):
+        """
+        Transform the chunks of a table one by one, appending them to a CSV file.
+        The cancel event is checked before every chunk.
+        Returns the path of the file, None (and no file) if the transform was cancelled.
+        """
+        header = True
+        with open(output_path, 'w', newline='') as file:
+            for chunk in chunks:
+                if cancel is not None and cancel.is_set():
+                    break
+                self.transform(chunk).to_csv(file, index=False, header=header)
+                header = False
+        if cancel is not None and cancel.is_set():
+            remove(output_path)
+            return None
+        return output_path
+
+    def transform_file(self, file_path, output_path, chunksize=CHUNK_SIZE, cancel=None):
+        """
+        Transform a CSV/TXT/Excel file chunk by chunk and save the result as a CSV file.
+        """
+        return self.transform_chunks(read_chunks(file_path, chunksize, cancel=cancel), output_path, cancel)
+
+    def transform_directory(self, input_folder, output_folder, progress=None, cancel=None):
+        """
+        Transform every supported file of a directory, saving the results as CSV files
+        with the same names in the output directory.
+        Parameters:
+        - input_folder (str): The directory of the files to be transformed.
+        - output_folder (str): The directory of the transformed files, created if needed.
+        - progress (callable): Optional callback called as progress(done, total) after every file.
+        - cancel (threading.Event): Optional event, the file being transformed is stopped at its
+            next chunk (and removed) and the remaining files are skipped once it is set.
+        Returns:
+        - list: The paths of the transformed files.
+        """
+        makedirs(output_folder, exist_ok=True)
+        file_names = sorted(name for name in listdir(input_folder)
+                            if name.lower().endswith(SUPPORTED_EXTENSIONS))
+        outputs = []
+        for done, file_name in enumerate(file_names, start=1):
+            if cancel is not None and cancel.is_set():
+                break
+            output_name = path.splitext(file_name)[0] + '.csv'
+            output_path = self.transform_file(path.join(input_folder, file_name),
+                                              path.join(output_folder, output_name), cancel=cancel)
+            if output_path is None:
+                break
+            outputs.append(output_path)
+            if progress:
+                progress(done, len(file_names))
+        return outputs
+
+def transform_out_of_core(file_path, output_path, transformation_types, columns_subset=(),
+                          chunksize=CHUNK_SIZE, max_categories=MAX_CATEGORIES, progress=None, cancel=None):
+    """
+    Transform a file larger than the memory: the transformations are fitted with streaming
+    passes over its chunks, then every chunk is transformed and appended to the output CSV file.
+    At most one chunk of chunksize rows is held in memory at a time.
+
+    Parameters:
+    - file_path (str): The CSV/TXT file to be transformed.
+    - output_path (str): The CSV file written with the transformed data.
+    - transformation_types (list): The transformation types, see perform_transformations.
+    - columns_subset (list): The columns to be transformed, all the columns if empty.
+    - chunksize (int): The number of rows per chunk.
+    - max_categories (int): The maximum number of one-hot encoded categories per column.
+    - progress (callable): Optional callback called as progress(done, total) with the bytes read by all the passes.
+    - cancel (threading.Event): Optional event, the transform stops once it is set.
+
+    Returns:
+    - TransformationPipeline: The fitted pipeline, None if the transform was cancelled.
+    """
+    pipeline = TransformationPipeline(transformation_types, columns_subset, max_categories)
+    passes = len(pipeline.fit_passes()) + 1
+    done_passes = []
+
+    def chunks():
+        def report(bytes_read, total_bytes, rows_read):
+            progress(len(done_passes) * total_bytes + bytes_read, passes * total_bytes)
+        yield from read_chunks(file_path, chunksize, report if progress else None, cancel)
+        done_passes.append(True)
+
+    if pipeline.fit_chunks(chunks, cancel) is None:
+        return None
+    if pipeline.transform_chunks(chunks(), output_path, cancel) is None:
+        return None
+    return pipeline
+
+def perform_transformations(data, transformation_types, columns_subset, max_categories=MAX_CATEGORIES, sparse=False):
     """
     Apply various transformations to the specified columns of the given data.
 
@@ -17,59 +439,20 @@ def perform_transformations(data, transformation_types, columns_subset):
     - transformation_types (list): A list of transformation types to be applied. Available options are:
         - 'Standardization': Perform standardization on numeric columns.
         - 'Normalization': Perform normalization on numeric columns.
-        - 'One-Hot Encoding': Perform one-hot encoding on categorical columns.
+        - 'One-Hot Encoding': Perform one-hot encoding on categorical columns, capped to
+          MAX_CATEGORIES categories per column plus an "other" column.
         - 'Label Encoding': Perform label encoding on categorical columns.
         - 'Log Transformation': Perform log transformation on right-skewed numeric columns.
         - 'Polynomial Transformation': Perform polynomial transformation on left-skewed numeric columns.
 
     - columns_subset (list): A list of column names to be transformed. If empty, all columns will be transformed.
+    - max_categories (int): The maximum number of one-hot encoded categories per column, None for no limit.
+    - sparse (bool): Whether the one-hot encoded columns are sparse.
 
     Returns:
-    None
+    - (True, pandas.DataFrame): The transformed data, False if there is no transformation.
     """
     if transformation_types == []:
         return False
-    if columns_subset == []:
-        columns_subset = data.columns
-    
-    # Makes sure to perform standardization/normalization first.
-    if 'Standardization' in transformation_types:
-        for col in columns_subset:
-            if data[col].dtype not in ['int64', 'float64']:
-                continue
-            scaler = StandardScaler()
-            data[col] = scaler.fit_transform(data[col].values.reshape(-1, 1))
-    elif 'Normalization' in transformation_types:
-        for col in columns_subset:
-            if data[col].dtype not in ['int64', 'float64']:
-                continue
-            scaler = MinMaxScaler()
-            data[col] = scaler.fit_transform(data[col].values.reshape(-1, 1))
-
-    for label in transformation_types:
-        if label == 'One-Hot Encoding':
-            for col in columns_subset:
-                if data[col].dtype == 'object':
-                    one_hot_encoded = get_dummies(data[col], prefix=col)
-                    data = concat([data, one_hot_encoded], axis=1)
-        elif label == 'Label Encoding':
-            for col in columns_subset:
-                encoder = LabelEncoder()
-                if data[col].dtype == 'object':
-                    data[col] = encoder.fit_transform(data[col])
-        elif label == 'Log Transformation':
-            # Works only on right-skewed/positive skew data
-            for col in columns_subset:
-                if data[col].dtype not in ['int64', 'float64']:
-                    continue
-                if data[col].skew() > 0.3:
-                    # Handling negative values
-                    data[col] = log1p(data[col] - data[col].min())
-        elif label == 'Polynomial Transformation':
-            # Works only on left-skewed/negative skew data
-            for col in columns_subset:
-                if data[col].dtype not in ['int64', 'float64']:
-                    continue
-                if data[col].skew() < -0.3:
-                    data[col] = power(data[col], 2)
-    return (True, data)
+    pipeline = TransformationPipeline(transformation_types, columns_subset, max_categories, sparse)
+    return (True, pipeline.fit_transform(data))
@@ -0,0 +1,57 @@
+'''
+This script contains the in-memory cache of values computed on a version of the
+DataFrame (e.g. the correlation matrices and the duplicate masks), shared by the
+job threads. Only the values of the newest version are kept.
+'''
+
+from threading import Lock
+
+class VersionedCache:
+    '''
+    Caches values by (version, key), from any thread.
+    The cached values are shared by every caller getting them: callers must not modify them.
+    '''
+    def __init__(self):
+        self.entries = {}
+        self.lock = Lock()
+
+    def get(self, version, key):
+        """
+        Return the value cached for the key on the given version, None if it isn't cached.
+        """
+        with self.lock:
+            return self.entries.get((version, key))
+
+    def put(self, version, key, value):
+        """
+        Cache a value computed on the given version.
+        The values of previous versions are stale and evicted. A value computed on a
+        previous version (e.g. by a job finishing late) isn't kept and evicts nothing.
+        Parameters:
+        - version (int): The version of the data the value was computed on.
+        - key: The hashable key of the value within the version.
+        - value: The value to be cached.
+        Returns:
+        - The value.
+        """
+        with self.lock:
+            if any(cached_version > version for cached_version, _ in self.entries):
+                return value
+            for old_key in [k for k in self.entries if k[0] < version]:
+                del self.entries[old_key]
+            self.entries[(version, key)] = value
+        return value
+
+    def keys(self):
+        """
+        Return the (version, key) pairs of the cached values.
+        """
+        with self.lock:
+            return list(self.entries)
+
+    def clear(self):
+        """
+        Remove every cached value.
+        """
+        with self.lock:
+            self.entries.clear()
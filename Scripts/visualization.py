@@ -3,19 +3,547 @@ This script contains the function to generate visualizations for the data.
 The function takes in the data, visualization types,
 and column subset as input and generates visualizations based on the input parameters.
 The visualizations are saved in a folder with a timestamp in the selected directory.
+By default, each process builds one figure per plot type and only updates the
+data of its artists (offsets, line data, bar positions and heights) for every plot.
+Every figure is a separate rendering task, the tasks are rendered in parallel
+by a pool of processes using the non-interactive Agg backend.
+Above a row threshold, scatter plots are drawn as a 2-D density image and line
+plots are decimated, so their rendering time doesn't grow with the number of rows.
 The function returns True if the visualizations are generated successfully,
-and False if the user cancels the operation.
+and False if the operation is cancelled.
 '''
 
 from os import path, makedirs
 from datetime import datetime
-from tkinter import filedialog
+from time import perf_counter, thread_time
 from itertools import combinations
 
+import matplotlib
+# Figures are only saved to files, the non-interactive backend can run off the main thread
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.colors import LogNorm
+from numpy import column_stack, isfinite, histogram, zeros, nan, ndenumerate
+from numpy.ma import masked_equal
+from Scripts.decimation import lttb, density, finite_pairs, DENSITY_BINS
+from Scripts.dtypes import NUMERIC_DTYPES, is_categorical
+from Scripts.rendering import render
+from Scripts.correlation import correlation_matrix
 
-# TODO: Reduce delay, can't thread this due to Tkinter GUI mainthread issue
-def generate_visualizations(data, visualization_types, column_subset):
+# Largest correlation heatmap with the value written in every cell
+MAX_ANNOTATED_COLUMNS = 30
+
+def render_scatter_plot(data, column1, column2, folder_path):
+    """
+    Saves the scatter plot of two columns.
+    """
+    plt.scatter(data[column1], data[column2], color='xkcd:turquoise')
+    plt.title(f'Scatter Plot - {column1} vs {column2}')
+    plt.xlabel(column1)
+    plt.ylabel(column2)
+    plt.savefig(path.join(folder_path, f'scatter_plot_{column1}_{column2}.png'), bbox_inches='tight')
+    plt.close()
+
+def render_line_plot(data, column1, column2, folder_path):
+    """
+    Saves the line plot of two columns.
+    """
+    plt.plot(data[column1], data[column2], color='xkcd:turquoise')
+    plt.title(f'Line Plot - {column1} vs {column2}')
+    plt.xlabel(column1)
+    plt.ylabel(column2)
+    plt.savefig(path.join(folder_path, f'line_plot_{column1}_{column2}.png'), bbox_inches='tight')
+    plt.close()
+
+def render_bar_plot(data, column1, column2, folder_path):
+    """
+    Saves the bar plot of two columns.
+    """
+    plt.bar(data[column1], data[column2], color='xkcd:turquoise')
+    plt.title(f'Bar Plot - {column1} vs {column2}')
+    plt.xlabel(column1)
+    plt.ylabel(column2)
+    plt.savefig(path.join(folder_path, f'bar_plot_{column1}_{column2}.png'), bbox_inches='tight')
+    plt.close()
+
+def render_histogram(data, column, folder_path):
+    """
+    Saves the histogram of a column.
+    """
+    plt.hist(data[column], bins=10, alpha=0.6, color='xkcd:turquoise',
+             edgecolor='black', linewidth=1.2)
+    plt.title(f'Histogram - {column}')
+    plt.xlabel('Values')
+    plt.ylabel('Frequency')
+    plt.savefig(path.join(folder_path, f'histogram_{column}.png'), bbox_inches='tight')
+    plt.close()
+
+def render_boxplot(data, column, folder_path):
+    """
+    Saves the boxplot of a column.
+    """
+    plt.boxplot(data[column], showmeans=True, meanline=True)
+    plt.title(f'Boxplot - {column}')
+    plt.xlabel('Columns')
+    plt.ylabel('Values')
+    plt.savefig(path.join(folder_path, f'boxplot_{column}.png'), bbox_inches='tight')
+    plt.close()
+
+def render_pie_chart(data, column, folder_path):
+    """
+    Saves the pie chart of the value counts of a column.
+    """
+    data[column].value_counts().plot(kind='pie',
+                                     autopct='%1.1f%%',
+                                     startangle=90,
+                                     legend=True,
+                                     colormap='GnBu')
+    plt.title(f'Pie Chart - {column}')
+    plt.savefig(path.join(folder_path, f'pie_chart_{column}.png'), bbox_inches='tight')
+    plt.close()
+
+def render_violin_plot(data, column, folder_path):
+    """
+    Saves the violin plot of a column.
+    """
+    violin_parts = plt.violinplot(data[column],
+                   showmeans=True,
+                   showmedians=True,
+                   showextrema=True)
+    for pc in violin_parts['bodies']:
+        pc.set_facecolor('xkcd:turquoise')
+        pc.set_edgecolor('black')
+    plt.title(f'Violin Plot - {column}')
+    plt.xlabel('Columns')
+    plt.ylabel('Values')
+    plt.savefig(path.join(folder_path, f'violin_plot_{column}.png'), bbox_inches='tight')
+    plt.close()
+
+def render_correlation_heatmap(data, col_numeric, folder_path, correlation=None):
+    """
+    Saves the correlation heatmap of the numeric columns.
+    The correlation matrix is read from the correlation service when it isn't given.
+    """
+    if correlation is None:
+        correlation = correlation_matrix(data, col_numeric)
+    values = correlation.to_numpy()
+    _, ax = plt.subplots()
+    im = ax.imshow(values, cmap='GnBu', interpolation='nearest')
+    ax.grid(which="minor", color="w", linestyle='-', linewidth=3)
+    ax.figure.colorbar(im, ax=ax)
+    # The annotations are unreadable on large matrices
+    if len(col_numeric) <= MAX_ANNOTATED_COLUMNS:
+        for (j, i), value in ndenumerate(values.round(2)):
+            ax.text(i, j, value, ha='center', va='center')
+    plt.xticks(range(len(col_numeric)), col_numeric, rotation=90)
+    plt.yticks(range(len(col_numeric)), col_numeric)
+    plt.title(f'Correlation Heatmap')
+    plt.savefig(path.join(folder_path, 'correlation_heatmap.png'), bbox_inches='tight')
+    plt.close()
+
+# Figures reused across the plots of a process, by plot type
+reused_figures = {}
+# Rows sampled from the data of a process, for the pair plots
+downsampled_data = {}
+FIGURE_MARGINS = {'left': 0.15, 'right': 0.95, 'bottom': 0.12, 'top': 0.9}
+# Number of rows above which the scatter and line plots switch to the large data mode
+LARGE_DATA_ROWS = 100000
+
+def reused_figure(name, setup):
+    """
+    Return the figure, axes and artists of a plot type, built once per process.
+    Parameters:
+    - name: str
+        The key of the figure.
+    - setup: callable
+        Called as setup(ax) when the figure is built, returns the artists to be updated.
+    Returns:
+    - (Figure, Axes, artists)
+    """
+    if name not in reused_figures:
+        figure = Figure()
+        ax = figure.add_subplot()
+        # Fixed margins instead of recomputing a tight bounding box for every save
+        figure.subplots_adjust(**FIGURE_MARGINS)
+        reused_figures[name] = (figure, ax, setup(ax))
+    return reused_figures[name]
+
+def finite_values(series):
+    """
+    Return the values of a series as floats, and the finite ones.
+    """
+    values = series.to_numpy(dtype='float64', na_value=nan)
+    return values, values[isfinite(values)]
+
+def set_limits(ax, x, y):
+    """
+    Set the limits of the axes to the finite range of the values, with a 5% margin.
+    """
+    for values, set_lim in [(x, ax.set_xlim), (y, ax.set_ylim)]:
+        values = values[isfinite(values)]
+        if len(values) == 0:
+            set_lim(0, 1)
+            continue
+        low, high = values.min(), values.max()
+        margin = (high - low) * 0.05 if high > low else 0.5
+        set_lim(low - margin, high + margin)
+
+def label_axes(ax, title, xlabel, ylabel):
+    """
+    Update the title and axis labels of a reused figure.
+    """
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+
+def downsample(data, max_points):
+    """
+    Return at most max_points rows of the data, sampled once per process and kept in order.
+    """
+    if not max_points or len(data) <= max_points:
+        return data
+    key = (id(data), max_points)
+    if key not in downsampled_data:
+        downsampled_data.clear()
+        downsampled_data[key] = data.sample(max_points, random_state=0).sort_index()
+    return downsampled_data[key]
+
+def draw_scatter_plot(data, column1, column2):
+    """
+    Updates the offsets of the reused scatter plot with two columns and returns its figure.
+    """
+    figure, ax, collection = reused_figure('scatter', lambda ax: ax.scatter([], [], color='xkcd:turquoise'))
+    x, _ = finite_values(data[column1])
+    y, _ = finite_values(data[column2])
+    collection.set_offsets(column_stack([x, y]))
+    set_limits(ax, x, y)
+    label_axes(ax, f'Scatter Plot - {column1} vs {column2}', column1, column2)
+    return figure
+
+def draw_line_plot(data, column1, column2):
+    """
+    Updates the data of the reused line plot with two columns and returns its figure.
+    """
+    figure, ax, line = reused_figure('line', lambda ax: ax.plot([], [], color='xkcd:turquoise')[0])
+    x, _ = finite_values(data[column1])
+    y, _ = finite_values(data[column2])
+    line.set_data(x, y)
+    set_limits(ax, x, y)
+    label_axes(ax, f'Line Plot - {column1} vs {column2}', column1, column2)
+    return figure
+
+def draw_density_plot(data, column1, column2):
+    """
+    Updates the image of the reused density plot with the 2-D histogram of two columns
+    and returns its figure. Used instead of the scatter plot for large data.
+    """
+    def setup(ax):
+        image = ax.imshow(zeros((DENSITY_BINS, DENSITY_BINS)), origin='lower', aspect='auto',
+                          cmap='viridis', norm=LogNorm(vmin=1, vmax=10), interpolation='nearest')
+        ax.figure.colorbar(image, ax=ax, label='Count')
+        return image
+
+    figure, ax, image = reused_figure('density', setup)
+    x, _ = finite_values(data[column1])
+    y, _ = finite_values(data[column2])
+    counts, extent = density(x, y)
+    # Empty bins are left blank
+    image.set_data(masked_equal(counts, 0))
+    image.set_extent(extent)
+    image.set_clim(1, max(counts.max(), 2))
+    label_axes(ax, f'Scatter Plot (density) - {column1} vs {column2}', column1, column2)
+    return figure
+
+def draw_decimated_line_plot(data, column1, column2):
+    """
+    Updates the data of the reused line plot with the LTTB decimation of two columns
+    and returns its figure. Used instead of the full line plot for large data.
+    """
+    figure, ax, line = reused_figure('line', lambda ax: ax.plot([], [], color='xkcd:turquoise')[0])
+    x, _ = finite_values(data[column1])
+    y, _ = finite_values(data[column2])
+    x, y = lttb(x, y)
+    line.set_data(x, y)
+    set_limits(ax, x, y)
+    label_axes(ax, f'Line Plot (decimated) - {column1} vs {column2}', column1, column2)
+    return figure
+
+def draw_bar_plot(data, column1, column2):
+    """
+    Moves and resizes the bars of the reused bar plot with two columns and returns its figure.
+    """
+    figure, ax, bars = reused_figure(f'bar_{len(data)}',
+                                     lambda ax: ax.bar(zeros(len(data)), zeros(len(data)),
+                                                       color='xkcd:turquoise').patches)
+    x, _ = finite_values(data[column1])
+    y, _ = finite_values(data[column2])
+    for bar, x_value, y_value in zip(bars, x, y):
+        bar.set_x(x_value - bar.get_width() / 2)
+        bar.set_height(y_value)
+    ax.relim()
+    ax.autoscale_view()
+    label_axes(ax, f'Bar Plot - {column1} vs {column2}', column1, column2)
+    return figure
+
+def update_scatter_plot(data, column1, column2, folder_path, max_points=None, large_threshold=None):
+    """
+    Saves the scatter plot of two columns by updating the offsets of a reused scatter,
+    or the image of a reused density plot above large_threshold rows.
+    """
+    data = downsample(data, max_points)
+    figure = pair_drawer('Scatter Plot', len(data), large_threshold)(data, column1, column2)
+    figure.savefig(path.join(folder_path, f'scatter_plot_{column1}_{column2}.png'))
+
+def update_line_plot(data, column1, column2, folder_path, max_points=None, large_threshold=None):
+    """
+    Saves the line plot of two columns by updating the data of a reused line,
+    decimated above large_threshold rows.
+    """
+    data = downsample(data, max_points)
+    figure = pair_drawer('Line Plot', len(data), large_threshold)(data, column1, column2)
+    figure.savefig(path.join(folder_path, f'line_plot_{column1}_{column2}.png'))
+
+def update_bar_plot(data, column1, column2, folder_path, max_points=None, large_threshold=None):
+    """
+    Saves the bar plot of two columns by moving and resizing the bars of a reused bar plot.
+    """
+    figure = draw_bar_plot(downsample(data, max_points), column1, column2)
+    figure.savefig(path.join(folder_path, f'bar_plot_{column1}_{column2}.png'))
+
+PAIR_DRAWERS = {
+    'Scatter Plot': draw_scatter_plot,
+    'Line Plot': draw_line_plot,
+    'Bar Plot': draw_bar_plot
+}
+
+LARGE_PAIR_DRAWERS = {
+    'Scatter Plot': draw_density_plot,
+    'Line Plot': draw_decimated_line_plot
+}
+
+def pair_drawer(visualization_type, rows, large_threshold=None):
+    """
+    Return the function drawing a pair plot, the large data one above large_threshold rows.
+    """
+    if large_threshold and rows > large_threshold and visualization_type in LARGE_PAIR_DRAWERS:
+        return LARGE_PAIR_DRAWERS[visualization_type]
+    return PAIR_DRAWERS[visualization_type]
+
+def render_pair_pdf(data, visualization_type, columns, folder_path, max_points=None, large_threshold=None):
+    """
+    Saves the plots of every pair of columns as the pages of one PDF file, reusing one figure.
+    """
+    file_name = visualization_type.lower().replace(' ', '_')
+    data = downsample(data, max_points)
+    drawer = pair_drawer(visualization_type, len(data), large_threshold)
+    with PdfPages(path.join(folder_path, f'{file_name}s.pdf')) as pdf:
+        for column1, column2 in combinations(columns, 2):
+            pdf.savefig(drawer(data, column1, column2))
+
+def render_pair_matrix(data, visualization_type, columns, folder_path, max_points=None, large_threshold=None):
+    """
+    Saves the plots of every pair of columns tiled in one figure, as a scatter matrix:
+    the pairs are drawn below the diagonal and the histogram of each column on the diagonal.
+    Above large_threshold rows, the scatter plots are drawn as hexagonal bins and the lines decimated.
+    """
+    file_name = visualization_type.lower().replace(' ', '_')
+    data = downsample(data, max_points)
+    large = bool(large_threshold) and len(data) > large_threshold
+    count = len(columns)
+    size = min(2 * count, 40)
+    figure = Figure(figsize=(size, size))
+    axes = figure.subplots(count, count, squeeze=False)
+    values = {column: finite_values(data[column]) for column in columns}
+    for i, column_y in enumerate(columns):
+        for j, column_x in enumerate(columns):
+            ax = axes[i][j]
+            x, finite_x = values[column_x]
+            y, _ = values[column_y]
+            if i == j:
+                ax.hist(finite_x, bins=10, alpha=0.6, color='xkcd:turquoise', edgecolor='black')
+            elif i < j:
+                ax.set_visible(False)
+                continue
+            elif visualization_type == 'Scatter Plot' and large:
+                ax.hexbin(*finite_pairs(x, y), gridsize=40, mincnt=1, bins='log', cmap='viridis')
+            elif visualization_type == 'Scatter Plot':
+                ax.scatter(x, y, s=2, color='xkcd:turquoise')
+            elif visualization_type == 'Line Plot':
+                ax.plot(*(lttb(x, y) if large else (x, y)), linewidth=0.5, color='xkcd:turquoise')
+            else:
+                ax.bar(x, y, color='xkcd:turquoise')
+            ax.tick_params(labelsize=6)
+            if i == count - 1:
+                ax.set_xlabel(column_x, fontsize=8)
+            if j == 0:
+                ax.set_ylabel(column_y, fontsize=8)
+    figure.suptitle(f'{visualization_type} Matrix')
+    figure.savefig(path.join(folder_path, f'{file_name}_matrix.png'))
+
+def update_histogram(data, column, folder_path):
+    """
+    Saves the histogram of a column by resizing the bins of a reused histogram.
+    Non-numeric columns are drawn on a new figure.
+    """
+    if data[column].dtype not in NUMERIC_DTYPES:
+        render_histogram(data, column, folder_path)
+        return
+    figure, ax, bins = reused_figure('histogram',
+                                     lambda ax: ax.hist(zeros(1), bins=10, alpha=0.6, color='xkcd:turquoise',
+                                                        edgecolor='black', linewidth=1.2)[2].patches)
+    _, values = finite_values(data[column])
+    counts, edges = histogram(values, bins=len(bins))
+    for bar, count, left, right in zip(bins, counts, edges[:-1], edges[1:]):
+        bar.set_x(left)
+        bar.set_width(right - left)
+        bar.set_height(count)
+    ax.relim()
+    ax.autoscale_view()
+    label_axes(ax, f'Histogram - {column}', 'Values', 'Frequency')
+    figure.savefig(path.join(folder_path, f'histogram_{column}.png'))
+
+def update_boxplot(data, column, folder_path):
+    """
+    Saves the boxplot of a column, drawn on a reused figure.
+    """
+    figure, ax, _ = reused_figure('axes', lambda ax: None)
+    ax.clear()
+    ax.boxplot(data[column], showmeans=True, meanline=True)
+    label_axes(ax, f'Boxplot - {column}', 'Columns', 'Values')
+    figure.savefig(path.join(folder_path, f'boxplot_{column}.png'))
+
+def update_violin_plot(data, column, folder_path):
+    """
+    Saves the violin plot of a column, drawn on a reused figure.
+    """
+    figure, ax, _ = reused_figure('axes', lambda ax: None)
+    ax.clear()
+    violin_parts = ax.violinplot(data[column],
+                                 showmeans=True,
+                                 showmedians=True,
+                                 showextrema=True)
+    for pc in violin_parts['bodies']:
+        pc.set_facecolor('xkcd:turquoise')
+        pc.set_edgecolor('black')
+    label_axes(ax, f'Violin Plot - {column}', 'Columns', 'Values')
+    figure.savefig(path.join(folder_path, f'violin_plot_{column}.png'))
+
+def update_pie_chart(data, column, folder_path):
+    """
+    Saves the pie chart of the value counts of a column, drawn on a reused figure.
+    """
+    figure, ax, _ = reused_figure('axes', lambda ax: None)
+    ax.clear()
+    data[column].value_counts().plot(kind='pie',
+                                     ax=ax,
+                                     autopct='%1.1f%%',
+                                     startangle=90,
+                                     legend=True,
+                                     colormap='GnBu')
+    label_axes(ax, f'Pie Chart - {column}', '', column)
+    figure.savefig(path.join(folder_path, f'pie_chart_{column}.png'))
+
+RENDERERS = {
+    'Scatter Plot': render_scatter_plot,
+    'Line Plot': render_line_plot,
+    'Bar Plot': render_bar_plot,
+    'Histogram': render_histogram,
+    'Boxplot': render_boxplot,
+    'Pie Chart': render_pie_chart,
+    'Violin Plot': render_violin_plot,
+    'Correlation Heatmap': render_correlation_heatmap
+}
+
+REUSED_RENDERERS = {
+    'Scatter Plot': update_scatter_plot,
+    'Line Plot': update_line_plot,
+    'Bar Plot': update_bar_plot,
+    'Histogram': update_histogram,
+    'Boxplot': update_boxplot,
+    'Pie Chart': update_pie_chart,
+    'Violin Plot': update_violin_plot,
+    'Correlation Heatmap': render_correlation_heatmap
+}
+
+OUTPUT_MODES = ['separate', 'matrix', 'pdf']
+
+def plan_visualizations(data, visualization_types, column_subset, folder_path, reuse_figures=True,
+                        output_mode='separate', max_points=None, large_threshold=LARGE_DATA_ROWS,
+                        correlation_method='pearson', version=None):
+    """
+    List the rendering tasks of the given visualization types.
+    Parameters:
+    - data: pandas DataFrame
+        The data to be visualized.
+    - visualization_types: list of str
+        The types of visualizations to be generated.
+    - column_subset: list of str
+        The subset of columns to be used for visualization.
+    - folder_path: str
+        The folder in which the figures are saved.
+    - reuse_figures: bool
+        Whether to update the artists of a figure reused per plot type,
+        instead of building a new figure for every plot.
+    - output_mode: str
+        How the Scatter/Line/Bar plots of the column pairs are saved, one of OUTPUT_MODES:
+        'separate' (one PNG per pair), 'matrix' (one tiled PNG) or 'pdf' (one page per pair).
+    - max_points: int
+        If set, the pair plots are drawn from a sample of at most max_points rows.
+        Only used with reused figures or the matrix/pdf output modes.
+    - large_threshold: int
+        Number of rows above which the scatter plots are drawn as a 2-D density and
+        the line plots are decimated (LTTB), None to always draw every point.
+        Only used with reused figures or the matrix/pdf output modes.
+    - correlation_method: str
+        The method of the correlation heatmap, 'pearson' or 'spearman'.
+    - version: int
+        The version of the data, the correlation matrix is cached against it if set.
+    Returns:
+    - list of (function, args) tuples
+    """
+    if output_mode not in OUTPUT_MODES:
+        raise ValueError(f"Unknown output mode: {output_mode}")
+    renderers = REUSED_RENDERERS if reuse_figures else RENDERERS
+    if len(column_subset) == 0:
+        column_subset = data.columns
+    numeric_subset = data[column_subset].select_dtypes(include=NUMERIC_DTYPES).columns
+
+    tasks = []
+    for visualization_type in visualization_types:
+        renderer = renderers[visualization_type]
+        if visualization_type in PAIR_DRAWERS:
+            if output_mode == 'matrix':
+                tasks.append((render_pair_matrix, (visualization_type, list(numeric_subset),
+                                                   folder_path, max_points, large_threshold)))
+            elif output_mode == 'pdf':
+                tasks.append((render_pair_pdf, (visualization_type, list(numeric_subset),
+                                                folder_path, max_points, large_threshold)))
+            else:
+                # Cartesian product of the numeric columns
+                sampling = (max_points, large_threshold) if reuse_figures else ()
+                for column1, column2 in combinations(numeric_subset, 2):
+                    tasks.append((renderer, (column1, column2, folder_path, *sampling)))
+
+        for column in column_subset:
+            if visualization_type == 'Histogram':
+                tasks.append((renderer, (column, folder_path)))
+            elif visualization_type in ['Boxplot', 'Violin Plot'] and column in numeric_subset:
+                tasks.append((renderer, (column, folder_path)))
+            elif visualization_type == 'Pie Chart' and is_categorical(data[column].dtype):
+                tasks.append((renderer, (column, folder_path)))
+
+        if visualization_type == 'Correlation Heatmap':
+            # Computed once here, the rendering process only draws it
+            correlation = correlation_matrix(data, numeric_subset, correlation_method, version)
+            tasks.append((renderer, (numeric_subset, folder_path, correlation)))
+    return tasks
+
+def generate_visualizations(data, visualization_types, column_subset, save_path,
+                            progress=None, cancel=None, processes=None, reuse_figures=True,
+                            output_mode='separate', max_points=None, large_threshold=LARGE_DATA_ROWS,
+                            correlation_method='pearson', version=None, timings=None):
     """
     Generate visualizations based on the given data, visualization types, and column subset.
     Parameters:
@@ -25,106 +553,66 @@ def generate_visualizations(data, visualization_types, column_subset):
         The types of visualizations to be generated.
     - column_subset: list of str
         The subset of columns to be used for visualization.
+    - save_path: str
+        The folder in which the visualizations folder is created.
+    - progress: callable
+        Optional callback called as progress(done, total) after every figure.
+    - cancel: threading.Event
+        Optional event, the remaining figures are dropped once it is set.
+    - processes: int
+        The number of rendering processes, the number of CPUs if None.
+    - reuse_figures: bool
+        Whether to reuse one figure per plot type and process, updating its artists.
+    - output_mode: str
+        How the pair plots are saved: 'separate', 'matrix' or 'pdf' (see plan_visualizations).
+    - max_points: int
+        If set, the pair plots are drawn from a sample of at most max_points rows.
+    - large_threshold: int
+        Number of rows above which the scatter plots are drawn as a 2-D density and
+        the line plots are decimated, None to always draw every point.
+    - correlation_method: str
+        The method of the correlation heatmap, 'pearson' or 'spearman'.
+    - version: int
+        The version of the data, the correlation matrix is cached against it if set.
+    - timings: dict
+        Optional dict, filled with the figures, wall and CPU seconds of every visualization type.
+        The seconds add up the planning (e.g. the correlation matrix) and the rendering of its
+        figures, in whichever process they were rendered.
     Returns:
     - bool
         True if the visualizations are successfully generated and saved, False otherwise.
     """
+    if not save_path:
+        return False
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     folder_name = f"visualizations_{timestamp}"
-    save_path = filedialog.askdirectory(title="Select Folder to Save Visualizations")
-    if save_path == '':
-        return False
     folder_path = path.join(save_path, folder_name)
     makedirs(folder_path)
 
-    if column_subset == []:
-        column_subset = data.columns
-        
+    tasks, task_types = [], []
     for visualization_type in visualization_types:
-        if visualization_type in ['Scatter Plot', 'Line Plot', 'Bar Plot']:
-            column_subset = data[column_subset].select_dtypes(['int64', 'float64']).columns
-            # Cartesian product of column_subset
-            column_pairs = list(combinations(column_subset, 2))
-            for pair in column_pairs:
-                column1, column2 = pair
-                if visualization_type == 'Scatter Plot':
-                    plt.scatter(data[column1], data[column2], color='xkcd:turquoise')
-                    plt.title(f'Scatter Plot - {column1} vs {column2}')
-                    plt.xlabel(column1)
-                    plt.ylabel(column2)
-                    plt.savefig(path.join(folder_path, f'scatter_plot_{column1}_{column2}.png'), bbox_inches='tight')
-                    plt.close()
-                elif visualization_type == 'Line Plot':
-                    plt.plot(data[column1], data[column2], color='xkcd:turquoise')
-                    plt.title(f'Line Plot - {column1} vs {column2}')
-                    plt.xlabel(column1)
-                    plt.ylabel(column2)
-                    plt.savefig(path.join(folder_path, f'line_plot_{column1}_{column2}.png'), bbox_inches='tight')
-                    plt.close()
-                elif visualization_type == 'Bar Plot':
-                    plt.bar(data[column1], data[column2], color='xkcd:turquoise')
-                    plt.title(f'Bar Plot - {column1} vs {column2}')
-                    plt.xlabel(column1)
-                    plt.ylabel(column2)
-                    plt.savefig(path.join(folder_path, f'bar_plot_{column1}_{column2}.png'), bbox_inches='tight')
-                    plt.close()
-
-        for column in column_subset:
-            if visualization_type == 'Histogram':
-                plt.hist(data[column], bins=10, alpha=0.6, color='xkcd:turquoise',
-                         edgecolor='black', linewidth=1.2)
-                plt.title(f'Histogram - {column}')
-                plt.xlabel('Values')
-                plt.ylabel('Frequency')
-                plt.savefig(path.join(folder_path, f'histogram_{column}.png'), bbox_inches='tight')
-                plt.close()
-            elif visualization_type == 'Boxplot':
-                if data[column].dtype not in ['int64', 'float64']:
-                    continue
-                plt.boxplot(data[column], showmeans=True, meanline=True)
-                plt.title(f'Boxplot - {column}')
-                plt.xlabel('Columns')
-                plt.ylabel('Values')
-                plt.savefig(path.join(folder_path, f'boxplot_{column}.png'), bbox_inches='tight')
-                plt.close()
-            elif visualization_type == 'Pie Chart':
-                if data[column].dtype == 'object':
-                    data[column].value_counts().plot(kind='pie',
-                                                     autopct='%1.1f%%',
-                                                     startangle=90,
-                                                     legend=True,
-                                                     colormap='GnBu')
-                    plt.title(f'Pie Chart - {column}')
-                    plt.savefig(path.join(folder_path, f'pie_chart_{column}.png'), bbox_inches='tight')
-                    plt.close()
-            elif visualization_type == 'Violin Plot':
-                if data[col].dtype not in ['int64', 'float64']:
-                    continue
-                violin_parts = plt.violinplot(data[column],
-                               showmeans=True,
-                               showmedians=True,
-                               showextrema=True)
-                for pc in violin_parts['bodies']:
-                    pc.set_facecolor('xkcd:turquoise')
-                    pc.set_edgecolor('black')
-                plt.title(f'Violin Plot - {column}')
-                plt.xlabel('Columns')
-                plt.ylabel('Values')
-                plt.savefig(path.join(folder_path, f'violin_plot_{column}.png'), bbox_inches='tight')
-                plt.close()
-
-        if visualization_type == 'Correlation Heatmap':
-            col_numeric = data[column_subset].select_dtypes(include=['int64', 'float64']).columns
-            _, ax = plt.subplots()
-            im = ax.imshow(data[col_numeric].corr(), cmap='GnBu', interpolation='nearest')
-            ax.grid(which="minor", color="w", linestyle='-', linewidth=3)
-            ax.figure.colorbar(im, ax=ax)
-            for i in range(len(data[col_numeric].columns)):
-                for j in range(len(data[col_numeric].columns)):
-                    ax.text(i, j, round(data[col_numeric].corr().iloc[i, j], 2), ha='center', va='center')
-            plt.xticks(range(len(data[col_numeric].columns)), data[col_numeric].columns, rotation=90)
-            plt.yticks(range(len(data[col_numeric].columns)), data[col_numeric].columns)
-            plt.title(f'Correlation Heatmap')
-            plt.savefig(path.join(folder_path, f'correlation_heatmap_{col_numeric}.png'), bbox_inches='tight')
-            plt.close()
-    return True
+        wall, cpu = perf_counter(), thread_time()
+        planned = plan_visualizations(data, [visualization_type], column_subset, folder_path,
+                                      reuse_figures, output_mode, max_points, large_threshold,
+                                      correlation_method, version)
+        tasks.extend(planned)
+        task_types.extend([visualization_type] * len(planned))
+        if timings is not None:
+            timings[visualization_type] = {'figures': len(planned),
+                                           'wall_seconds': perf_counter() - wall,
+                                           'cpu_seconds': thread_time() - cpu}
+    if len(column_subset) == 0:
+        column_subset = data.columns
+    task_timings = []
+    try:
+        # Only the plotted columns are sent to the rendering processes
+        return render(data[list(column_subset)], tasks, processes, progress, cancel, task_timings)
+    finally:
+        if timings is not None:
+            for visualization_type, timing in zip(task_types, task_timings):
+                if timing is not None:
+                    timings[visualization_type]['wall_seconds'] += timing[0]
+                    timings[visualization_type]['cpu_seconds'] += timing[1]
+        # Figures and samples kept in this process (single task or no pool) are released
+        reused_figures.clear()
+        downsampled_data.clear()
@@ -0,0 +1,115 @@
+'''
+Headless command line of the ML Starterkit: cleans, transforms and plots data files
+without the Kivy/Tk interface, e.g. on a server or from cron.
+The steps are applied in the order they are given on the command line, or read from
+a JSON file (see Scripts/batch.py). Every file gets an output folder with the processed
+data (CSV by default), the fitted pipeline and the visualizations.
+
+Usage:
+    python cli.py data.csv more_data/ -o out --drop Id --dedupe --impute median \\
+        --transform Standardization "One-Hot Encoding" --visualize Histogram --jobs 4
+    python cli.py data.csv -o out --steps steps.json --format parquet --partition-by Department
+'''
+
+import sys
+from argparse import Action, ArgumentParser, RawDescriptionHelpFormatter
+from multiprocessing import freeze_support
+
+from Scripts.batch import data_files, load_steps, process_files, validate_steps
+from Scripts.export import available_formats
+
+class StepAction(Action):
+    '''
+    Appends the step of an option to the ordered list of steps.
+    '''
+    def __call__(self, parser, namespace, values, option_string=None):
+        steps = getattr(namespace, 'steps', None) or []
+        steps.append((self.dest, values))
+        namespace.steps = steps
+
+def build_steps(args):
+    '''
+    Builds the steps of the step options, in command line order.
+    Args:
+        args (Namespace): The parsed arguments.
+    Returns:
+        steps (list): The steps, as dicts.
+    '''
+    steps = []
+    for op, values in args.steps or []:
+        if op == 'impute':
+            method, columns = values[0], values[1:]
+            steps.append({'op': op, 'method': method, 'columns': columns, 'key': args.group_by})
+        elif op in ['transform', 'visualize']:
+            step = {'op': op, 'types': values, 'columns': args.columns}
+            if op == 'visualize':
+                step.update(output_mode=args.output_mode, max_points=args.max_points)
+            steps.append(step)
+        else:
+            steps.append({'op': op, 'columns': values})
+    return steps
+
+def main(argv=None):
+    parser = ArgumentParser(description=__doc__, formatter_class=RawDescriptionHelpFormatter)
+    parser.add_argument('inputs', nargs='+', help="Data files, or folders of data files.")
+    parser.add_argument('-o', '--output-dir', required=True, help="Folder of the outputs.")
+    parser.add_argument('--steps', dest='steps_file', help="JSON file of the steps, instead of the step options.")
+    parser.add_argument('--jobs', type=int, default=1, help="Number of files processed in parallel.")
+    parser.add_argument('--optimize', action='store_true', help="Downcast the dtypes of the loaded data.")
+    parser.add_argument('--format', default='csv', choices=available_formats(),
+                        help="Format of the processed data.")
+    parser.add_argument('--partition-by', metavar='COLUMN',
+                        help="Save the processed data as a folder of Parquet files per value of the column.")
+
+    steps = parser.add_argument_group("steps, applied in the given order")
+    steps.add_argument('--drop', nargs='+', action=StepAction, metavar='COLUMN', help="Drop columns.")
+    steps.add_argument('--dedupe', nargs='*', action=StepAction, metavar='COLUMN',
+                       help="Remove the duplicate rows, compared on the columns (all by default).")
+    steps.add_argument('--impute', nargs='+', action=StepAction, metavar=('METHOD', 'COLUMN'),
+                       help="Fill or remove the missing values of the columns (all by default). "
+                            "METHOD: mean, median, mode, remove, 'group mean', 'group median', knn, iterative.")
+    steps.add_argument('--transform', nargs='+', action=StepAction, metavar='TYPE',
+                       help="Fit and apply transformations, e.g. Standardization 'One-Hot Encoding'.")
+    steps.add_argument('--visualize', nargs='+', action=StepAction, metavar='TYPE',
+                       help="Save visualizations, e.g. Histogram 'Correlation Heatmap'.")
+
+    options = parser.add_argument_group("step options")
+    options.add_argument('--group-by', metavar='COLUMN', help="Key column of the group imputation.")
+    options.add_argument('--columns', nargs='+', default=[], metavar='COLUMN',
+                         help="Columns of the transformations and visualizations (all by default).")
+    options.add_argument('--output-mode', default='separate', choices=['separate', 'matrix', 'pdf'],
+                         help="How the pair plots are saved.")
+    options.add_argument('--max-points', type=int, help="Draw the pair plots from a sample of rows.")
+    parser.set_defaults(steps=None)
+    args = parser.parse_args(argv)
+
+    if args.steps_file and args.steps:
+        parser.error("use either --steps or the step options")
+    if args.partition_by and args.format != 'parquet':
+        parser.error("--partition-by needs --format parquet")
+    try:
+        steps = load_steps(args.steps_file) if args.steps_file else build_steps(args)
+        validate_steps(steps)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    files = data_files(args.inputs)
+    if not files:
+        parser.error("no data files")
+
+    failed = 0
+    for summary in process_files(files, steps, args.output_dir, args.jobs, args.optimize,
+                                 output_format=args.format, partition_column=args.partition_by):
+        if summary['error']:
+            failed += 1
+            print(f"FAILED {summary['file']}: {summary['error']}", file=sys.stderr)
+            continue
+        rows, columns = summary['shape_after']
+        print(f"{summary['file']}: {summary['shape_before'][0]} -> {rows} rows, "
+              f"{summary['shape_before'][1]} -> {columns} columns in {summary['seconds']:.2f} s")
+        for output in summary['outputs']:
+            print(f"    {output}")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    freeze_support()
+    sys.exit(main())
@@ -1,4 +1,7 @@
-from pandas import read_csv, read_excel
+from time import perf_counter
+# Start of the startup time, reported once the window is shown
+STARTED = perf_counter()
+
 from tkinter import Tk
 from kivy.app import App
 from kivy.uix.button import Button
@@ -10,16 +13,21 @@ from kivy.uix.scrollview import ScrollView
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.label import Label
 from kivy.uix.checkbox import CheckBox
+from kivy.uix.spinner import Spinner
 from kivy.uix.popup import Popup
 from kivy.graphics import Rectangle
 from kivy.core.window import Window
 from kivy.config import Config
 from kivy.lang import Builder
-from Scripts.transformation import perform_transformations
-from Scripts.visualization import generate_visualizations
-from os import path
+# The data modules (pandas, pyarrow, scikit-learn...) are imported by the handlers
+# using them, or by the warm-up once the window is shown, not at startup
+from Scripts.startup import warm_up
+from Scripts.profiling import default_profiler, measured
+from threading import Event
+from multiprocessing import freeze_support
 from datetime import datetime
-from Scripts.Threading.functhreading import thread
+from Scripts.Threading.functhreading import thread, background_thread
+from Scripts.Threading.executor import default_executor
 
 from kivy.clock import (mainthread,
                         Clock)
@@ -27,6 +35,12 @@ Config.set('input', 'mouse', 'mouse,disable_multitouch')
 
 WINDOW_SIZE = (720, 580)
 
+# Points drawn per pair plot when downsampling is selected
+DOWNSAMPLE_POINTS = 10000
+
+# Largest dense one-hot encoding allowed, above it only sparse columns can be created
+MAX_DENSE_BYTES = 1024 ** 3
+
 MAIN_COLORS = {
     "GREEN": "45b7af",
     "RED": "f3565d",
@@ -42,6 +56,30 @@ Window.size = WINDOW_SIZE
 Window.minimum_width = WINDOW_SIZE[0]-0.1*WINDOW_SIZE[0]
 Window.minimum_height = WINDOW_SIZE[1]-0.1*WINDOW_SIZE[1]
 
+def configure_pandas():
+    '''
+    Sets the pandas options of the application, before any data is loaded.
+    Returns:
+        None
+    '''
+    from pandas import set_option, __version__ as pandas_version
+    if int(pandas_version.split('.')[0]) < 3:
+        # Default from pandas 3: the operations work on shallow copies of the data, which
+        # share the unmodified columns with it, and the history keeps references to columns
+        set_option('mode.copy_on_write', True)
+
+def run_on_mainthread(callback, *args):
+    '''
+    Schedules a callback on the main thread, used to dispatch job callbacks.
+    Args:
+        callback (callable): The callback to run.
+        *args: The arguments of the callback.
+    Returns:
+        None
+    '''
+    mainthread(callback)(*args)
+    return
+
 def popup(type, text=""):
     '''
     Creates a popup window based on the type.
@@ -73,6 +111,14 @@ class MLStarterkit(App):
     This class represents the main application and contains various methods
     for file handling, UI updates, and operations.
     '''
+    load_cancel = None
+    memory_before = None
+    pipeline = None
+    df_version = 0
+    data_job = None
+    history = None
+    missing_index = None
+
     def open_file(self, file_path="", df=None):
         '''
         Opens the selected file and updates the UI accordingly.
@@ -81,8 +127,17 @@ class MLStarterkit(App):
         Returns:
             None
         '''
+        # A second click while a file is loading cancels the load
+        if self.load_cancel is not None and not self.load_cancel.is_set():
+            self.load_cancel.set()
+            self.load_button.text = "CANCELLING"
+            self.load_button.disabled = True
+            return
+
+        from Scripts.history import History
         # Dataframe starts processing here
         self.df = df
+        self.history = History()
         
         # Prepare new layout
         self.scroll_layout = ScrollView(size_hint=(0.9, 0.55),
@@ -94,10 +149,12 @@ class MLStarterkit(App):
             self.file_path = file_path
             if file_path:
                 print("Selected file:", file_path)
-                self.load_button.text = "FILE LOADING"
-                self.load_button.disabled = True
+                self.load_button.text = "CANCEL LOADING"
+                self.load_cancel = Event()
+                self.memory_before = None
+                optimize = self.optimize_checkbox.active
                 
-                thread = self.read_file(file_path)
+                thread = self.read_file(file_path, optimize)
 
                 self.loadreq.text = "Loading data..."
                 self.monitor_change(thread, self.load_view)
@@ -106,20 +163,73 @@ class MLStarterkit(App):
         return
     
     @thread
-    def read_file(self, file_path):
+    def read_file(self, file_path, optimize=False):
         '''
-        Reads a file and returns a pandas DataFrame
+        Reads a file (from the cache if it was already parsed, in row batches otherwise)
+        and stores it as a pandas DataFrame.
         Args:
             file_path (str): The path of the file.
+            optimize (bool): Whether to downcast the dtypes of the loaded DataFrame.
         Returns:
-            df (pandas.DataFrame): The DataFrame containing the data from the file.
+            None
         '''
-        _, file_extension = path.splitext(file_path)
-        if file_extension.lower() in ['.csv', '.txt']:
-            df = read_csv(file_path)
-        else:
-            df = read_excel(file_path)
-        self.df = df
+        try:
+            configure_pandas()
+            from Scripts.cache import load_cached, store_cached
+            from Scripts.dtypes import optimize_dtypes, memory_size
+            from Scripts.ingest import read_file as ingest_file
+            with self.profiler.measure("read_file", file=file_path, optimize=optimize) as record:
+                df = load_cached(file_path)
+                record['cached'] = df is not None
+                if df is None:
+                    df = ingest_file(file_path,
+                                     progress=self.update_load_progress,
+                                     cancel=self.load_cancel)
+                    if df is not None:
+                        self.update_load_label("Caching data...")
+                        store_cached(file_path, df)
+                if df is not None and optimize:
+                    self.update_load_label("Optimizing data types...")
+                    self.memory_before = memory_size(df)
+                    df = optimize_dtypes(df)
+                if df is not None:
+                    record['rows'], record['columns'] = df.shape
+            self.df = df
+        except Exception as e:
+            self.df = None
+            print(e)
+        return
+
+    @mainthread
+    def update_load_label(self, text):
+        '''
+        Updates the loading label from a background thread.
+        Args:
+            text (str): The text to display.
+        Returns:
+            None
+        '''
+        if self.load_cancel is not None:
+            self.loadreq.text = text
+        return
+
+    @mainthread
+    def update_load_progress(self, bytes_read, total_bytes, rows_read):
+        '''
+        Updates the loading label with the progress of the file being read.
+        Args:
+            bytes_read (int): The number of bytes read so far.
+            total_bytes (int): The size of the file in bytes.
+            rows_read (int): The number of rows read so far.
+        Returns:
+            None
+        '''
+        if self.load_cancel is None or self.load_cancel.is_set():
+            return
+        percentage = 100 * bytes_read / total_bytes if total_bytes else 100
+        self.loadreq.text = (f"Loading data... {percentage:.0f}% "
+                             f"({bytes_read / 1024**2:.1f} / {total_bytes / 1024**2:.1f} MB, "
+                             f"{rows_read:,} rows)")
         return
 
     def remove_scrollview(self, widget):
@@ -130,13 +240,8 @@ class MLStarterkit(App):
         Returns:
             None
         '''
-        if isinstance(widget, ScrollView):
-            widget.clear_widgets()
-            self.layout.remove_widget(widget)
-        elif isinstance(widget, (BoxLayout, GridLayout)):
-            for child in widget.children:
-                self.remove_scrollview(child)
-            widget.clear_widgets()
+        # Removing the parent drops the whole subtree, no need to walk it
+        if isinstance(widget, (ScrollView, BoxLayout, GridLayout)):
             self.layout.remove_widget(widget)
 
     @mainthread
@@ -165,19 +270,42 @@ class MLStarterkit(App):
         del(root)
         return
 
-    def refresh_scrollview(self):
+    @measured("refresh_scrollview", lambda self, changes=None: self.df)
+    def refresh_scrollview(self, changes=None):
         """
-        Refreshes the scroll view by removing
-        the existing widgets and opening a new file.
+        Refreshes the scroll view after an operation on the DataFrame.
+        If the changes made by the operation are known, only the affected
+        panels and columns are updated, otherwise the whole view is rebuilt.
+        Args:
+            changes (ChangeSet): The changes made by the operation.
         Returns:
             None
         """
-        for widget in [self.scroll_layout,
-                       self.file_boxlayout,
-                       self.button_box_layout]:
-            self.remove_scrollview(widget)
-        new_df = self.df
-        self.open_file(df=new_df)
+        if changes is None:
+            for widget in [self.scroll_layout,
+                           self.file_boxlayout,
+                           self.button_box_layout]:
+                self.remove_scrollview(widget)
+            new_df = self.df
+            self.open_file(df=new_df)
+            return
+        if changes.empty:
+            return
+        self.df_version += 1
+        self.missing_index.set_data(self.df, changes)
+        self.file_shape.text = self.file_info_text()
+        self.data_grid_layout.set_data(self.df)
+        if changes.structural or changes.rows:
+            self.data_info_layout.set_data(self.df)
+        else:
+            self.data_info_layout.update_columns(self.df, changes.columns)
+        self.describe_data(self.df, self.df_version, changes.affected(self.df.columns))
+        self.count_duplicates(self.df, self.df_version)
+        self.missing_values_label.text = f"Number of missing values: {self.missing_index.total()}"
+        if changes.structural:
+            self.group_key_spinner.values = [str(column) for column in self.df.columns]
+            if self.group_key_spinner.text not in self.group_key_spinner.values:
+                self.group_key_spinner.text = "Group by"
         return
     
     def monitor_change(self, thread, function):
@@ -189,9 +317,17 @@ class MLStarterkit(App):
             None
         '''
         if thread.is_alive():
-            Clock.schedule_once(lambda dt: self.monitor_change(thread, function), 1)
+            Clock.schedule_once(lambda dt: self.monitor_change(thread, function), 0.2)
         else:
             thread.join()
+            cancelled = self.load_cancel is not None and self.load_cancel.is_set()
+            self.load_cancel = None
+            if self.df is None:
+                self.load_button.text = "LOAD FILE"
+                self.load_button.disabled = False
+                self.loadreq.text = ("Loading cancelled." if cancelled
+                                     else "Could not load the selected file.")
+                return
             function()
         return
     
@@ -210,8 +346,7 @@ class MLStarterkit(App):
                                 pos_hint={'center_y': 0.5},
                                 halign='left')
         del(title)
-        self.file_shape = Label(text="Shape: "+str(self.df.shape)+
-                                " - Memory Size: "+str(round(self.df.memory_usage().sum() / 1024, 3))+" KB",
+        self.file_shape = Label(text=self.file_info_text(),
                                 color=MAIN_COLORS["GRAY"],
                                 font_family="Msyhl",
                                 font_size=14,
@@ -223,125 +358,156 @@ class MLStarterkit(App):
         self.layout.add_widget(self.file_boxlayout)
         return
     
+    def file_info_text(self):
+        '''
+        Returns the shape and memory size of the DataFrame.
+        Returns:
+            text (str): The text of the file info label.
+        '''
+        from Scripts.dtypes import memory_size
+        memory_text = " - Memory Size: "+str(round(memory_size(self.df) / 1024, 3))+" KB"
+        if self.memory_before is not None:
+            memory_text += " (was "+str(round(self.memory_before / 1024, 3))+" KB)"
+        return "Shape: "+str(self.df.shape)+memory_text
+
     def load_datagrid(self):
-        data_grid_layout = GridLayout(cols=len(self.df.columns) if len(self.df.columns) < 6 else 7,
-                                    spacing=5,
-                                    padding=(25,0),
-                                    size_hint_y=None)
-        data_grid_layout.bind(minimum_height=data_grid_layout.setter('height'))
-
-        # df.head() equivalent
-        for num, column in enumerate(self.df.columns):
-            if (num == 5) and (num != len(self.df.columns) - 1):
-                button = Button(text="...",
-                                color=MAIN_COLORS["COLOR"],
-                                height=30,
-                                font_family="Msyhl",
-                                font_size=14,
-                                background_normal="",
-                                background_down="",
-                                background_color=list(MAIN_COLORS.values())[num%(len(MAIN_COLORS)-2)],
-                                size_hint_y=None)
-                data_grid_layout.add_widget(button)
-            elif (num < 5) or (num == len(self.df.columns) - 1):
-                button = Button(text=column if len(column) < 7 else column[:7]+"...",
-                                color=MAIN_COLORS["COLOR"],
-                                height=30,
-                                font_family="Msyhl",
-                                font_size=14,
-                                background_normal="",
-                                background_down="",
-                                background_color=list(MAIN_COLORS.values())[num%(len(MAIN_COLORS)-2)],
-                                size_hint_y=None)
-                data_grid_layout.add_widget(button)
-
-        for i in range(5): # 5 rows only
-            for num, column in enumerate(self.df.columns):
-                if (num == 5) and (num != len(self.df.columns) - 1):
-                    button = Button(text="...",
-                                    color=MAIN_COLORS["COLOR"],
-                                    height=30,
-                                    font_family="Msyhl",
-                                    font_size=14,
-                                    background_normal="",
-                                    background_color=MAIN_COLORS["GRAY"],
-                                    size_hint_y=None)
-                    data_grid_layout.add_widget(button)
-                elif (num < 5) or (num == len(self.df.columns) - 1):
-                    value = str(self.df[column][i])
-                    button = Button(text=value if len(value) < 7 else str(value)[:7]+"...",
-                                color=MAIN_COLORS["COLOR"],
-                                height=30,
-                                font_family="Msyhl",
-                                font_size=14,
-                                background_normal="",
-                                background_color=MAIN_COLORS["GRAY"],
-                                size_hint_y=None)
-                    data_grid_layout.add_widget(button)
-        return data_grid_layout
+        '''
+        Builds the virtualized grid previewing the rows and columns of the DataFrame.
+        Returns:
+            data_grid_layout (DataGrid): The grid widget.
+        '''
+        from Scripts.datagrid import DataGrid
+        self.data_grid_layout = DataGrid(self.df, MAIN_COLORS,
+                                         list(MAIN_COLORS.values())[:len(MAIN_COLORS)-2])
+        return self.data_grid_layout
     
     def load_datainfo(self):
-        self.data_info_layout = BoxLayout(orientation='vertical', spacing=10, size_hint_y=None)
-        self.data_info_layout.bind(minimum_height=self.data_info_layout.setter('height'))
-
-        for index, column in enumerate(self.df.columns):
-            entry_layout = GridLayout(cols=4, spacing=10, padding=(25,0), size_hint_y=None)
-            entry_layout.bind(minimum_height=entry_layout.setter('height'))
-
-            index_column_label = Button(text=f"{index}. {column}",
-                        color=MAIN_COLORS["COLOR"],
-                        height=30,
-                        font_family="Msyhl",
-                        font_size=14,
-                        background_normal="",
-                        background_down="",
-                        background_color=list(MAIN_COLORS.values())[index%(len(MAIN_COLORS)-2)],
-                        size_hint_y=None)
-            entry_layout.add_widget(index_column_label)
-
-            non_null_count_label = Label(text=str(self.df[column].count()),
-                        color=MAIN_COLORS["COLOR"],
-                        height=30,
-                        font_family="Msyhl",
-                        font_size=14,
-                        size_hint_y=None)
-            entry_layout.add_widget(non_null_count_label)
-
-            data_type_label = Label(text=str(self.df[column].dtype),
-                        color=MAIN_COLORS["COLOR"],
-                        height=30,
-                        font_family="Msyhl",
-                        font_size=14,
-                        size_hint_y=None)
-            entry_layout.add_widget(data_type_label)
-
-            column_checkbox = CheckBox(color=MAIN_COLORS["GREEN"],
-                                size_hint=(0.2, None),
-                                height=30)
-            entry_layout.add_widget(column_checkbox)
-
-            self.data_info_layout.add_widget(entry_layout)
+        '''
+        Builds the recycled list of columns with their non-null count, dtype and checkbox.
+        Returns:
+            None
+        '''
+        from Scripts.datagrid import ColumnInfoView
+        self.data_info_layout = ColumnInfoView(self.df, MAIN_COLORS,
+                                               list(MAIN_COLORS.values())[:len(MAIN_COLORS)-2],
+                                               missing=self.missing_index)
         return
 
     def load_datadescription(self):
-        data_description_grid_layout = GridLayout(cols=9,
+        '''
+        Builds the data description grid and computes its statistics in the background.
+        Returns:
+            data_description_grid_layout (GridLayout): The grid, filled once the statistics are ready.
+        '''
+        from pandas import DataFrame
+        from Scripts.statistics import STATISTICS
+        self.data_description_grid_layout = GridLayout(cols=len(STATISTICS)+1,
                                                 spacing=5,
                                                 padding=(25,0),
                                                 size_hint_y=None)
-        data_description_grid_layout.bind(minimum_height=data_description_grid_layout.setter('height'))
+        self.data_description_grid_layout.bind(minimum_height=self.data_description_grid_layout.setter('height'))
 
-        for i in ['Name', 'Count', 'Mean', 'Std', 'Min', '25%', '50%', '75%', 'Max']:
+        for i in ['Name'] + STATISTICS:
             label = Label(text=i,
                         color=MAIN_COLORS["COLOR"],
                         height=30,
                         font_family="Msyhl",
                         font_size=14,
                         size_hint_y=None)
-            data_description_grid_layout.add_widget(label)    
+            self.data_description_grid_layout.add_widget(label)
+
+        self.statistics = DataFrame(columns=STATISTICS)
+        self.description_rows = {}
+        self.describe_data(self.df, self.df_version)
+        return self.data_description_grid_layout
 
-        for index, column in enumerate(self.df.columns):
-            if self.df[column].dtype not in ['int64', 'float64']:
-                continue
+    @thread
+    @measured("describe_data", lambda self, df, *args: df)
+    def describe_data(self, df, version, columns=None):
+        '''
+        Computes the summary statistics of the numeric columns off the UI thread.
+        Args:
+            df (pandas.DataFrame): The DataFrame to describe.
+            version (int): The version of the DataFrame being described.
+            columns (list): The columns to describe, all columns if None.
+        Returns:
+            None
+        '''
+        try:
+            from Scripts.statistics import describe
+            self.fill_datadescription(version, describe(df, columns))
+        except Exception as e:
+            print(e)
+        return
+
+    @thread
+    @measured("count_duplicates", lambda self, df, *args: df)
+    def count_duplicates(self, df, version, columns=None):
+        '''
+        Counts the duplicate rows off the UI thread, without removing them.
+        The rows are hashed once per version and columns, so removing the
+        duplicates afterwards reuses the count.
+        Args:
+            df (pandas.DataFrame): The DataFrame to count the duplicates of.
+            version (int): The version of the DataFrame.
+            columns (list): The columns compared, all columns if None or empty.
+        Returns:
+            None
+        '''
+        try:
+            from Scripts import duplicates
+            self.show_duplicates(version, columns, duplicates.count_duplicates(df, columns or None, version))
+        except Exception as e:
+            print(e)
+        return
+
+    @mainthread
+    def show_duplicates(self, version, columns, count):
+        '''
+        Shows the number of duplicates, unless the DataFrame changed since it was counted.
+        '''
+        if version != self.df_version:
+            return
+        if columns:
+            self.duplicates_label.text = f"Number of duplicates (selected columns): {count}"
+        else:
+            self.duplicates_label.text = f"Number of duplicates: {count}"
+        return
+
+    @mainthread
+    def fill_datadescription(self, version, statistics):
+        '''
+        Merges newly computed statistics into the data description grid.
+        The rows of unchanged columns are kept, the others are updated or rebuilt.
+        Args:
+            version (int): The version of the DataFrame the statistics were computed on.
+            statistics (pandas.DataFrame): The statistics returned by describe().
+        Returns:
+            None
+        '''
+        # The data changed while the statistics were being computed
+        if version != self.df_version:
+            return
+        from pandas import concat
+        from Scripts.dtypes import NUMERIC_DTYPES
+        from Scripts.statistics import STATISTICS
+        numeric_columns = self.df.select_dtypes(include=NUMERIC_DTYPES).columns
+        kept = self.statistics.drop(index=statistics.index, errors='ignore')
+        merged = concat([kept, statistics]) if len(kept) else statistics
+        self.statistics = merged.reindex(numeric_columns)
+
+        if list(self.description_rows) == list(numeric_columns):
+            for column, row in statistics.iterrows():
+                for label, statistic in zip(self.description_rows[column][1:], STATISTICS):
+                    label.text = self.statistic_text(statistic, row[statistic])
+            return
+
+        for widgets in self.description_rows.values():
+            for widget in widgets:
+                self.data_description_grid_layout.remove_widget(widget)
+        self.description_rows = {}
+        for column, row in self.statistics.iterrows():
+            index = self.df.columns.get_loc(column)
             button = Button(text=column if len(column) < 7 else column[:7]+"...",
                         color=MAIN_COLORS["COLOR"],
                         height=30,
@@ -352,73 +518,34 @@ class MLStarterkit(App):
                         background_normal="",
                         background_down="",
                         background_color=list(MAIN_COLORS.values())[index%(len(MAIN_COLORS)-2)])
-            data_description_grid_layout.add_widget(button)
-
-            count = Label(text=str(self.df[column].count()),
-                        color=MAIN_COLORS["COLOR"],
-                        height=30,
-                        font_family="Msyhl",
-                        font_size=14,
-                        size_hint_y=None)
-            
-            data_description_grid_layout.add_widget(count)
-
-            mean = Label(text=str(round(self.df[column].mean(), 3)),
-                        color=MAIN_COLORS["COLOR"],
-                        height=30,
-                        font_family="Msyhl",
-                        font_size=14,
-                        size_hint_y=None)
-            data_description_grid_layout.add_widget(mean)
-
-            std = Label(text=str(round(self.df[column].std(), 3)),
-                        color=MAIN_COLORS["COLOR"],
-                        height=30,
-                        font_family="Msyhl",
-                        font_size=14,
-                        size_hint_y=None)
-            data_description_grid_layout.add_widget(std)
-
-            min_val = Label(text=str(round(self.df[column].min(), 3)),
-                        color=MAIN_COLORS["COLOR"],
-                        height=30,
-                        font_family="Msyhl",
-                        font_size=14,
-                        size_hint_y=None)
-            data_description_grid_layout.add_widget(min_val)
-
-            quantile_25 = Label(text=str(round(self.df[column].quantile(0.25), 3)),
-                        color=MAIN_COLORS["COLOR"],
-                        height=30,
-                        font_family="Msyhl",
-                        font_size=14,
-                        size_hint_y=None)
-            data_description_grid_layout.add_widget(quantile_25)
-
-            quantile_50 = Label(text=str(round(self.df[column].quantile(0.5), 3)),
-                        color=MAIN_COLORS["COLOR"],
-                        height=30,
-                        font_family="Msyhl",
-                        font_size=14,
-                        size_hint_y=None)
-            data_description_grid_layout.add_widget(quantile_50)
-
-            quantile_75 = Label(text=str(round(self.df[column].quantile(0.75), 3)),
-                        color=MAIN_COLORS["COLOR"],
-                        height=30,
-                        font_family="Msyhl",
-                        font_size=14,
-                        size_hint_y=None)
-            data_description_grid_layout.add_widget(quantile_75)
+            self.data_description_grid_layout.add_widget(button)
+            self.description_rows[column] = [button]
+
+            for statistic in STATISTICS:
+                label = Label(text=self.statistic_text(statistic, row[statistic]),
+                            color=MAIN_COLORS["COLOR"],
+                            height=30,
+                            font_family="Msyhl",
+                            font_size=14,
+                            size_hint_y=None)
+                self.data_description_grid_layout.add_widget(label)
+                self.description_rows[column].append(label)
+        return
 
-            max_val = Label(text=str(round(self.df[column].max(), 3)),
-                        color=MAIN_COLORS["COLOR"],
-                        height=30,
-                        font_family="Msyhl",
-                        font_size=14,
-                        size_hint_y=None)
-            data_description_grid_layout.add_widget(max_val)
-        return data_description_grid_layout
+    def statistic_text(self, statistic, value):
+        '''
+        Formats a statistic for the data description grid.
+        Args:
+            statistic (str): The name of the statistic.
+            value (float): The value of the statistic.
+        Returns:
+            text (str): The formatted value.
+        '''
+        if value != value:
+            return "nan"
+        if statistic in ['Count', 'Distinct']:
+            return str(int(value))
+        return str(round(value, 3))
 
     def load_dropcols(self):
         drop_columns_label = Label(text="Drop selected columns (selecting none will do nothing).",
@@ -441,12 +568,15 @@ class MLStarterkit(App):
         return drop_columns_label, drop_columns_button
     
     def load_dupna(self):
-        duplicates_label = Label(text=f"Number of duplicates: {self.df.duplicated().sum()}",
+        self.duplicates_label = Label(text="Number of duplicates: counting...",
                                 color=MAIN_COLORS["COLOR"],
                                 font_family="Msyhl",
                                 font_size=14,
                                 size_hint=(0.9, 0.1),
                                 pos_hint={'center_x': 0.5, 'center_y': 0.5})
+        self.count_duplicates(self.df, self.df_version)
+
+        duplicates_box_layout = BoxLayout(orientation='horizontal', spacing=10, padding=(25,0), size_hint=(1, None), height=30)
 
         remove_duplicates_button = Button(text="REMOVE DUPLICATES",
                                 bold=True,
@@ -456,9 +586,22 @@ class MLStarterkit(App):
                                 pos_hint={'center_x': 0.5, 'center_y': 0.5},
                                 background_normal="",
                                 background_color=MAIN_COLORS["GREEN"])
-        remove_duplicates_button.bind(on_release=lambda x: self.remove_duplicates(duplicates_label, self.get_labels()))
+        remove_duplicates_button.bind(on_release=lambda x: self.remove_duplicates(self.duplicates_label, self.get_labels()))
+
+        # Counts the duplicates of the selected columns without removing them
+        count_duplicates_button = Button(text="COUNT DUPLICATES",
+                                bold=True,
+                                font_size=14,
+                                height=30,
+                                size_hint=(0.5, None),
+                                pos_hint={'center_x': 0.5, 'center_y': 0.5},
+                                background_normal="",
+                                background_color=MAIN_COLORS["GREEN"])
+        count_duplicates_button.bind(on_release=lambda x: self.count_duplicates(self.df, self.df_version, self.get_labels()))
+        duplicates_box_layout.add_widget(remove_duplicates_button)
+        duplicates_box_layout.add_widget(count_duplicates_button)
 
-        self.missing_values_label = Label(text=f"Number of missing values: {self.df.isnull().sum().sum()}",
+        self.missing_values_label = Label(text=f"Number of missing values: {self.missing_index.total()}",
                                 color=MAIN_COLORS["COLOR"],
                                 font_family="Msyhl",
                                 font_size=14,
@@ -508,7 +651,29 @@ class MLStarterkit(App):
                        background_normal="",
                        background_color=MAIN_COLORS["GREEN"])
         remove_button.bind(on_release=lambda x: self.handle_missing_values('remove', self.missing_values_label, self.get_labels()))
-        return duplicates_label, remove_duplicates_button, mean_button,\
+
+        # Model-based imputation of the numeric columns, the group methods use the column chosen in the spinner
+        self.imputation_box_layout = BoxLayout(orientation='horizontal', spacing=10, padding=(25,0), size_hint=(1, None), height=30)
+        self.group_key_spinner = Spinner(text="Group by",
+                                         values=[str(column) for column in self.df.columns],
+                                         font_size=14,
+                                         height=30,
+                                         size_hint=(0.5, None),
+                                         background_normal="",
+                                         background_color=MAIN_COLORS["GRAY"])
+        self.imputation_box_layout.add_widget(self.group_key_spinner)
+        for text, method in [("Group Mean", 'group mean'), ("Group Median", 'group median'),
+                             ("KNN Impute", 'knn'), ("Iterative Impute", 'iterative')]:
+            imputation_button = Button(text=text,
+                                       bold=True,
+                                       height=30,
+                                       size_hint=(0.5, None),
+                                       font_size=14,
+                                       background_normal="",
+                                       background_color=MAIN_COLORS["GREEN"])
+            imputation_button.bind(on_release=lambda x, method=method: self.handle_missing_values(method, self.missing_values_label, self.get_labels()))
+            self.imputation_box_layout.add_widget(imputation_button)
+        return self.duplicates_label, duplicates_box_layout, mean_button,\
             median_button, mode_button, remove_button
     
     def load_transformations(self):
@@ -536,6 +701,133 @@ class MLStarterkit(App):
                                                             height=30,
                                                             group=label[-1]))
             self.transformation_vertical_grid_layout.add_widget(data_transformation_box_layout)
+
+        self.pipeline_box_layout = BoxLayout(orientation='horizontal', spacing=10, padding=(25,0), size_hint_y=None, height=30)
+        save_pipeline_button = Button(text="Save Pipeline",
+                                      bold=True,
+                                      height=30,
+                                      size_hint=(0.5, None),
+                                      font_size=14,
+                                      background_normal="",
+                                      background_color=MAIN_COLORS["GREEN"])
+        save_pipeline_button.bind(on_release=lambda x: self.save_pipeline())
+        apply_pipeline_button = Button(text="Apply Pipeline to Folder",
+                                       bold=True,
+                                       height=30,
+                                       size_hint=(0.5, None),
+                                       font_size=14,
+                                       background_normal="",
+                                       background_color=MAIN_COLORS["GREEN"])
+        apply_pipeline_button.bind(on_release=lambda x: self.apply_pipeline())
+        self.pipeline_box_layout.add_widget(save_pipeline_button)
+        self.pipeline_box_layout.add_widget(apply_pipeline_button)
+
+        # Streams the loaded file through the transformations instead of transforming the data in memory
+        self.out_of_core_box_layout = BoxLayout(orientation='horizontal', spacing=10, size_hint=(1, None), height=30)
+        self.out_of_core_box_layout.add_widget(Label(text="Out-of-core (stream the file to a new CSV file)",
+                                                     color=MAIN_COLORS["COLOR"],
+                                                     font_family="Msyhl",
+                                                     font_size=14,
+                                                     size_hint=(0.8, None),
+                                                     height=30))
+        self.out_of_core_checkbox = CheckBox(color=MAIN_COLORS["GREEN"],
+                                             size_hint=(0.2, None),
+                                             height=30)
+        self.out_of_core_box_layout.add_widget(self.out_of_core_checkbox)
+        return
+
+    def transform_file_out_of_core(self, transformations, columns):
+        '''
+        Transforms the loaded file chunk by chunk into a new CSV file, as a background job.
+        The data in memory is left unchanged, the fitted pipeline is kept.
+        Args:
+            transformations (list): The transformation types.
+            columns (list): The columns to be transformed, all the columns if empty.
+        Returns:
+            None
+        '''
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        filename = f"{self.file_path.split('/')[-1].split('.')[0]}_transformed_{timestamp}.csv"
+        output_path = filedialog.asksaveasfilename(defaultextension='.csv',
+                                                   filetypes=[("CSV files", "*.csv")],
+                                                   initialfile=filename)
+        if not output_path:
+            return
+        file_path = self.file_path
+
+        def transform(job):
+            from Scripts.transformation import transform_out_of_core
+            return transform_out_of_core(file_path, output_path, transformations, columns,
+                                         progress=lambda done, total: job.report(done / total, "Streaming"),
+                                         cancel=job.cancel_event)
+
+        def done(job):
+            self.update_job_progress(job)
+            if job.status == "failed":
+                popup(type='failure', text=job.error)
+            elif job.status == "done" and job.result() is not None:
+                self.pipeline = job.result()
+                popup(type='success')
+
+        self.executor.submit("Transform file", transform,
+                             on_progress=self.update_job_progress, on_done=done, background=True)
+        return
+
+    def save_pipeline(self):
+        '''
+        Saves the transformation pipeline fitted by the last operation to a file.
+        Returns:
+            None
+        '''
+        if self.pipeline is None:
+            popup(type='failure', text="No fitted pipeline")
+            return
+        save_location = filedialog.asksaveasfilename(defaultextension='.pkl',
+                                                     filetypes=[("Pipeline files", "*.pkl"),
+                                                                ("All files", "*.*")],
+                                                     initialfile="pipeline.pkl")
+        if save_location:
+            self.pipeline.save(save_location)
+            popup(type='success')
+        return
+
+    def apply_pipeline(self):
+        '''
+        Applies the fitted (or a saved) transformation pipeline to every file of a folder,
+        as a background job. The transformed files are saved as CSV files in another folder.
+        Returns:
+            None
+        '''
+        pipeline = self.pipeline
+        if pipeline is None:
+            pipeline_file = filedialog.askopenfilename(title="Select a Saved Pipeline",
+                                                       filetypes=[("Pipeline files", "*.pkl")])
+            if not pipeline_file:
+                return
+            from Scripts.transformation import TransformationPipeline
+            pipeline = TransformationPipeline.load(pipeline_file)
+        input_folder = filedialog.askdirectory(title="Select Folder of Files to Transform")
+        if not input_folder:
+            return
+        output_folder = filedialog.askdirectory(title="Select Folder to Save Transformed Files")
+        if not output_folder:
+            return
+
+        def transform_folder(job):
+            return pipeline.transform_directory(input_folder, output_folder,
+                                                progress=lambda done, total: job.report(
+                                                    done / total, f"{done}/{total} files"),
+                                                cancel=job.cancel_event)
+
+        def done(job):
+            self.update_job_progress(job)
+            if job.status == "failed":
+                popup(type='failure', text=job.error)
+            elif job.status == "done":
+                popup(type='success')
+
+        self.executor.submit("Apply pipeline", transform_folder,
+                             on_progress=self.update_job_progress, on_done=done, background=True)
         return
     
     def load_visualizations(self):
@@ -559,11 +851,55 @@ class MLStarterkit(App):
                                                             size_hint=(0.2, None),
                                                             height=30))
             self.visualization_vertical_grid_layout.add_widget(data_visualization_box_layout)
+
+        # Output of the Scatter/Line/Bar plots of the column pairs
+        output_labels = ['Separate PNGs', 'Scatter Matrix', 'Multi-page PDF', 'Downsample (10k pts)']
+        self.visualization_output_grid_layout = GridLayout(cols=2,
+                                                       spacing=10,
+                                                       size_hint=(1, None))
+        self.visualization_output_grid_layout.bind(minimum_height=self.visualization_output_grid_layout.setter('height'))
+        for label in output_labels:
+            output_box_layout = BoxLayout(orientation='horizontal', spacing=10, size_hint=(1, None), height=30)
+            output_box_layout.add_widget(Label(text=label,
+                                               color=MAIN_COLORS["COLOR"],
+                                               font_family="Msyhl",
+                                               font_size=14,
+                                               size_hint=(0.8, None),
+                                               height=30))
+            output_box_layout.add_widget(CheckBox(color=MAIN_COLORS["GREEN"],
+                                                  size_hint=(0.2, None),
+                                                  height=30,
+                                                  active=label == 'Separate PNGs',
+                                                  group=None if label.startswith('Downsample') else 'output'))
+            self.visualization_output_grid_layout.add_widget(output_box_layout)
         return
 
+    def get_visualization_output(self):
+        '''
+        Returns the output mode of the pair plots and the maximum number of points drawn.
+        Returns:
+            output_mode (str): 'separate', 'matrix' or 'pdf'.
+            max_points (int): The maximum number of points per pair plot, None for all.
+        '''
+        output_modes = {'Separate PNGs': 'separate', 'Scatter Matrix': 'matrix', 'Multi-page PDF': 'pdf'}
+        output_mode, max_points = 'separate', None
+        for child in self.visualization_output_grid_layout.children:
+            checkbox = child.children[0]
+            label = child.children[-1].text
+            if checkbox.active and label in output_modes:
+                output_mode = output_modes[label]
+            elif checkbox.active:
+                max_points = DOWNSAMPLE_POINTS
+        return output_mode, max_points
+
+    @measured("load_view", lambda self: self.df)
     def load_view(self):
+        from Scripts.missing import MissingValueIndex
+        self.df_version += 1
+        self.missing_index = MissingValueIndex(self.df)
         self.loadreq.text = ""
         self.load_button.text = "FILE LOADED"
+        self.load_button.disabled = True
         self.load_filebox()
         
         vertical_box_layout = BoxLayout(orientation='vertical', spacing=30, padding=(0,10), size_hint_y=None)
@@ -611,14 +947,14 @@ class MLStarterkit(App):
         
         dropcol_label, dropcol_button = self.load_dropcols()
 
-        duplicates_label, remove_duplicates_button, mean_button, \
+        duplicates_label, duplicates_box_layout, mean_button, \
             median_button, mode_button, remove_button = self.load_dupna()
         
         for widget in [mean_button, median_button, mode_button, remove_button]:
             self.button_box_layout.add_widget(widget)
         
-        for widget in [dropcol_label, dropcol_button, duplicates_label, remove_duplicates_button,
-                       self.missing_values_label, self.button_box_layout]:
+        for widget in [dropcol_label, dropcol_button, duplicates_label, duplicates_box_layout,
+                       self.missing_values_label, self.button_box_layout, self.imputation_box_layout]:
             vertical_box_layout.add_widget(widget)
         
         # Data Transformation
@@ -632,6 +968,8 @@ class MLStarterkit(App):
 
         self.load_transformations()
         vertical_box_layout.add_widget(self.transformation_vertical_grid_layout)
+        vertical_box_layout.add_widget(self.out_of_core_box_layout)
+        vertical_box_layout.add_widget(self.pipeline_box_layout)
 
         # Data Visualization
         data_visualization_label = Label(text="Data Visualization",
@@ -644,6 +982,7 @@ class MLStarterkit(App):
 
         self.load_visualizations()
         vertical_box_layout.add_widget(self.visualization_vertical_grid_layout)
+        vertical_box_layout.add_widget(self.visualization_output_grid_layout)
 
         self.scroll_layout.add_widget(vertical_box_layout)
         self.layout.add_widget(self.scroll_layout)
@@ -652,7 +991,7 @@ class MLStarterkit(App):
         
         perform_button = Button(text="PERFORM OPERATION(S)",
             bold=True,
-            size_hint=(0.7, 1),
+            size_hint=(0.35, 1),
             font_size=14,
             pos_hint={'center_x': 0.5},
             background_normal="",
@@ -660,38 +999,420 @@ class MLStarterkit(App):
         perform_button.bind(on_release=lambda x: self.perform_operations())
         self.button_box_layout.add_widget(perform_button)
 
-        save_button = Button(text="SAVE CSV FILE",
+        self.undo_button = Button(text="UNDO",
+            bold=True,
+            size_hint=(0.1, 1),
+            font_size=14,
+            pos_hint={'center_x': 0.5},
+            disabled=True,
+            background_normal="",
+            background_color=MAIN_COLORS["YELLOW"])
+        self.undo_button.bind(on_release=lambda x: self.undo())
+        self.button_box_layout.add_widget(self.undo_button)
+
+        self.redo_button = Button(text="REDO",
+            bold=True,
+            size_hint=(0.1, 1),
+            font_size=14,
+            pos_hint={'center_x': 0.5},
+            disabled=True,
+            background_normal="",
+            background_color=MAIN_COLORS["YELLOW"])
+        self.redo_button.bind(on_release=lambda x: self.redo())
+        self.button_box_layout.add_widget(self.redo_button)
+
+        self.jobs_button = Button(text="JOBS",
+            bold=True,
+            size_hint=(0.15, 1),
+            font_size=14,
+            pos_hint={'center_x': 0.5},
+            background_normal="",
+            background_color=MAIN_COLORS["BLUE"])
+        self.jobs_button.bind(on_release=lambda x: self.open_jobs_panel())
+        self.button_box_layout.add_widget(self.jobs_button)
+
+        performance_button = Button(text="PERF",
+            bold=True,
+            size_hint=(0.1, 1),
+            font_size=14,
+            pos_hint={'center_x': 0.5},
+            background_normal="",
+            background_color=MAIN_COLORS["BLUE"])
+        performance_button.bind(on_release=lambda x: self.open_performance_panel())
+        self.button_box_layout.add_widget(performance_button)
+
+        save_button = Button(text="SAVE FILE",
             bold=True,
-            size_hint=(0.3, 1),
+            size_hint=(0.2, 1),
             font_size=14,
             pos_hint={'center_x': 0.5},
             background_normal="",
             background_color=MAIN_COLORS["GREEN"])
-        save_button.bind(on_release=lambda x: self.save_csv_file())
+        save_button.bind(on_release=lambda x: self.save_file())
         self.button_box_layout.add_widget(save_button)
 
         self.layout.add_widget(self.button_box_layout)
         return
 
-    def save_csv_file(self):
+    def save_file(self):
+        '''
+        Opens a popup to choose the format of the saved file: CSV, compressed CSV,
+        Parquet (optionally partitioned by a column) or Feather.
+        Returns:
+            None
+        '''
+        from Scripts.export import available_formats, EXPORT_FORMATS
+        formats = {EXPORT_FORMATS[file_format]: file_format for file_format in available_formats()}
+        no_partition = "No partitioning"
+        content = BoxLayout(orientation='vertical', spacing=10, padding=10)
+        format_spinner = Spinner(text=EXPORT_FORMATS['csv'],
+                                 values=list(formats),
+                                 font_size=14,
+                                 height=30,
+                                 size_hint=(1, None),
+                                 background_normal="",
+                                 background_color=MAIN_COLORS["GRAY"])
+        content.add_widget(format_spinner)
+        partition_spinner = Spinner(text=no_partition,
+                                    values=[no_partition] + [str(column) for column in self.df.columns],
+                                    font_size=14,
+                                    height=30,
+                                    size_hint=(1, None),
+                                    disabled=True,
+                                    background_normal="",
+                                    background_color=MAIN_COLORS["GRAY"])
+        content.add_widget(partition_spinner)
+
+        def choose_format(instance, text):
+            # Only Parquet files are partitioned, into a folder of files per value of the column
+            partition_spinner.disabled = formats[text] != 'parquet'
+            if partition_spinner.disabled:
+                partition_spinner.text = no_partition
+        format_spinner.bind(text=choose_format)
+
+        save_popup = Popup(title='SAVE FILE',
+                           content=content,
+                           size_hint=(None, None), size=(400, 220),
+                           separator_color=MAIN_COLORS["GREEN"],
+                           title_align='center')
+        button_box_layout = BoxLayout(orientation='horizontal', spacing=10, size_hint=(1, None), height=30)
+        for text, color in [("SAVE", "GREEN"), ("CANCEL", "RED")]:
+            button = Button(text=text,
+                            bold=True,
+                            font_size=14,
+                            height=30,
+                            size_hint=(0.5, None),
+                            background_normal="",
+                            background_color=MAIN_COLORS[color])
+
+            def choose(instance, save=text == "SAVE"):
+                save_popup.dismiss()
+                if save:
+                    partition = None if partition_spinner.text == no_partition else partition_spinner.text
+                    self.export_file(formats[format_spinner.text], partition)
+            button.bind(on_release=choose)
+            button_box_layout.add_widget(button)
+        content.add_widget(button_box_layout)
+        save_popup.open()
+        return
+
+    def export_file(self, file_format, partition_column=None):
+        '''
+        Asks where to save the DataFrame, then writes it as a background job,
+        in chunks with progress for the CSV and Parquet files.
+        Args:
+            file_format (str): The format, one of EXPORT_FORMATS.
+            partition_column (str): The column the Parquet files are partitioned by, None for a single file.
+        Returns:
+            None
+        '''
+        from Scripts.export import export, EXPORT_FORMATS
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        filename = f"{self.file_path.split('/')[-1].split('.')[0]}_{timestamp}.{file_format}"
+        # Open file dialog to choose save location
+        save_location = filedialog.asksaveasfilename(defaultextension=f'.{file_format}',
+                                                     filetypes=[(f"{EXPORT_FORMATS[file_format]} files",
+                                                                 f"*.{file_format}"),
+                                                                ("All files", "*.*")],
+                                                     initialfile=filename)
+        if not save_location:
+            print("Save operation cancelled.")
+            return
+        if not save_location.lower().endswith(f'.{file_format}'):
+            save_location += f'.{file_format}'
+
+        def operation(job, df):
+            job.report(0, "Saving")
+            completed = export(df, save_location, file_format, partition_column,
+                               progress=lambda done, total: job.report(done / total if total else 1,
+                                                                       f"{done:,}/{total:,} rows"),
+                               cancel=job.cancel_event)
+            if not completed:
+                return None
+            print(f"File saved successfully as {save_location}.")
+            return True
+
+        self.run_operation(f"Save {EXPORT_FORMATS[file_format]}", operation, background=True)
+        return
+
+    def run_operation(self, name, function, *args, on_commit=None, background=False):
+        '''
+        Runs a data operation as a background job.
+        The function is called as function(job, df, *args) and must not modify df.
+        Its run is measured by the profiler.
+        It returns the Delta of the operation, which is then applied to the DataFrame
+        on the main thread and recorded in the history, True if it succeeded without
+        changing the data, or None.
+        Args:
+            name (str): The name of the operation.
+            function (callable): The operation to run.
+            on_commit (callable): Optional callback called on the main thread once the operation succeeded.
+            background (bool): Whether the operation runs in the background lane of the executor,
+                for the long ones like exports.
+        Returns:
+            job (Job): The submitted job, None if another operation is running.
+        '''
+        if self.data_job is not None and self.data_job.is_alive():
+            popup(type='failure', text="Another operation is running")
+            return None
+
+        def measured_function(job, df, *args):
+            with self.profiler.measure(name, df):
+                return function(job, df, *args)
+
+        self.data_job = self.executor.submit(name, measured_function, self.df, *args,
+                                             on_progress=self.update_job_progress,
+                                             on_done=lambda job: self.finish_operation(job, on_commit),
+                                             background=background)
+        self.update_job_progress(self.data_job)
+        return self.data_job
+
+    def finish_operation(self, job, on_commit=None):
+        '''
+        Commits the result of a data operation once its job is done (main thread).
+        Args:
+            job (Job): The job of the operation.
+            on_commit (callable): Optional callback called once the operation succeeded.
+        Returns:
+            None
+        '''
+        self.update_job_progress(job)
+        if job.status == "cancelled":
+            return
+        if job.error is not None:
+            popup(type='failure', text=job.error)
+            print(job.error)
+            return
+        delta = job.result()
+        if delta is None:
+            return
+        if on_commit is not None:
+            on_commit()
+        popup(type='success')
+        if delta is True:
+            return
+        self.df = delta.redo(self.df)
+        self.history.push(delta)
+        self.update_history_buttons()
+        self.refresh_scrollview(delta.changes())
+        return
+
+    def undo(self):
+        '''
+        Reverts the last operation on the DataFrame.
+        Returns:
+            None
+        '''
+        self.move_in_history(self.history.undo, undo=True)
+        return
+
+    def redo(self):
+        '''
+        Applies the last reverted operation again.
+        Returns:
+            None
+        '''
+        self.move_in_history(self.history.redo, undo=False)
+        return
+
+    def move_in_history(self, move, undo):
+        '''
+        Undoes or redoes an operation and refreshes the columns it changed.
+        Args:
+            move (callable): History.undo or History.redo.
+            undo (bool): Whether the operation is reverted.
+        Returns:
+            None
+        '''
+        if self.data_job is not None and self.data_job.is_alive():
+            popup(type='failure', text="An operation is running")
+            return
+        self.df, delta = move(self.df)
+        if delta is None:
+            return
+        self.update_history_buttons()
+        self.refresh_scrollview(delta.changes(undo))
+        return
+
+    def update_history_buttons(self):
+        '''
+        Enables the undo/redo buttons when there is an operation to undo/redo.
+        Returns:
+            None
+        '''
+        self.undo_button.disabled = not self.history.can_undo()
+        self.redo_button.disabled = not self.history.can_redo()
+        return
+
+    def update_job_progress(self, job):
+        '''
+        Shows the number of running jobs and the progress of the current operation.
+        Args:
+            job (Job): The job reporting progress.
+        Returns:
+            None
+        '''
+        active_jobs = self.executor.active_jobs()
+        text = f"JOBS ({len(active_jobs)})" if active_jobs else "JOBS"
+        if self.data_job is not None and self.data_job.is_alive():
+            text += f" {self.data_job.progress:.0%}"
+        self.jobs_button.text = text
+        return
+
+    def open_jobs_panel(self):
+        '''
+        Opens a popup listing the recent jobs with their status, progress and a cancel button.
+        Returns:
+            None
+        '''
+        jobs_layout = GridLayout(cols=4, spacing=5, padding=10, size_hint_y=None)
+        jobs_layout.bind(minimum_height=jobs_layout.setter('height'))
+        jobs_scrollview = ScrollView(bar_color=MAIN_COLORS["GREEN"],
+                                     bar_inactive_color=MAIN_COLORS["GRAY"],
+                                     bar_width=10)
+        jobs_scrollview.add_widget(jobs_layout)
+        jobs_popup = Popup(title='JOBS',
+                           content=jobs_scrollview,
+                           size_hint=(None, None), size=(500, 400),
+                           separator_color=MAIN_COLORS["GREEN"],
+                           title_align='center')
+
+        def refresh(dt=None):
+            jobs_layout.clear_widgets()
+            for job in reversed(self.executor.jobs):
+                for text in [job.name, job.status,
+                             f"{job.progress:.0%} {job.message}"[:20]]:
+                    jobs_layout.add_widget(Label(text=text,
+                                                 font_family="Msyhl",
+                                                 font_size=14,
+                                                 height=30,
+                                                 size_hint_y=None))
+                cancel_button = Button(text="CANCEL",
+                                       bold=True,
+                                       font_size=14,
+                                       height=30,
+                                       size_hint_y=None,
+                                       disabled=not job.is_alive(),
+                                       background_normal="",
+                                       background_color=MAIN_COLORS["RED"])
+                cancel_button.bind(on_release=lambda x, job=job: job.cancel())
+                jobs_layout.add_widget(cancel_button)
+
+        refresh()
+        event = Clock.schedule_interval(refresh, 0.5)
+        jobs_popup.bind(on_dismiss=lambda x: event.cancel())
+        jobs_popup.open()
+        return
+
+    def open_performance_panel(self):
+        '''
+        Opens a popup listing the measured operations, most recent first, with their
+        wall and CPU time, the rows and columns processed and the memory delta.
+        The cProfile dumps can be turned on, and the records exported as a JSON Lines log.
+        Returns:
+            None
+        '''
+        content = BoxLayout(orientation='vertical', spacing=10, padding=10)
+        records_layout = GridLayout(cols=5, spacing=5, size_hint_y=None)
+        records_layout.bind(minimum_height=records_layout.setter('height'))
+        records_scrollview = ScrollView(bar_color=MAIN_COLORS["GREEN"],
+                                        bar_inactive_color=MAIN_COLORS["GRAY"],
+                                        bar_width=10)
+        records_scrollview.add_widget(records_layout)
+        content.add_widget(records_scrollview)
+        performance_popup = Popup(title='PERFORMANCE',
+                                  content=content,
+                                  size_hint=(None, None), size=(650, 450),
+                                  separator_color=MAIN_COLORS["GREEN"],
+                                  title_align='center')
+
+        def refresh(dt=None):
+            records_layout.clear_widgets()
+            rows = [("Operation", "Wall (s)", "CPU (s)", "Rows x cols", "Memory (MB)")]
+            for record in reversed(self.profiler.snapshot()):
+                shape = f"{record['rows']:,} x {record['columns']}" if 'rows' in record else ""
+                memory = f"{record['memory_delta'] / 1024 ** 2:+.1f}" if 'memory_delta' in record else ""
+                name = record['name'] + (" (failed)" if 'error' in record else "")
+                rows.append((name[:24], f"{record['wall_seconds']:.3f}",
+                             f"{record['cpu_seconds']:.3f}" if record['cpu_seconds'] is not None else "",
+                             shape, memory))
+            for row in rows:
+                for text in row:
+                    records_layout.add_widget(Label(text=text,
+                                                    font_family="Msyhl",
+                                                    font_size=13,
+                                                    height=25,
+                                                    size_hint_y=None))
+
+        controls_box_layout = BoxLayout(orientation='horizontal', spacing=10, size_hint=(1, None), height=30)
+        profile_checkbox = CheckBox(color=MAIN_COLORS["GREEN"],
+                                    size_hint=(0.1, 1),
+                                    active=self.profiler.profiling)
+        profile_checkbox.bind(active=lambda instance, value: setattr(self.profiler, 'profiling', value))
+        controls_box_layout.add_widget(profile_checkbox)
+        controls_box_layout.add_widget(Label(text="cProfile dumps",
+                                             font_family="Msyhl",
+                                             font_size=14,
+                                             size_hint=(0.3, 1)))
+        export_button = Button(text="EXPORT LOG",
+                               bold=True,
+                               font_size=14,
+                               size_hint=(0.35, 1),
+                               background_normal="",
+                               background_color=MAIN_COLORS["GREEN"])
+        export_button.bind(on_release=lambda x: self.export_performance_log())
+        controls_box_layout.add_widget(export_button)
+        clear_button = Button(text="CLEAR",
+                              bold=True,
+                              font_size=14,
+                              size_hint=(0.25, 1),
+                              background_normal="",
+                              background_color=MAIN_COLORS["RED"])
+        clear_button.bind(on_release=lambda x: (self.profiler.clear(), refresh()))
+        controls_box_layout.add_widget(clear_button)
+        content.add_widget(controls_box_layout)
+
+        refresh()
+        event = Clock.schedule_interval(refresh, 1)
+        performance_popup.bind(on_dismiss=lambda x: event.cancel())
+        performance_popup.open()
+        return
+
+    def export_performance_log(self):
         '''
-        Saves the DataFrame to a CSV file.
+        Saves the performance records to a JSON Lines file, one record per line.
         Returns:
             None
         '''
         try:
             timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            filename = f"{self.file_path.split('/')[-1].split('.')[0]}_{timestamp}.csv"
-            # Open file dialog to choose save location
-            save_location = filedialog.asksaveasfilename(defaultextension='.csv',
-                                                        filetypes=[("CSV files", "*.csv"),
+            save_location = filedialog.asksaveasfilename(defaultextension='.jsonl',
+                                                         filetypes=[("JSON Lines files", "*.jsonl"),
                                                                     ("All files", "*.*")],
-                                                        initialfile=filename)
+                                                         initialfile=f"performance_{timestamp}.jsonl")
             if save_location:
-                self.df.to_csv(save_location, index=False)
-                print(f"File saved successfully as {save_location}.")
-            else:
-                print("Save operation cancelled.")
+                count = self.profiler.export(save_location)
+                print(f"{count} performance records saved as {save_location}.")
         except Exception as e:
             print(e)
         return
@@ -700,21 +1421,21 @@ class MLStarterkit(App):
         '''
         Removes duplicate rows from a DataFrame based on the specified columns.
         Args:
-            label (Label): The label widget to update with the number of duplicates.
+            label (Label): The label widget updated with the number of duplicates once done.
             columns (list): The list of columns to consider for duplicate removal.
         Returns:
             None
         '''
         if columns == []:
-            columns = self.df.columns
-        try:
-            self.df.drop_duplicates(subset=columns, inplace=True)
-            label.text = f"Number of Duplicates: {self.df.duplicated().sum()}"
-            popup(type='success')
-            self.refresh_scrollview()
-        except Exception as e:
-            popup(type='failure', text=e)
-            print(e)
+            columns = list(self.df.columns)
+        # The rows were hashed by the last count of the same columns of this version
+        version = self.df_version
+
+        def operation(job, df):
+            from Scripts import operations
+            return operations.remove_duplicates(df, columns, version)
+
+        self.run_operation("Remove duplicates", operation)
         return
 
     def handle_missing_values(self, method, label, columns):
@@ -722,45 +1443,45 @@ class MLStarterkit(App):
         Handles missing values in a DataFrame based on the selected method and specified columns.
         Args:
             method (str): The method to use for handling missing values.
-            label: The label to update with the number of missing values.
+            label: The label updated with the number of missing values once done.
             columns (list): The list of columns to consider for missing value handling.
         Returns:
             None
         '''
         if columns == []:
-            columns = self.df.columns
-        try:
-            if method == 'mean':
-                numeric_columns = self.df[columns].select_dtypes(include=['float64', 'int64']).columns
-                self.df[numeric_columns] = self.df[numeric_columns].fillna(self.df[numeric_columns].mean())
-            elif method == 'median':
-                numeric_columns = self.df[columns].select_dtypes(include=['float64', 'int64']).columns
-                self.df[numeric_columns] = self.df[numeric_columns].fillna(self.df[numeric_columns].median())
-            elif method == 'mode':
-                self.df[columns] = self.df[columns].fillna(self.df[columns].mode().iloc[0])
-            elif method == 'remove':
-                self.df.dropna(subset=columns, inplace=True)
-            label.text = f"Number of Missing Values: {self.df[columns].isnull().sum().sum()}"
-            
-            popup(type='success')
-            self.refresh_scrollview()
-        except Exception as e:
-            popup(type='failure', text=e)
-            print(e)
+            columns = list(self.df.columns)
+        # The null masks and fill values of the unchanged columns are reused
+        index = self.missing_index
+        key = self.group_key()
+        if method in ['group mean', 'group median'] and key is None:
+            popup(type='failure', text="Choose the column to group by")
+            return
+
+        def operation(job, df):
+            from Scripts import operations
+            return operations.handle_missing_values(df, method, columns, index, key,
+                                                    progress=lambda done, total: job.report(done / total, "Filling"),
+                                                    cancel=job.cancel_event)
+
+        self.run_operation(f"Fill missing ({method})", operation)
         return
 
+    def group_key(self):
+        '''
+        Returns the column chosen to group the rows by for the group imputation, None if there is none.
+        '''
+        for column in self.df.columns:
+            if str(column) == self.group_key_spinner.text:
+                return column
+        return None
+
     def get_labels(self):
         '''
-        Performs the selected operation based on the checkboxes in the UI.
+        Returns the columns selected with the checkboxes in the UI.
         Returns:
-            None
+            selected_labels (list): The selected column names.
         '''
-        selected_labels = []
-        for child in self.data_info_layout.children:
-            checkbox = child.children[0]
-            if checkbox.active:
-                label = child.children[-1]
-                selected_labels.append(label.text.split(".")[1].strip())
+        selected_labels = self.data_info_layout.selected_columns(self.df.columns)
         
         print("Selected labels:", selected_labels)
         return selected_labels
@@ -774,12 +1495,12 @@ class MLStarterkit(App):
         labels = self.get_labels()
         if labels == []:
             return
-        try:
-            self.df.drop(labels, axis=1, inplace=True)
-            popup(type='success')
-            self.refresh_scrollview()
-        except Exception as e:
-            popup(type='failure', text=e)
+
+        def operation(job, df):
+            from Scripts import operations
+            return operations.drop_columns(df, labels)
+
+        self.run_operation("Drop columns", operation)
         return
     
     def perform_operations(self):
@@ -789,34 +1510,134 @@ class MLStarterkit(App):
             None
         '''
         labels = self.get_labels()
-        try:
-            # Data Transformation
+        # Data Transformation
+        transformations = []
+        for child in self.transformation_vertical_grid_layout.children:
+            checkbox = child.children[0]
+            if checkbox.active:
+                label = child.children[-1]
+                transformations.append(label.text)
+        
+        # Data Visualization
+        visualizations = []
+        for child in self.visualization_vertical_grid_layout.children:
+            checkbox = child.children[0]
+            if checkbox.active:
+                label = child.children[-1]
+                visualizations.append(label.text)
+
+        output_mode, max_points = self.get_visualization_output()
+
+        if transformations and self.out_of_core_checkbox.active:
+            self.transform_file_out_of_core(transformations, labels)
             transformations = []
-            for child in self.transformation_vertical_grid_layout.children:
-                checkbox = child.children[0]
-                if checkbox.active:
-                    label = child.children[-1]
-                    transformations.append(label.text)
-            
-            # Data Visualization
-            visualizations = []
-            for child in self.visualization_vertical_grid_layout.children:
-                checkbox = child.children[0]
-                if checkbox.active:
-                    label = child.children[-1]
-                    visualizations.append(label.text)
-
-            if transformations or visualizations:
-                v, t = (False, False)
-                if transformations:
-                    t, self.df = perform_transformations(self.df.copy(), transformations, labels)
-                if visualizations:
-                    v = generate_visualizations(self.df, visualizations, labels)
-                if v or t:
-                    popup(type='success')
-                    self.refresh_scrollview()
-        except Exception as e:
-            popup(type='failure', text=e)
+
+        if not (transformations or visualizations):
+            return
+        save_path = None
+        if visualizations:
+            # Dialogs must be opened from the main thread
+            save_path = filedialog.askdirectory(title="Select Folder to Save Visualizations")
+            if save_path == '' and not transformations:
+                return
+
+        # The correlation matrix of the current data can be cached, not the one of the transformed data
+        version = None if transformations else self.df_version
+
+        def operation(job, df, pipeline):
+            v = False
+            delta = None
+            new_df = df
+            if pipeline is not None:
+                from Scripts import operations
+                job.report(0, "Transforming")
+                delta = operations.transform(df, pipeline)
+                new_df = delta.redo(df)
+            if visualizations and save_path:
+                start = 0.5 if transformations else 0
+                job.report(start, "Plotting")
+                # matplotlib is imported on first use, or by the warm-up
+                from Scripts.visualization import generate_visualizations
+                timings = {}
+                v = generate_visualizations(new_df, visualizations, labels, save_path,
+                                            progress=lambda done, total: job.report(
+                                                start + (1 - start) * done / total,
+                                                f"{done}/{total} figures"),
+                                            cancel=job.cancel_event,
+                                            output_mode=output_mode,
+                                            max_points=max_points,
+                                            version=version,
+                                            timings=timings)
+                for visualization, timing in timings.items():
+                    self.profiler.add(f"Plot: {visualization}", timing['wall_seconds'],
+                                      timing['cpu_seconds'], new_df, figures=timing['figures'])
+            if delta is None:
+                return True if v else None
+            return delta
+
+        def start(sparse):
+            from Scripts.transformation import TransformationPipeline
+            pipeline = TransformationPipeline(transformations, labels, sparse=sparse) if transformations else None
+
+            def keep_pipeline():
+                if pipeline is not None:
+                    # Kept to apply the same fitted transformations to new files
+                    self.pipeline = pipeline
+            self.run_operation("Perform operations", operation, pipeline, on_commit=keep_pipeline)
+
+        if 'One-Hot Encoding' in transformations:
+            self.confirm_one_hot_encoding(labels, start)
+        else:
+            start(False)
+        return
+
+    def confirm_one_hot_encoding(self, columns, proceed):
+        '''
+        Shows the columns and memory added by the one-hot encoding before it runs,
+        and lets the user create dense or sparse columns, or cancel.
+        Dense columns can't be created above MAX_DENSE_BYTES.
+        Args:
+            columns (list): The columns to be encoded, all the columns if empty.
+            proceed (callable): Called as proceed(sparse) to run the operation.
+        Returns:
+            None
+        '''
+        from Scripts.transformation import one_hot_estimate
+        added_columns, dense_bytes, sparse_bytes = one_hot_estimate(self.df, columns)
+        if added_columns == 0:
+            proceed(False)
+            return
+        content = BoxLayout(orientation='vertical', spacing=10, padding=10)
+        content.add_widget(Label(text=f"One-hot encoding adds {added_columns} columns:\n"
+                                      f"Dense: {dense_bytes / 1024 ** 2:.1f} MB\n"
+                                      f"Sparse: {sparse_bytes / 1024 ** 2:.1f} MB",
+                                 font_family="Msyhl",
+                                 font_size=14,
+                                 halign='center'))
+        confirm_popup = Popup(title='ONE-HOT ENCODING',
+                              content=content,
+                              size_hint=(None, None), size=(400, 250),
+                              separator_color=MAIN_COLORS["GREEN"],
+                              title_align='center')
+        button_box_layout = BoxLayout(orientation='horizontal', spacing=10, size_hint=(1, None), height=30)
+        for text, sparse, color in [("DENSE", False, "GREEN"), ("SPARSE", True, "GREEN"), ("CANCEL", None, "RED")]:
+            button = Button(text=text,
+                            bold=True,
+                            font_size=14,
+                            height=30,
+                            size_hint=(1 / 3, None),
+                            disabled=sparse is False and dense_bytes > MAX_DENSE_BYTES,
+                            background_normal="",
+                            background_color=MAIN_COLORS[color])
+
+            def choose(instance, sparse=sparse):
+                confirm_popup.dismiss()
+                if sparse is not None:
+                    proceed(sparse)
+            button.bind(on_release=choose)
+            button_box_layout.add_widget(button)
+        content.add_widget(button_box_layout)
+        confirm_popup.open()
         return
     
     def update_background(self, instance, value):
@@ -841,6 +1662,9 @@ class MLStarterkit(App):
         Returns:
             layout (FloatLayout): The main layout of the application.
         '''
+        self.executor = default_executor
+        self.executor.dispatch = run_on_mainthread
+        self.profiler = default_profiler
         self.icon = 'Assets\\icon.png'
         self.title = 'Machine Learning Starter kit - @37743'
         self.layout = FloatLayout()
@@ -891,6 +1715,18 @@ BoxLayout:
                                 background_normal="",
                                 background_color=MAIN_COLORS["GREEN"])
         box_layout.add_widget(self.load_button)
+
+        optimize_box_layout = BoxLayout(orientation='vertical',
+                                        size_hint=(0.15, 1))
+        self.optimize_checkbox = CheckBox(color=MAIN_COLORS["GREEN"],
+                                          size_hint=(1, 0.6))
+        optimize_box_layout.add_widget(self.optimize_checkbox)
+        optimize_box_layout.add_widget(Label(text="Optimize",
+                                             color=MAIN_COLORS["COLOR"],
+                                             font_family="Msyhl",
+                                             font_size=12,
+                                             size_hint=(1, 0.4)))
+        box_layout.add_widget(optimize_box_layout)
         self.layout.add_widget(box_layout)
 
         self.loadreq = Label(text="Load a file (\".csv\", \".xls\", ...etc) to start.",
@@ -911,6 +1747,43 @@ BoxLayout:
         
         return self.layout
     
+    def on_start(self):
+        '''
+        Reports the startup time once the first frame is drawn, then imports
+        the modules left out of the startup in the background.
+        Returns:
+            None
+        '''
+        def started(dt):
+            print(f"Window shown {perf_counter() - STARTED:.2f} s after startup")
+            self.warm_up()
+        Clock.schedule_once(started, 0)
+        return
+
+    @background_thread
+    def warm_up(self):
+        '''
+        Imports the scientific modules used by the operations ahead of their first use.
+        Returns:
+            None
+        '''
+        times = warm_up()
+        print("Warmed up:", ", ".join(f"{name} {seconds:.2f} s" for name, seconds in times.items()))
+        return
+
+    def on_stop(self):
+        '''
+        Cancels the running load and jobs when the application is closed.
+        Returns:
+            None
+        '''
+        if self.load_cancel is not None:
+            self.load_cancel.set()
+        # The running jobs stop at their next check, the worker threads are joined at exit
+        self.executor.cancel_all()
+        self.executor.shutdown()
+        return
+
     def open_settings(self, *largs):
         '''
         Removes the bloated Kivy options for packaging.
@@ -923,4 +1796,6 @@ BoxLayout:
 
 
 if __name__ == '__main__':
+    # Needed by the rendering processes when the application is frozen
+    freeze_support()
     MLStarterkit().run()
@@ -0,0 +1,8 @@
+'''
+Shared setup of the tests: the repository root is importable.
+'''
+
+import sys
+from os import path
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
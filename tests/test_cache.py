@@ -0,0 +1,41 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from Scripts.cache import cache_path, evict, load_cached, store_cached
+
+def test_round_trip_and_invalidation(tmp_path):
+    source = tmp_path / 'data.csv'
+    source.write_text("a,b\n1,0.5\n2,1.5\n")
+    cache_dir = str(tmp_path / 'cache')
+    data = pd.read_csv(source)
+    assert load_cached(str(source), cache_dir) is None
+    assert store_cached(str(source), data, cache_dir)
+    pd.testing.assert_frame_equal(load_cached(str(source), cache_dir), data)
+    # The loaded data doesn't depend on the entry
+    cached = load_cached(str(source), cache_dir)
+    os.remove(cache_path(str(source), cache_dir))
+    assert cached['a'].sum() == 3
+    source.write_text("a,b\n1,0.5\n2,1.5\n3,2.5\n")
+    assert load_cached(str(source), cache_dir) is None
+
+def test_non_string_columns_are_not_cached(tmp_path):
+    source = tmp_path / 'data.csv'
+    source.write_text("0\n1\n")
+    assert not store_cached(str(source), pd.DataFrame({0: [1]}), str(tmp_path))
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    data = pd.DataFrame({'v': np.arange(10000)})
+    sources = []
+    for index in range(3):
+        source = tmp_path / f'{index}.csv'
+        source.write_text(str(index))
+        store_cached(str(source), data, cache_dir)
+        entry = cache_path(str(source), cache_dir)
+        os.utime(entry, (index, index))
+        sources.append(str(source))
+    entry_size = os.path.getsize(cache_path(sources[0], cache_dir))
+    evict(cache_dir, 2 * entry_size)
+    assert [load_cached(source, cache_dir) is None for source in sources] == [True, False, False]
@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from Scripts.correlation import compute_correlation, correlation_cache, correlation_matrix
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=3000)
+    data = pd.DataFrame({'x': x, 'y': 2 * x + rng.normal(size=3000), 'z': rng.integers(0, 5, 3000),
+                         'constant': 1.0, 'label': rng.choice(['a', 'b'], 3000)})
+    data.loc[::11, 'y'] = np.nan
+    return data
+
+@pytest.mark.parametrize('method', ['pearson', 'spearman'])
+@pytest.mark.parametrize('chunksize', [None, 500])
+def test_matches_pandas(data, method, chunksize):
+    columns = ['x', 'y', 'z', 'constant']
+    expected = data[columns].corr(method=method)
+    pd.testing.assert_frame_equal(compute_correlation(data, columns, method, chunksize), expected,
+                                  rtol=1e-9, atol=1e-12)
+
+def test_cache_keeps_the_newest_version(data):
+    correlation_cache.clear()
+    newest = correlation_matrix(data, version=3)
+    assert correlation_matrix(data, version=3) is newest
+    # A matrix computed late on a previous version doesn't evict the newest one
+    correlation_matrix(data, version=2)
+    assert correlation_cache.keys() == [(3, (('x', 'y', 'z', 'constant'), 'pearson'))]
+
+def test_cache_is_shared_by_threads(data):
+    correlation_cache.clear()
+    with ThreadPoolExecutor(8) as pool:
+        matrices = list(pool.map(lambda version: correlation_matrix(data, ['x', 'y'], version=version // 4),
+                                 range(32)))
+    for matrix in matrices:
+        pd.testing.assert_frame_equal(matrix, matrices[0])
+    assert correlation_cache.keys() == [(7, (('x', 'y'), 'pearson'))]
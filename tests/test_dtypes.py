@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from Scripts.dtypes import fits_float32, is_categorical, optimize_dtypes
+
+def test_float_columns_are_narrowed_only_without_loss():
+    data = pd.DataFrame({'exact': [0.5, 1.25, np.nan, -3.0],
+                         'lossy': [0.1, 1.25, np.nan, -3.0],
+                         'large': [1e300, 1.0, 2.0, np.nan]})
+    original = data.copy()
+    optimize_dtypes(data)
+    assert data.dtypes.astype(str).tolist() == ['float32', 'float64', 'float64']
+    pd.testing.assert_frame_equal(data.astype('float64'), original)
+
+def test_fits_float32_is_nan_aware():
+    assert fits_float32(pd.Series([np.nan, np.nan]))
+    assert not fits_float32(pd.Series([np.nan, 16777217.0]))
+
+def test_integers_and_strings_are_narrowed():
+    data = pd.DataFrame({'small': [1, 2, 3, 4] * 5, 'unsigned': np.array([1, 2, 3, 300] * 5, dtype='uint64'),
+                         'text': ['a', 'b', 'a', 'a'] * 5})
+    optimize_dtypes(data)
+    assert data.dtypes.astype(str).tolist() == ['int8', 'uint16', 'category']
+
+def test_string_dtype_columns_are_categorical():
+    data = pd.DataFrame({'text': pd.array(['a', 'b', 'a', 'a'] * 5, dtype='string'), 'number': [1.5] * 20})
+    assert is_categorical(data['text'].dtype) and not is_categorical(data['number'].dtype)
+    optimize_dtypes(data)
+    assert data['text'].dtype == 'category'
@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from Scripts import duplicates
+from Scripts.duplicates import (count_duplicates, count_file_duplicates, drop_file_duplicates,
+                                duplicated_chunks, duplicated_rows, duplicates_cache, find_duplicates,
+                                row_hashes)
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({'a': rng.integers(0, 5, 2000),
+                         'b': rng.choice(['x', 'y', None], 2000),
+                         'c': rng.integers(0, 3, 2000).astype(float)})
+    data.loc[::7, 'c'] = np.nan
+    return data
+
+@pytest.mark.parametrize('columns', [None, ['a'], ['b', 'c']])
+def test_find_duplicates_matches_pandas(data, columns):
+    expected = data.duplicated(subset=columns).to_numpy()
+    assert (find_duplicates(data, columns) == expected).all()
+    assert count_duplicates(data, columns, version=1) == expected.sum()
+
+@pytest.mark.parametrize('hashed_min_rows', [0, 10 ** 9])
+def test_small_and_hashed_paths_agree(data, monkeypatch, hashed_min_rows):
+    monkeypatch.setattr(duplicates, 'HASHED_MIN_ROWS', hashed_min_rows)
+    duplicates_cache.clear()
+    expected = data.duplicated(subset=['a', 'b']).to_numpy()
+    assert (duplicated_rows(data, ['a', 'b'], version=1) == expected).all()
+
+def test_no_columns_are_all_duplicates(data):
+    assert (row_hashes(data, []) == 0).all()
+    assert find_duplicates(data, []).sum() == len(data) - 1
+
+def test_integers_and_floats_hash_alike():
+    integers = pd.DataFrame({'v': [1, 2]})
+    floats = pd.DataFrame({'v': [1.0, np.nan]})
+    masks = [mask.tolist() for _, mask in duplicated_chunks([integers, floats])]
+    assert masks == [[False, False], [True, False]]
+
+def test_large_integer_ids_are_distinct(tmp_path):
+    file_path = tmp_path / 'ids.csv'
+    file_path.write_text("id,x\n9007199254740992,1\n9007199254740993,1\n9007199254740993,1\n")
+    data = pd.read_csv(file_path)
+    assert find_duplicates(data).tolist() == data.duplicated().tolist() == [False, False, True]
+    assert count_file_duplicates(str(file_path)) == 1
+    assert count_file_duplicates(str(file_path), chunksize=1) == 1
+    output_path = tmp_path / 'deduplicated.csv'
+    assert drop_file_duplicates(str(file_path), str(output_path), chunksize=1) == 1
+    assert pd.read_csv(output_path)['id'].tolist() == [9007199254740992, 9007199254740993]
+
+def test_file_duplicates_match_pandas(data, tmp_path):
+    file_path = tmp_path / 'data.csv'
+    data.to_csv(file_path, index=False)
+    expected = pd.read_csv(file_path).duplicated().sum()
+    assert count_file_duplicates(str(file_path), chunksize=300) == expected
+
+def test_cache_keeps_the_newest_version(data):
+    duplicates_cache.clear()
+    newest = duplicated_rows(data, ['a'], version=5)
+    # A count finishing late on a previous version doesn't evict the newest masks
+    duplicated_rows(data, ['a'], version=4)
+    assert duplicates_cache.keys() == [(5, ('a',))]
+    assert duplicated_rows(data, ['a'], version=5) is newest
+    assert not newest.flags.writeable
+    duplicated_rows(data, ['b'], version=6)
+    assert duplicates_cache.keys() == [(6, ('b',))]
+
+def test_cache_is_shared_by_threads(data):
+    duplicates_cache.clear()
+    expected = data.duplicated(subset=['a', 'b']).sum()
+    with ThreadPoolExecutor(8) as pool:
+        counts = list(pool.map(lambda version: count_duplicates(data, ['a', 'b'], version // 4), range(32)))
+    assert counts == [expected] * 32
+    assert duplicates_cache.keys() == [(7, ('a', 'b'))]
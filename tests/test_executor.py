@@ -0,0 +1,50 @@
+import threading
+
+from Scripts.Threading.executor import JobExecutor, JobCancelled
+
+def test_interactive_jobs_run_while_the_background_lane_is_busy():
+    executor = JobExecutor(max_workers=1, background_workers=1)
+    release = threading.Event()
+    try:
+        long_jobs = [executor.submit("Export", lambda job: release.wait(10), background=True)
+                     for _ in range(3)]
+        job = executor.submit("Describe", lambda job: 42)
+        assert job.result(timeout=5) == 42
+        assert [long_job.status for long_job in long_jobs] == ["running", "pending", "pending"]
+        assert long_jobs[0].background and not job.background
+    finally:
+        release.set()
+        executor.shutdown()
+
+def test_cancelled_job_reports_cancelled():
+    executor = JobExecutor()
+    started, release = threading.Event(), threading.Event()
+
+    def work(job):
+        started.set()
+        release.wait(5)
+        job.report(0.5)
+
+    job = executor.submit("Transform file", work, background=True)
+    started.wait(5)
+    job.cancel()
+    release.set()
+    job.join(5)
+    assert job.status == "cancelled"
+    assert isinstance(job.error, JobCancelled)
+    executor.shutdown()
+
+def test_shutdown_cancels_the_running_jobs():
+    executor = JobExecutor()
+    started = threading.Event()
+
+    def work(job):
+        started.set()
+        while True:
+            job.report(0.5)
+
+    job = executor.submit("Impute", work)
+    started.wait(5)
+    executor.shutdown()
+    job.join(5)
+    assert job.status == "cancelled"
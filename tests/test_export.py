@@ -0,0 +1,95 @@
+import gzip
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+from pyarrow import input_stream, parquet
+
+from Scripts.export import EXPORT_FORMATS, TEMPORARY_SUFFIX, export, file_format_of
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({'id': np.arange(1000), 'value': rng.normal(size=1000),
+                         'group': rng.choice(['a', 'b', 'c'], 1000).astype(object)})
+    data.loc[::9, 'value'] = np.nan
+    return data
+
+def read(file_path, file_format):
+    if file_format == 'parquet':
+        return pd.read_parquet(file_path)
+    if file_format == 'feather':
+        return pd.read_feather(file_path)
+    # Decompressed by pyarrow, as zstandard may not be installed
+    with input_stream(file_path, compression='detect') as stream:
+        return pd.read_csv(stream)
+
+@pytest.mark.parametrize('file_format', list(EXPORT_FORMATS))
+def test_round_trip(data, tmp_path, file_format):
+    file_path = str(tmp_path / f'data.{file_format}')
+    progress = []
+    assert export(data, file_path, chunksize=300, progress=lambda done, total: progress.append(done))
+    assert file_format_of(file_path) == file_format
+    pd.testing.assert_frame_equal(read(file_path, file_format), data, check_dtype=False)
+    assert progress[-1] == len(data)
+    assert os.listdir(tmp_path) == [f'data.{file_format}']
+
+def test_compressed_chunks_read_as_one_stream(data, tmp_path):
+    file_path = str(tmp_path / 'data.csv.gz')
+    export(data, file_path, chunksize=100)
+    with gzip.open(file_path, 'rt') as file:
+        assert file.read() == data.to_csv(index=False)
+
+def test_partitioned_parquet(data, tmp_path):
+    file_path = str(tmp_path / 'data.parquet')
+    progress = []
+    assert export(data, file_path, partition_column='group', chunksize=300,
+                  progress=lambda done, total: progress.append(done))
+    assert progress == [300, 600, 900, 1000]
+    assert sorted(os.listdir(file_path)) == ['group=a', 'group=b', 'group=c']
+    loaded = parquet.read_table(file_path).to_pandas()
+    loaded['group'] = loaded['group'].astype(object)
+    pd.testing.assert_frame_equal(loaded.sort_values('id', ignore_index=True), data, check_dtype=False)
+    with pytest.raises(FileExistsError):
+        export(data, file_path, partition_column='group')
+    with pytest.raises(ValueError):
+        export(data, str(tmp_path / 'data.csv'), partition_column='group')
+
+def test_cancelled_export_leaves_no_file(data, tmp_path):
+    cancel = threading.Event()
+    file_path = str(tmp_path / 'data.csv')
+
+    def progress(done, total):
+        cancel.set()
+
+    assert not export(data, file_path, chunksize=100, progress=progress, cancel=cancel)
+    assert os.listdir(tmp_path) == []
+    assert not os.path.exists(file_path + TEMPORARY_SUFFIX)
+
+def test_cancelled_partitioned_export_stops_between_chunks(data, tmp_path):
+    cancel = threading.Event()
+    file_path = str(tmp_path / 'data.parquet')
+    progress = []
+
+    def cancel_after_first_chunk(done, total):
+        progress.append(done)
+        cancel.set()
+
+    assert not export(data, file_path, partition_column='group', chunksize=100,
+                      progress=cancel_after_first_chunk, cancel=cancel)
+    assert progress == [100]
+    assert os.listdir(tmp_path) == []
+
+def test_sparse_columns_and_non_string_names(tmp_path):
+    data = pd.DataFrame({0: pd.arrays.SparseArray([0, 0, 1, 0]), 'x': [1.5, 2.5, 3.5, 4.5]})
+    file_path = str(tmp_path / 'data.parquet')
+    export(data, file_path)
+    loaded = pd.read_parquet(file_path)
+    assert loaded.columns.tolist() == ['0', 'x']
+    assert loaded['0'].tolist() == [0, 0, 1, 0]
+
+def test_unknown_format(data, tmp_path):
+    with pytest.raises(ValueError):
+        export(data, str(tmp_path / 'data.xlsx'))
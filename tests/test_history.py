@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Scripts import operations
+from Scripts.history import History
+from Scripts.transformation import TransformationPipeline
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({'age': rng.integers(18, 60, 300).astype(float), 'income': rng.normal(5000, 900, 300),
+                         'city': rng.choice(['Paris', 'Lyon'], 300).astype(object),
+                         'score': rng.integers(0, 10, 300)})
+    data.loc[::13, 'age'] = np.nan
+    data.loc[::17, 'income'] = np.nan
+    # Missing text values are NaN, as read from a file
+    data.loc[::11, 'city'] = np.nan
+    data = pd.concat([data, data.iloc[:20]], ignore_index=True)
+    data.index = data.index * 2
+    return data
+
+OPERATIONS = [
+    lambda df: operations.handle_missing_values(df, 'mean', ['age']),
+    lambda df: operations.handle_missing_values(df, 'mode'),
+    lambda df: operations.remove_duplicates(df),
+    lambda df: operations.handle_missing_values(df, 'remove', ['income']),
+    lambda df: operations.transform(df, TransformationPipeline(['Standardization', 'One-Hot Encoding'], [])),
+    lambda df: operations.drop_columns(df, ['score']),
+]
+
+def apply_all(data, history):
+    versions = [data]
+    for operation in OPERATIONS:
+        delta = operation(versions[-1])
+        versions.append(delta.redo(versions[-1]))
+        history.push(delta)
+    return versions
+
+def test_undo_and_redo_round_trip(data):
+    original = data.copy()
+    history = History()
+    versions = apply_all(data, history)
+    df = versions[-1]
+    for expected in reversed(versions[:-1]):
+        df, delta = history.undo(df)
+        assert delta is not None
+        pd.testing.assert_frame_equal(df, expected)
+    assert history.undo(df) == (df, None)
+    for expected in versions[1:]:
+        df, delta = history.redo(df)
+        pd.testing.assert_frame_equal(df, expected)
+    assert not history.can_redo()
+    # The operations never modify the data they are given
+    pd.testing.assert_frame_equal(data, original)
+
+def test_push_clears_redo_and_drops_oldest_steps(data):
+    history = History(max_steps=3)
+    versions = apply_all(data, history)
+    assert len(history.undo_stack) == 3
+    df, _ = history.undo(versions[-1])
+    pd.testing.assert_frame_equal(df, versions[-2])
+    history.push(operations.drop_columns(df, ['age']))
+    assert not history.can_redo()
+
+def test_memory_limit_keeps_the_last_step(data):
+    history = History(max_bytes=1)
+    apply_all(data, history)
+    assert len(history.undo_stack) == 1
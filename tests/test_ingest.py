@@ -0,0 +1,46 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.errors import DtypeWarning
+
+from Scripts.ingest import read_file
+
+@pytest.fixture
+def file_path(tmp_path):
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({'x': rng.random(1000), 'n': rng.integers(0, 10, 1000),
+                         'label': rng.choice(['a', 'b'], 1000)})
+    # Integers in the first batches, a missing value in the last one
+    data['n'] = data['n'].astype(float)
+    data.loc[990, 'n'] = np.nan
+    file_path = tmp_path / 'data.csv'
+    data.to_csv(file_path, index=False)
+    return str(file_path)
+
+@pytest.mark.parametrize('chunksize', [100, 1000, 5000])
+def test_batches_match_a_single_read(file_path, chunksize):
+    pd.testing.assert_frame_equal(read_file(file_path, chunksize), pd.read_csv(file_path))
+
+def test_progress_and_cancel(file_path):
+    rows = []
+    assert read_file(file_path, 300, progress=lambda done, total, count: rows.append(count)).shape == (1000, 3)
+    assert rows == [300, 600, 900, 1000]
+    cancel = threading.Event()
+    cancel.set()
+    assert read_file(file_path, 300, cancel=cancel) is None
+
+def test_mixed_batches_are_read_as_object(tmp_path):
+    file_path = tmp_path / 'mixed.csv'
+    file_path.write_text("id,v\n" + "".join(f"{i},{i}\n" for i in range(10)) + "10,text\n")
+    with pytest.warns(DtypeWarning, match="'v'"):
+        data = read_file(str(file_path), chunksize=5)
+    assert data['v'].dtype == object
+    assert data['v'].tolist() == list(range(10)) + ['text']
+    assert data['id'].dtype == 'int64'
+
+def test_header_only_file(tmp_path):
+    file_path = tmp_path / 'empty.csv'
+    file_path.write_text("a,b\n")
+    assert read_file(str(file_path)).columns.tolist() == ['a', 'b']
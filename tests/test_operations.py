@@ -0,0 +1,83 @@
+from os import path
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from Scripts import operations
+from Scripts.batch import process_file
+from Scripts.transformation import perform_transformations
+
+SAMPLE = path.join(path.dirname(path.dirname(path.abspath(__file__))), 'Samples', 'IBM Dataset.csv')
+
+# The operations as they were run by the application before the Delta history, in place on the data
+
+def baseline_remove_duplicates(df, columns):
+    if columns == []:
+        columns = df.columns
+    df.drop_duplicates(subset=columns, inplace=True)
+    return df
+
+def baseline_handle_missing_values(df, method, columns):
+    if columns == []:
+        columns = df.columns
+    if method == 'mean':
+        numeric_columns = df[columns].select_dtypes(include=['float64', 'int64']).columns
+        df[numeric_columns] = df[numeric_columns].fillna(df[numeric_columns].mean())
+    elif method == 'median':
+        numeric_columns = df[columns].select_dtypes(include=['float64', 'int64']).columns
+        df[numeric_columns] = df[numeric_columns].fillna(df[numeric_columns].median())
+    elif method == 'mode':
+        df[columns] = df[columns].fillna(df[columns].mode().iloc[0])
+    elif method == 'remove':
+        df.dropna(subset=columns, inplace=True)
+    return df
+
+@pytest.fixture(scope='module')
+def sample():
+    rng = np.random.default_rng(0)
+    data = pd.read_csv(SAMPLE)
+    for column in ['Age', 'MonthlyIncome', 'Department', 'JobRole']:
+        data.loc[rng.random(len(data)) < 0.05, column] = np.nan
+    return pd.concat([data, data.sample(40, random_state=0)], ignore_index=True)
+
+@pytest.mark.parametrize('columns', [[], ['Age', 'Department']])
+def test_remove_duplicates_matches_baseline(sample, columns):
+    expected = baseline_remove_duplicates(sample.copy(), columns)
+    assert_frame_equal(operations.remove_duplicates(sample, columns).redo(sample), expected)
+
+@pytest.mark.parametrize('method', ['mean', 'median', 'mode', 'remove'])
+@pytest.mark.parametrize('columns', [[], ['Age', 'Department', 'MonthlyIncome']])
+def test_handle_missing_values_matches_baseline(sample, method, columns):
+    expected = baseline_handle_missing_values(sample.copy(), method, columns)
+    delta = operations.handle_missing_values(sample, method, columns)
+    assert_frame_equal(delta.redo(sample), expected, check_dtype=False)
+
+def test_batch_pipeline_matches_baseline(sample, tmp_path):
+    file_path = tmp_path / 'sample.csv'
+    sample.to_csv(file_path, index=False)
+    steps = [{'op': 'drop', 'columns': ['EmployeeCount', 'Over18']},
+             {'op': 'dedupe'},
+             {'op': 'impute', 'method': 'median', 'columns': ['Age', 'MonthlyIncome']},
+             {'op': 'impute', 'method': 'remove'},
+             {'op': 'transform', 'types': ['Standardization', 'One-Hot Encoding']}]
+    summary = process_file(str(file_path), steps, str(tmp_path / 'output'))
+    assert summary['error'] is None
+
+    expected = pd.read_csv(file_path).drop(['EmployeeCount', 'Over18'], axis=1)
+    expected = baseline_remove_duplicates(expected, [])
+    expected = baseline_handle_missing_values(expected, 'median', ['Age', 'MonthlyIncome'])
+    expected = baseline_handle_missing_values(expected, 'remove', [])
+    _, expected = perform_transformations(expected, ['Standardization', 'One-Hot Encoding'], [])
+    processed = pd.read_csv(tmp_path / 'output' / 'sample' / 'processed.csv')
+    assert_frame_equal(processed, expected.reset_index(drop=True), check_dtype=False, rtol=1e-9)
+    assert summary['shape_after'] == expected.shape
+
+@pytest.mark.parametrize('method', ['group mean', 'knn'])
+def test_cancelled_imputation_returns_none(method):
+    from threading import Event
+    data = pd.DataFrame({'key': ['a', 'b'] * 50, 'x': [1.0, np.nan] * 50, 'y': [np.nan, 2.0, 3.0, 4.0] * 25})
+    cancel = Event()
+    cancel.set()
+    assert operations.handle_missing_values(data, method, ['x', 'y'], key='key', cancel=cancel) is None
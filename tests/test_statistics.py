@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Scripts.statistics import STATISTICS, describe
+
+def pandas_describe(data):
+    numeric = data.select_dtypes(include='number')
+    quantiles = numeric.quantile([0.25, 0.5, 0.75])
+    return pd.DataFrame({'Count': numeric.count(), 'Mean': numeric.mean(), 'Std': numeric.std(),
+                         'Min': numeric.min(), '25%': quantiles.loc[0.25], '50%': quantiles.loc[0.5],
+                         '75%': quantiles.loc[0.75], 'Max': numeric.max(), 'Skew': numeric.skew(),
+                         'Null %': 100 * numeric.isnull().mean(), 'Distinct': numeric.nunique()},
+                        columns=STATISTICS).astype('float64')
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({'normal': rng.normal(10, 3, 500), 'integers': rng.integers(-5, 5, 500),
+                         'small': rng.integers(0, 3, 500).astype('int8'), 'constant': 7.0,
+                         'empty': np.nan, 'label': rng.choice(['a', 'b'], 500)})
+    data.loc[::9, 'normal'] = np.nan
+    data.loc[1, 'constant'] = np.nan
+    return data
+
+def test_matches_pandas(data):
+    pd.testing.assert_frame_equal(describe(data), pandas_describe(data), rtol=1e-9)
+
+@pytest.mark.parametrize('rows', [1, 2, 3])
+def test_few_rows_match_pandas(data, rows):
+    pd.testing.assert_frame_equal(describe(data.head(rows)), pandas_describe(data.head(rows)), rtol=1e-9)
+
+def test_selected_and_empty_columns(data):
+    assert describe(data, ['label', 'integers']).index.tolist() == ['integers']
+    assert describe(data, ['label']).empty
+    assert describe(data.head(0)).index.tolist() == ['normal', 'integers', 'small', 'constant', 'empty']
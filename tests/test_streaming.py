@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Scripts.streaming import RunningStatistics
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({'x': rng.lognormal(3, 1, 1000), 'n': rng.integers(0, 100, 1000),
+                         'sparse': np.nan, 'label': rng.choice(['a', 'b', 'c'], 1000)})
+    data.loc[::7, 'x'] = np.nan
+    data.loc[[10, 900], 'sparse'] = [1.0, 4.0]
+    return data
+
+def expected(data, columns):
+    numeric = data[columns]
+    return {'count': numeric.count(), 'mean': numeric.mean(), 'std': numeric.std(ddof=0),
+            'skew': numeric.skew(), 'min': numeric.min(), 'max': numeric.max()}
+
+@pytest.mark.parametrize('chunksize', [1, 37, 500, 1000])
+def test_merged_chunks_match_pandas(data, chunksize):
+    columns = ['x', 'n', 'sparse']
+    statistics = RunningStatistics(columns, ['label'])
+    for start in range(0, len(data), chunksize):
+        statistics.update(data.iloc[start:start + chunksize])
+    for statistic, values in expected(data, columns).items():
+        np.testing.assert_allclose(list(statistics.numeric(statistic).values()), values.to_numpy(),
+                                   rtol=1e-9, err_msg=statistic)
+    pd.testing.assert_series_equal(statistics.value_counts['label'].sort_index(),
+                                   data['label'].value_counts().sort_index(), check_dtype=False)
+
+def test_empty_and_missing_chunks_leave_the_statistics_unchanged(data):
+    statistics = RunningStatistics(['x', 'n'])
+    statistics.update(data.head(0))
+    assert np.isnan(statistics.numeric('mean')['x'])
+    statistics.update(data.iloc[:500])
+    before = {statistic: statistics.numeric(statistic) for statistic in ['count', 'mean', 'std', 'skew']}
+    statistics.update(pd.DataFrame({'x': [np.nan, np.nan], 'n': [np.nan, np.nan]}))
+    statistics.update(data.head(0))
+    after = {statistic: statistics.numeric(statistic) for statistic in before}
+    assert after == before
@@ -0,0 +1,106 @@
+from itertools import combinations
+from os import path
+
+import pandas as pd
+import pytest
+from numpy import log1p, power
+from pandas import concat, get_dummies
+from pandas.api.types import is_string_dtype
+from pandas.testing import assert_frame_equal
+from sklearn.preprocessing import LabelEncoder, MinMaxScaler, StandardScaler
+
+from Scripts.transformation import (ENCODINGS, SCALINGS, TransformationPipeline, one_hot_estimate,
+                                    perform_transformations, transform_out_of_core)
+
+SAMPLE = path.join(path.dirname(path.dirname(path.abspath(__file__))), 'Samples', 'IBM Dataset.csv')
+
+def baseline_transformations(data, transformation_types, columns_subset):
+    """
+    The transformations as they were before the TransformationPipeline, column by column with scikit-learn.
+    Its object checks are string checks, the text columns of the pinned pandas 2 being object columns.
+    """
+    if columns_subset == []:
+        columns_subset = data.columns
+    if 'Standardization' in transformation_types:
+        for col in columns_subset:
+            if data[col].dtype in ['int64', 'float64']:
+                data[col] = StandardScaler().fit_transform(data[col].values.reshape(-1, 1))
+    elif 'Normalization' in transformation_types:
+        for col in columns_subset:
+            if data[col].dtype in ['int64', 'float64']:
+                data[col] = MinMaxScaler().fit_transform(data[col].values.reshape(-1, 1))
+    for label in transformation_types:
+        for col in columns_subset:
+            if label == 'One-Hot Encoding' and is_string_dtype(data[col].dtype):
+                data = concat([data, get_dummies(data[col], prefix=col)], axis=1)
+            elif label == 'Label Encoding' and is_string_dtype(data[col].dtype):
+                data[col] = LabelEncoder().fit_transform(data[col])
+            elif label == 'Log Transformation' and data[col].dtype in ['int64', 'float64']:
+                if data[col].skew() > 0.3:
+                    data[col] = log1p(data[col] - data[col].min())
+            elif label == 'Polynomial Transformation' and data[col].dtype in ['int64', 'float64']:
+                if data[col].skew() < -0.3:
+                    data[col] = power(data[col], 2)
+    return data
+
+def transformation_combinations():
+    for scaling in [[]] + [[t] for t in SCALINGS]:
+        for count in range(1, 3):
+            for encodings in combinations(ENCODINGS, count):
+                yield scaling + list(encodings)
+
+@pytest.fixture(scope='module')
+def sample():
+    return pd.read_csv(SAMPLE)
+
+@pytest.mark.parametrize('transformation_types', list(transformation_combinations()), ids=' + '.join)
+def test_pipeline_matches_baseline(sample, transformation_types):
+    expected = baseline_transformations(sample.copy(), transformation_types, [])
+    _, result = perform_transformations(sample.copy(), transformation_types, [])
+    assert_frame_equal(result, expected, check_exact=False, rtol=1e-9)
+
+def test_fitted_pipeline_transforms_new_data_alike(sample):
+    pipeline = TransformationPipeline(['Standardization', 'One-Hot Encoding'])
+    transformed = pipeline.fit_transform(sample.copy())
+    assert_frame_equal(pipeline.transform(sample.copy()), transformed)
+
+def test_other_category_doesnt_collide():
+    data = pd.DataFrame({'c': ['other', 'a', 'a', 'b', 'c', 'other', 'other']}, dtype=object)
+    result = TransformationPipeline(['One-Hot Encoding'], max_categories=2).fit_transform(data.copy())
+    dummies = result.drop(columns='c')
+    assert dummies.sum(axis=1).tolist() == [1] * len(data)
+    assert dummies['c_other'].tolist() == [True, False, False, False, False, True, True]
+    assert dummies.drop(columns=['c_a', 'c_other']).iloc[:, 0].tolist() == [False, False, False, True, True, False, False]
+
+def test_string_dtype_columns_are_encoded():
+    data = pd.DataFrame({'c': pd.array(['a', 'b', None, 'a'], dtype='string')})
+    assert one_hot_estimate(data)[0] == 2
+    _, result = perform_transformations(data.copy(), ['One-Hot Encoding', 'Label Encoding'], [])
+    assert result['c'].tolist() == [0, 1, -1, 0]
+    assert result[['c_a', 'c_b']].sum().tolist() == [2, 1]
+
+def test_out_of_core_matches_in_memory(sample, tmp_path):
+    transformation_types = ['Normalization', 'Label Encoding', 'Log Transformation']
+    output_path = tmp_path / 'transformed.csv'
+    transform_out_of_core(SAMPLE, str(output_path), transformation_types, chunksize=300)
+    _, expected = perform_transformations(sample.copy(), transformation_types, [])
+    assert_frame_equal(pd.read_csv(output_path), expected, check_dtype=False, check_exact=False, rtol=1e-6)
+
+def test_cancelled_directory_transform_stops_within_a_file(sample, tmp_path):
+    from threading import Event
+    input_folder, output_folder = tmp_path / 'input', tmp_path / 'output'
+    input_folder.mkdir()
+    sample.to_csv(input_folder / 'a.csv', index=False)
+    sample.to_csv(input_folder / 'b.csv', index=False)
+    pipeline = TransformationPipeline(['Standardization']).fit(sample)
+    cancel = Event()
+    transform = pipeline.transform
+
+    def transform_and_cancel(data):
+        # Cancelled while the first chunk of the first file is transformed
+        cancel.set()
+        return transform(data)
+    pipeline.transform = transform_and_cancel
+    outputs = pipeline.transform_directory(str(input_folder), str(output_folder), cancel=cancel)
+    assert outputs == []
+    assert list(output_folder.iterdir()) == []
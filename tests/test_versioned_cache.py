@@ -0,0 +1,12 @@
+from Scripts.versioned_cache import VersionedCache
+
+def test_only_the_newest_version_is_kept():
+    cache = VersionedCache()
+    cache.put(1, 'a', 'old')
+    assert cache.put(2, 'a', 'new') == 'new'
+    assert cache.get(1, 'a') is None and cache.get(2, 'a') == 'new'
+    # A value computed late on a previous version is returned but not kept
+    assert cache.put(1, 'b', 'late') == 'late'
+    assert cache.keys() == [(2, 'a')]
+    cache.clear()
+    assert cache.keys() == []